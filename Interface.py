@@ -1,23 +1,53 @@
 import streamlit as st
+from codes.solver_registry import SOLVERS, create_solver, solver_for_label
+from codes.generate_output_file import generate_output_file, write_parquet
+from codes.instance_cache import InstanceCache
+from codes.basis_cache import BasisCache
+from codes.result_cache import ResultCache, CachedResult
 from codes.read_instance_regex import MPSParser
-from codes.Solvers.Linprog_solver import LinprogSolver
-from codes.Solvers.HighsSolver import HighsSolver
-from codes.generate_output_file import generate_output_file
+from codes.solve_job import SolveJob
+from codes.tracing import Tracer
+from codes.memory_estimator import MemoryEstimate, MemoryBudgetError
 import tempfile
+import json
 import os
 import time
 
 # Lista de métodos disponíveis
 METHOD_OPTIONS = [
+    "Automático (pela memória)",
     "HiGHS",
     "Linprog",
+    "Portfólio (corrida)",
     "Descida por Coordenada",
     "Gradiente Espelhado",
     "Otimização Local",
+    "Decomposição (Dantzig-Wolfe)",
     "Otimização Global",
     "Azeótropos"
 ]
 
+# Método de cada solver no estimador de memória (MemoryEstimate.solver_mb): o nome no registro
+MEMORY_SOLVERS = {spec.label: name for name, spec in SOLVERS.items()}
+
+# Orçamento de memória por solução em MB (None: memória disponível no momento da solução)
+MEMORY_BUDGET_MB = None
+
+# Cache binário das instâncias já lidas, compartilhado entre as execuções da página
+INSTANCE_CACHE = InstanceCache("cache/instances")
+
+# Bases finais do HiGHS, usadas para warm start ao resolver de novo o mesmo modelo
+BASIS_CACHE = BasisCache("cache/bases")
+
+# Alterações oferecidas na análise what-if (API incremental do HighsSolver)
+WHAT_IF_EDITS = ["Custo de variável", "Limites de variável", "Limites de restrição"]
+
+# Tempo limite (s) das soluções da análise what-if feitas na própria página, quando não há outro
+WHAT_IF_TIME_LIMIT = 10.0
+
+# Resultados ótimos já calculados, por impressão digital do modelo, solver e opções
+RESULT_CACHE = ResultCache("cache/results")
+
 # Configurações do Streamlit
 def main():
     st.set_page_config(page_title="Solver de PL", layout="centered")
@@ -28,7 +58,7 @@ def main():
     if "processing" not in st.session_state:
         st.session_state.processing = False
     
-    uploaded_file = st.file_uploader("Escolha um arquivo MPS", type=["mps"])
+    uploaded_file = st.file_uploader("Escolha um arquivo MPS", type=["mps", "gz", "bz2", "xz"])
     
     #Alterei dessa forma para salvar o arquivo com o nome original e não com o nome temporário para evitar confusões e facilitar a saída
     if uploaded_file is not None:
@@ -38,13 +68,15 @@ def main():
         # Salva o arquivo com o nome original
         file_path = os.path.join(upload_folder, uploaded_file.name)
         
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-			
-		converter = MpsToLpConverter(mps_path=file_path)
-		lp_path = converter.convert()
+        tracer = Tracer()
+        with tracer.phase("upload"):
+            with open(file_path, "wb") as f:
+                f.write(uploaded_file.getbuffer())
+        # Eventos da gravação, reunidos depois aos do processo do solver
+        st.session_state.upload_trace = tracer.events
 
-        st.session_state.file_path = lp_path
+        # O MPS é passado direto aos solvers (sem conversão intermediária para .lp)
+        st.session_state.file_path = file_path
         st.session_state.original_filename = uploaded_file.name
 
         st.session_state.function_type = st.selectbox(
@@ -56,37 +88,218 @@ def main():
             "Selecione o método de otimização",
             METHOD_OPTIONS
         )
+
+        st.session_state.time_limit = st.number_input(
+            "Tempo limite em segundos (0 para sem limite)",
+            min_value=0, value=0, step=10
+        )
         
         if st.button("Confirmar e Resolver"):
             st.session_state.page = "results"
             st.session_state.processing = True
+            st.session_state.job_error = None
             st.rerun()
 
 
-def select_solver(file_path, method_name):
-    match method_name:
-        case "HiGHS":
-            return HighsSolver(file_path)
-        case "Linprog":
-            return LinprogSolver(file_path)
-        case "Descida por Coordenada":
-            # Implementar o solver de Descida por Coordenada
-            return None
-        case "Gradiente Espelhado":
-            # Implementar o solver de Gradiente Espelhado
-            return None
-        case "Otimização Local":
-            # Implementar o solver de Otimização Local
-            return None
-        case "Otimização Global":
-            # Implementar o solver de Otimização Global
-            return None
-        case "Azeótropos":
-            # Implementar o solver de Azeótropos
-            return None
-        case _:
-            return None
-    
+def choose_method(file_path, method_name):
+    """
+    Confere a memória estimada do método escolhido, ou escolhe um método que caiba.
+
+    No modo automático é usado o primeiro método (HiGHS, Linprog e, para
+    instâncias grandes, os de primeira ordem) cuja estimativa cabe em
+    MEMORY_BUDGET_MB.
+
+    Raises:
+        MemoryBudgetError: Se o método (ou nenhum método) couber no orçamento
+
+    Returns:
+        str: Nome do método a executar
+    """
+    estimate = MemoryEstimate.from_file(file_path)
+    if method_name == "Automático (pela memória)":
+        solver = estimate.choose_solver(MEMORY_BUDGET_MB)
+        return next(name for name, key in MEMORY_SOLVERS.items() if key == solver)
+    if method_name in MEMORY_SOLVERS:
+        estimate.check(MEMORY_SOLVERS[method_name], MEMORY_BUDGET_MB)
+    return method_name
+
+
+def select_solver(file_path, method_name, time_limit=None):
+    """
+    Cria o solver do método escolhido pelo registro (codes.solver_registry).
+
+    Roda no processo do SolveJob: o modelo é lido aqui (e não na interface)
+    para calcular a chave do cache de resultados. Se o mesmo modelo já foi
+    resolvido com o mesmo método e as mesmas opções, devolve o resultado
+    guardado (CachedResult). Caso contrário, só o módulo do solver escolhido
+    é importado; o HiGHS é montado a partir do parser (e do cache binário) e
+    usa o cache de bases para warm start. A chave fica em result_key, para
+    ser devolvida com os resultados.
+
+    Returns:
+        Solver com run() e get_results(), ou None para métodos ainda não implementados
+    """
+    name = solver_for_label(method_name)
+    if name is None:
+        # Otimização Global e Azeótropos ainda não implementados
+        return None
+
+    raw = MPSParser(file_path, cache=INSTANCE_CACHE).read()
+    key = RESULT_CACHE.key(raw, method_name, {"time_limit": time_limit})
+    cached = RESULT_CACHE.load(key)
+    if cached is not None:
+        return CachedResult(cached, key)
+
+    options = {"cache": INSTANCE_CACHE}
+    if name == "highs":
+        options["basis_cache"] = BASIS_CACHE
+    solver = create_solver(name, file_path, **options)
+    solver.result_key = key
+    return solver
+
+
+def what_if_solver(file_path):
+    """
+    Cria o HighsSolver da solução inicial da análise what-if (roda no processo do SolveJob).
+
+    O resultado inclui a base final (col_status e row_status), de onde parte o
+    modelo da sessão.
+    """
+    return create_solver("highs", file_path, cache=INSTANCE_CACHE, basis_cache=BASIS_CACHE,
+                         options={"output_flag": False})
+
+
+def load_what_if_model(file_path, results, time_limit):
+    """
+    Monta na sessão o modelo da análise what-if, partindo da base final do SolveJob.
+
+    O modelo vem do cache binário de instâncias (gravado pelo job) e recebe a
+    base de results com BasisCache.apply(); a solução seguinte parte dela
+    (hot start) e custa poucas iterações. Sem uma base aceita pelo HiGHS o
+    modelo não é resolvido, para que a página nunca faça uma solução a frio.
+
+    Args:
+        file_path (str): Caminho do arquivo MPS
+        results (dict): Resultado do SolveJob (get_results() do HighsSolver)
+        time_limit (float): Tempo limite de cada solução feita na página
+
+    Returns:
+        HighsSolver: Modelo resolvido a partir da base, ou None se não houver base utilizável
+    """
+    col_status, row_status = (results or {}).get("col_status"), (results or {}).get("row_status")
+    if col_status is None or row_status is None:
+        return None
+
+    solver = create_solver("highs", file_path, cache=INSTANCE_CACHE,
+                           options={"output_flag": False, "time_limit": float(time_limit)})
+    solver.load()
+    if len(col_status) != solver.model.getNumCol() or len(row_status) != solver.model.getNumRow():
+        return None
+    entry = {"basis_valid": True, "col_status": col_status, "row_status": row_status}
+    if not BasisCache.apply(solver.model, entry) or not solver.model.getBasis().valid:
+        return None
+
+    solver.run()
+    return solver
+
+
+def what_if_panel(file_path):
+    """
+    Análise what-if: altera custos e limites do modelo carregado no HiGHS e resolve de novo.
+
+    A solução inicial roda em um SolveJob (fora da thread do Streamlit), que
+    devolve a base final junto com o resultado; o HighsSolver da sessão é
+    montado e parte dessa base (ver load_what_if_model), e nunca é resolvido a
+    frio na página. Ele fica na sessão, com o modelo e a base da última
+    solução. Cada alteração usa a API incremental (change_costs,
+    change_col_bounds, change_row_bounds), sem reler o arquivo, e a nova
+    solução parte da base anterior (hot start), o que costuma levar
+    milissegundos; todas as soluções na página têm tempo limite.
+    """
+    with st.expander("Análise what-if (HiGHS)"):
+        solver = st.session_state.get("what_if_solver")
+        if solver is None or st.session_state.get("what_if_path") != file_path:
+            time_limit = st.session_state.get("time_limit") or WHAT_IF_TIME_LIMIT
+            job = st.session_state.get("what_if_job")
+            if job is None:
+                if not st.button("Carregar modelo para edição"):
+                    return
+                job = SolveJob(what_if_solver, (file_path,),
+                               time_limit=st.session_state.get("time_limit") or None).start()
+                st.session_state.what_if_job = job
+
+            job.poll()
+            if not job.done:
+                st.write(f"Resolvendo o modelo original... ({job.elapsed:.1f} s)")
+                time.sleep(0.5)
+                st.rerun()
+
+            st.session_state.what_if_job = None
+            if job.error:
+                st.error(f"Erro ao carregar o modelo: {job.error}")
+                return
+
+            solver = load_what_if_model(file_path, job.results, time_limit)
+            if solver is None:
+                st.error("A solução inicial não produziu uma base ótima (ex: tempo limite ou IPM sem "
+                         "crossover); a análise what-if precisa dela para resolver o modelo na página.")
+                return
+            st.session_state.what_if_solver = solver
+            st.session_state.what_if_path = file_path
+            st.session_state.what_if_log = []
+
+        edit = st.selectbox("Alteração", WHAT_IF_EDITS)
+        is_row = edit == "Limites de restrição"
+        size = solver.model.getNumRow() if is_row else solver.model.getNumCol()
+        index = int(st.number_input("Índice (base 0)", min_value=0, max_value=max(size - 1, 0), value=0, step=1))
+
+        if is_row:
+            _, name = solver.model.getRowName(index)
+            _, lower, upper, _ = solver.model.getRow(index)
+            cost = None
+        else:
+            _, name = solver.model.getColName(index)
+            _, cost, lower, upper, _ = solver.model.getCol(index)
+        st.caption(f"{name}: custo {cost}, limites [{lower}, {upper}]" if cost is not None
+                   else f"{name}: limites [{lower}, {upper}]")
+
+        if edit == "Custo de variável":
+            new_cost = st.number_input("Novo custo", value=float(cost), format="%.6g")
+        else:
+            # Campos em branco mantêm o limite atual; "inf" e "-inf" removem o limite
+            new_lower = st.text_input("Novo limite inferior", value=str(lower))
+            new_upper = st.text_input("Novo limite superior", value=str(upper))
+
+        if st.button("Aplicar e resolver"):
+            try:
+                if edit == "Custo de variável":
+                    solver.change_costs(index, new_cost)
+                    description = f"custo de {name} = {new_cost:g}"
+                else:
+                    bounds = (float(new_lower or lower), float(new_upper or upper))
+                    if is_row:
+                        solver.change_row_bounds(index, *bounds)
+                    else:
+                        solver.change_col_bounds(index, *bounds)
+                    description = f"limites de {name} = [{bounds[0]:g}, {bounds[1]:g}]"
+
+                start = time.perf_counter()
+                solver.run()
+                elapsed = time.perf_counter() - start
+                edited = solver.get_results() or {}
+                st.session_state.what_if_log.append({
+                    "Alteração": description,
+                    "Status": edited.get("status", "-"),
+                    "Objetivo": f"{edited.get('objective_value', float('nan')):.6g}",
+                    "Iterações": edited.get("iterations", "-"),
+                    "Tempo (ms)": f"{1000 * elapsed:.1f}",
+                })
+            except ValueError as e:
+                st.error(str(e))
+
+        if st.session_state.what_if_log:
+            st.table(st.session_state.what_if_log)
+
 
 def results_page():
     st.set_page_config(page_title="Resultados", layout="centered")
@@ -102,29 +315,79 @@ def results_page():
         return
     
     if st.session_state.processing:
-        st.write("Processando a otimização...")
-        progress_bar = st.progress(0)
-        
-        try:
-            solver = select_solver(st.session_state.file_path, st.session_state.method_selected)
-            
-            for i in range(1, 101):
-                time.sleep(0.02)  # Simula progresso
-                progress_bar.progress(i)
+        # A solução roda em um processo separado; a página só consulta o job a cada recarga
+        job = st.session_state.get("job")
+        if job is None:
+            # Estimativa de memória a partir das contagens do arquivo: falha antes de ler a instância
+            try:
+                method_name = choose_method(st.session_state.file_path, st.session_state.method_selected)
+            except MemoryBudgetError as e:
+                st.session_state.processing = False
+                st.session_state.results = None
+                st.session_state.job_error = str(e)
+                st.rerun()
+            st.session_state.method_selected = method_name
 
-        except Exception as e:
-            st.error(f"Erro ao processar o arquivo MPS: {e}")
+            # A consulta ao cache de resultados (que lê o modelo) também roda no processo do job
+            time_limit = st.session_state.get("time_limit") or None
+            job = SolveJob(select_solver, (st.session_state.file_path, method_name, time_limit),
+                           time_limit=time_limit).start()
+            st.session_state.job = job
+
+        progress = job.poll()
+
+        if job.done:
+            st.session_state.job = None
             st.session_state.processing = False
+            st.session_state.results = job.results
+            st.session_state.result_key = job.result_key
+            if job.error:
+                st.session_state.job_error = job.error
+            st.rerun()
+
+        st.write("Processando a otimização...")
+        if job.time_limit:
+            st.progress(min(job.elapsed / job.time_limit, 1.0))
+
+        col_time, col_iterations, col_objective = st.columns(3)
+        col_time.metric("Tempo (s)", f"{job.elapsed:.1f}")
+        col_iterations.metric("Iterações", progress.get("iterations", "-"))
+        if "objective_value" in progress:
+            col_objective.metric("Objetivo", f"{progress['objective_value']:.6g}")
+        if "gap" in progress:
+            st.write(f"**Gap:** {progress['gap']:.3e}")
+        if job.log:
+            st.code("\n".join(job.log[-10:]))
+
+        if job.cancelled:
+            st.warning("Cancelamento solicitado...")
+        elif st.button("Cancelar"):
+            job.cancel()
             st.rerun()
+
+        time.sleep(0.5)
+        st.rerun()
     
     else:
         results = st.session_state.get("results", None)
+
+        if st.session_state.get("job_error"):
+            st.error(f"Erro ao processar o arquivo MPS: {st.session_state.job_error}")
         
         if results:
             st.write(f"**Status:** {results['status']}")
             st.write(f"**Valor objetivo:** {results['objective_value']}")
             st.write(f"**Sucesso:** {results['success']}")
             st.write(f"**Número de iterações:** {results['iterations']}")
+            if results.get("warm_start"):
+                st.write(f"**Iterações economizadas (warm start):** {results['iterations_saved']}")
+            if "winner" in results:
+                st.write(f"**Método vencedor:** {results['winner']}")
+            if results.get("cache_hit"):
+                st.info("Resultado obtido do cache: mesmo modelo, método e opções de uma solução anterior.")
+            cache_stats = RESULT_CACHE.stats()
+            st.write(f"**Taxa de acerto do cache de resultados:** {cache_stats['hit_rate']:.0%} "
+                     f"({cache_stats['hits']} de {cache_stats['hits'] + cache_stats['misses']} consultas)")
         
             # Preparar pasta de saída
             output_folder = "outputs"
@@ -140,36 +403,72 @@ def results_page():
             # Gerar o novo nome no formato desejado
             problem_name = f"{method_name}_{original_file_name_without_extension}"
 
-            # Preparar variáveis primais e preços duais
-            primal_vars = []
-            if "primal_solution" in results and "dual_prices" in results:
-                for idx, (primal, dual) in enumerate(zip(results["primal_solution"], results["dual_prices"]), 1):
-                    primal_vars.append((idx, primal, dual))
-
-            # Preparar restrições (folgas e duais)
-            dual_vars = []
-            if "slacks" in results and "dual_solution" in results:
-                for idx, (slack, dual) in enumerate(zip(results["slacks"], results["dual_solution"]), 1):
-                    dual_vars.append((idx, slack, dual))
-
-            # Gerar arquivo de saída
-            output_path = generate_output_file(
-                output_folder=output_folder,
-                problem_name=problem_name,
-                solver_results={
-                    "valor_otimo_primal": results.get("objective_value", 0),
-                    "iterations": results.get("iterations", 0),
-                    "gap": results.get("gap", 0),
-                    "valor_otimo_dual": results.get("objective_value", 0),
-                    "viabilidade_primal": results.get("primal_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
-                    "viabilidade_dual": results.get("dual_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
-                    "tempo": results.get("runtime", 0),
-                },
-                primal_vars=primal_vars,
-                dual_vars=dual_vars
-            )
+            # Linha do tempo completa: gravação do upload (interface) e fases do processo do solver
+            tracer = Tracer()
+            tracer.extend(st.session_state.get("upload_trace"))
+            tracer.extend(results.get("trace"))
+
+            # Gerar arquivo de saída (ou copiar o gravado junto com o resultado em cache)
+            key = st.session_state.get("result_key")
+            with tracer.phase("saida"):
+                output_path = None
+                if results.get("cache_hit") and key:
+                    output_path = RESULT_CACHE.copy_output(
+                        key, os.path.join(output_folder, f"{os.path.splitext(problem_name)[0]}.mps"))
+                if output_path is None:
+                    output_path = generate_output_file(
+                        output_folder=output_folder,
+                        problem_name=problem_name,
+                        solver_results={
+                            "valor_otimo_primal": results.get("objective_value", 0),
+                            "iterations": results.get("iterations", 0),
+                            "gap": results.get("gap", 0),
+                            "valor_otimo_dual": results.get("dual_objective", results.get("objective_value", 0)),
+                            "viabilidade_primal": results.get("primal_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
+                            "viabilidade_dual": results.get("dual_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
+                            "tempo": tracer.total_wall() or results.get("runtime", 0),
+                        },
+                        # Arrays da solução passados direto ao gravador (formatação em bloco)
+                        primal_solution=results.get("primal_solution"),
+                        dual_prices=results.get("dual_prices"),
+                        slacks=results.get("slacks"),
+                        dual_solution=results.get("dual_solution")
+                    )
+
+            # Guarda o resultado ótimo e o arquivo gerado para as próximas soluções do mesmo modelo
+            if key and not results.get("cache_hit"):
+                RESULT_CACHE.store(key, results, output_path)
+                st.session_state.result_key = None
 
             st.success(f"Arquivo gerado com sucesso: {output_path}")
+
+            timings = tracer.summary()
+            if timings:
+                st.write("**Tempo por fase:**")
+                st.table([
+                    {"Fase": name, "Parede (s)": f"{entry['wall']:.3f}", "CPU (s)": f"{entry['cpu']:.3f}",
+                     "Pico de memória (MB)": "-" if entry["peak_rss_mb"] is None else f"{entry['peak_rss_mb']:.0f}"}
+                    for name, entry in timings.items()
+                ])
+                st.download_button(
+                    "Baixar trace (Chrome/Perfetto)",
+                    json.dumps(tracer.chrome_trace()),
+                    file_name=f"{os.path.splitext(problem_name)[0]}_trace.json",
+                    mime="application/json"
+                )
+
+            if "primal_solution" in results and st.button("Exportar solução em Parquet"):
+                try:
+                    parquet_paths = write_parquet(
+                        output_folder, problem_name,
+                        results.get("primal_solution"), results.get("dual_prices"),
+                        results.get("slacks"), results.get("dual_solution")
+                    )
+                    st.success(f"Arquivos Parquet gerados: {', '.join(parquet_paths)}")
+                except ImportError as e:
+                    st.error(str(e))
+
+            what_if_panel(st.session_state.file_path)
             
         else:
             st.error("Erro ao resolver o problema.")
@@ -181,6 +480,10 @@ def results_page():
         
         st.session_state.file_path = None
         st.session_state.results = None
+        st.session_state.job_error = None
+        st.session_state.result_key = None
+        st.session_state.what_if_solver = None
+        st.session_state.what_if_job = None
         st.session_state.page = "main"
         st.rerun()
 
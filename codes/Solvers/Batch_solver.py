@@ -0,0 +1,179 @@
+import numpy as np
+import highspy
+
+from concurrent.futures import ProcessPoolExecutor
+from codes.read_instance_regex import MPSParser, row_bounds
+from codes.Solvers.HighsSolver import HighsSolver
+
+
+def _solve_chunk(raw, options, rhs, costs):
+    """
+    Resolve um bloco de cenários sobre um único modelo HiGHS carregado.
+
+    O modelo é montado e carregado uma vez; a cada cenário apenas os limites
+    das restrições que mudaram e/ou os custos são alterados, e o HiGHS parte da
+    base do cenário anterior (warm start automático após as alterações).
+
+    Args:
+        raw (dict): Dicionário de MPSParser.read()
+        options (dict): Opções do HiGHS
+        rhs (np.ndarray): Lados direitos (k x m) ou None
+        costs (np.ndarray): Vetores de custo (k x n) ou None
+
+    Returns:
+        dict: Arrays empilhados com os resultados dos k cenários
+    """
+    solver = HighsSolver.from_data(raw, options={"output_flag": False, **options})
+    solver.load()
+    highs = solver.model
+
+    num_row = highs.getNumRow()
+    num_col = highs.getNumCol()
+    cols = np.arange(num_col, dtype=np.int32)
+    current_lower, current_upper = row_bounds(raw["row_types"], raw["rhs"], raw["ranges"])
+    count = len(rhs) if rhs is not None else len(costs)
+
+    results = {
+        "objective_values": np.full(count, np.nan),
+        "status": np.empty(count, dtype=object),
+        "iterations": np.zeros(count, dtype=np.int64),
+        "col_values": np.full((count, num_col), np.nan),
+        "row_duals": np.full((count, num_row), np.nan),
+    }
+
+    for k in range(count):
+        if rhs is not None:
+            row_lower, row_upper = row_bounds(raw["row_types"], rhs[k], raw["ranges"])
+            # O highspy não altera limites de linhas em lote: só as linhas alteradas são enviadas
+            for i in np.flatnonzero((row_lower != current_lower) | (row_upper != current_upper)):
+                highs.changeRowBounds(int(i), row_lower[i], row_upper[i])
+            current_lower, current_upper = row_lower, row_upper
+        if costs is not None:
+            highs.changeColsCost(num_col, cols, costs[k])
+
+        highs.run()
+        status = highs.getModelStatus()
+        results["status"][k] = highs.modelStatusToString(status)
+        results["iterations"][k] = solver.iteration_count()
+
+        if status == highspy.HighsModelStatus.kOptimal:
+            solution = highs.getSolution()
+            results["objective_values"][k] = highs.getObjectiveValue()
+            results["col_values"][k] = solution.col_value
+            results["row_duals"][k] = solution.row_dual
+
+    return results
+
+
+class BatchSolver:
+    """
+    Classe para resolver o mesmo problema com vários lados direitos ou vetores de custo.
+
+    O modelo é lido uma vez e, em cada processo, carregado uma vez no HiGHS.
+    Os cenários são resolvidos em sequência sobre o mesmo modelo, cada um
+    partindo da base do anterior, o que é muito mais rápido do que criar um
+    HighsSolver (e reler o arquivo) por cenário em varreduras paramétricas.
+
+    Atributos:
+        instance_path (str): Caminho para o arquivo MPS de entrada
+        raw (dict): Dados do problema retornados por MPSParser.read()
+        options (dict): Opções do HiGHS usadas em todos os cenários
+        res (dict): Resultados da última chamada de solve()
+
+    Métodos:
+        solve(rhs, costs, workers): Resolve um lote de cenários
+        get_results(): Retorna os resultados da última chamada de solve()
+    """
+
+    def __init__(self, instance_path, options=None, cache=None):
+        """
+        Inicializa o solver em lote.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS
+            options (dict, optional): Opções do HiGHS, no formato {nome: valor}
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+        """
+        self.instance_path = instance_path
+        self.raw = MPSParser(instance_path, cache=cache).read()
+        self.options = dict(options or {})
+        self.res = None
+
+    def solve(self, rhs=None, costs=None, workers=1):
+        """
+        Resolve um lote de cenários.
+
+        Args:
+            rhs (array-like, optional): Matriz k x m de lados direitos, uma linha por
+                cenário, na ordem das restrições do parser (RANGES são preservados)
+            costs (array-like, optional): Matriz k x n de vetores de custo
+            workers (int, optional): Número de processos. Os cenários são divididos
+                em blocos contíguos, um por processo. Defaults to 1.
+
+        Se rhs e costs forem informados juntos, devem ter o mesmo número de
+        cenários; um vetor 1-D é repetido em todos os cenários.
+
+        Returns:
+            dict: Dicionário contendo:
+                - objective_values: Valores objetivos (k,), NaN se não ótimo
+                - status: Status do modelo em cada cenário (k,)
+                - iterations: Iterações de cada cenário (k,)
+                - col_values: Soluções primais (k x n)
+                - row_duals: Soluções duais das restrições (k x m)
+        """
+        num_row = len(self.raw["row_names"])
+        num_col = len(self.raw["col_names"])
+        rhs = self._scenarios(rhs, num_row, "rhs")
+        costs = self._scenarios(costs, num_col, "costs")
+
+        if rhs is None and costs is None:
+            raise ValueError("Informe ao menos uma matriz de cenários (rhs ou costs)")
+        if rhs is not None and costs is not None:
+            if len(rhs) == 1:
+                rhs = np.repeat(rhs, len(costs), axis=0)
+            elif len(costs) == 1:
+                costs = np.repeat(costs, len(rhs), axis=0)
+            elif len(rhs) != len(costs):
+                raise ValueError("rhs e costs devem ter o mesmo número de cenários")
+
+        count = len(rhs) if rhs is not None else len(costs)
+        workers = max(1, min(workers, count))
+
+        if workers == 1:
+            self.res = _solve_chunk(self.raw, self.options, rhs, costs)
+            return self.res
+
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        chunks = [slice(bounds[i], bounds[i + 1]) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _solve_chunk, self.raw, self.options,
+                    rhs[chunk] if rhs is not None else None,
+                    costs[chunk] if costs is not None else None,
+                )
+                for chunk in chunks
+            ]
+            parts = [future.result() for future in futures]
+
+        self.res = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        return self.res
+
+    @staticmethod
+    def _scenarios(values, size, name):
+        """Converte os cenários para uma matriz k x size, validando as dimensões."""
+        if values is None:
+            return None
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if values.shape[1] != size:
+            raise ValueError(f"{name} deve ter {size} colunas, recebido {values.shape[1]}")
+        return values
+
+    def get_results(self):
+        """
+        Retorna os resultados da última chamada de solve().
+
+        Returns:
+            dict: Arrays empilhados por cenário, ou None se solve() não foi chamado
+        """
+        return self.res
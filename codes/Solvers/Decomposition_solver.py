@@ -0,0 +1,687 @@
+import os
+import sys
+import time
+import highspy
+import numpy as np
+import scipy.sparse as sp
+import multiprocessing as mp
+
+from multiprocessing.connection import wait
+from scipy.sparse.csgraph import connected_components
+from codes.read_instance_regex import MPSParser
+from codes.Solvers.HighsSolver import HighsSolver
+from codes.lp_metrics import kkt_metrics, row_slacks, to_objective_sense
+from codes.tracing import Tracer
+
+# Subproblemas sem presolve: o simplex devolve raios quando o subproblema é ilimitado
+# e a base de uma rodada é reaproveitada na seguinte (só os custos mudam)
+SUBPROBLEM_OPTIONS = {"output_flag": False, "presolve": "off"}
+MASTER_OPTIONS = {"output_flag": False}
+# Status do mestre que não indicam falha numérica
+MASTER_FINAL = (highspy.HighsModelStatus.kOptimal, highspy.HighsModelStatus.kInfeasible,
+                highspy.HighsModelStatus.kUnbounded, highspy.HighsModelStatus.kUnboundedOrInfeasible)
+# Soma das variáveis artificiais abaixo da qual o mestre é considerado viável (fim da fase 1)
+ARTIFICIAL_TOL = 1e-7
+
+
+def _highs_lp(c, lower, upper, A, row_lower, row_upper):
+    """Monta um HighsLp a partir de arrays NumPy e de uma matriz esparsa."""
+    A = sp.csc_matrix(A)
+    lp = highspy.HighsLp()
+    lp.num_col_ = A.shape[1]
+    lp.num_row_ = A.shape[0]
+    lp.col_cost_ = np.asarray(c, dtype=np.float64)
+    lp.col_lower_ = np.asarray(lower, dtype=np.float64)
+    lp.col_upper_ = np.asarray(upper, dtype=np.float64)
+    lp.row_lower_ = np.asarray(row_lower, dtype=np.float64)
+    lp.row_upper_ = np.asarray(row_upper, dtype=np.float64)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.num_col_ = A.shape[1]
+    lp.a_matrix_.num_row_ = A.shape[0]
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    return lp
+
+
+def _row_components(A, linking_rows):
+    """
+    Rotula as restrições pelos componentes conexos do grafo linha-coluna sem as linhas de ligação.
+
+    Returns:
+        np.ndarray: Bloco de cada restrição (0, 1, ...), -1 nas linhas de ligação e nas
+            linhas vazias (ficam no mestre, que verifica os seus limites)
+    """
+    A = sp.csr_matrix(A)
+    num_row = A.shape[0]
+    keep = np.diff(A.indptr) > 0
+    keep[np.asarray(linking_rows, dtype=np.int64)] = False
+    kept = np.flatnonzero(keep)
+
+    B = abs(A[kept]).astype(bool)
+    graph = sp.bmat([[None, B], [B.T, None]], format="csr")
+    _, labels = connected_components(graph, directed=False)
+
+    row_blocks = np.full(num_row, -1, dtype=np.int64)
+    if len(kept):
+        _, row_blocks[kept] = np.unique(labels[:len(kept)], return_inverse=True)
+    return row_blocks
+
+
+def detect_blocks(A, linking_rows=None, max_linking_fraction=0.1):
+    """
+    Detecta uma partição bloco-angular das restrições.
+
+    Sem linking_rows, as linhas mais densas são candidatas a linhas de
+    ligação: são testados os prefixos com 0, 1, 2, 4, ... linhas (até
+    max_linking_fraction das restrições) e é escolhido o que minimiza
+    (linhas de ligação + linhas do maior bloco), isto é, o tamanho do mestre
+    mais o do maior subproblema. Os blocos são os componentes conexos das
+    demais restrições.
+
+    Args:
+        A (scipy.sparse matrix): Matriz das restrições
+        linking_rows (array-like, optional): Linhas de ligação, quando conhecidas
+        max_linking_fraction (float, optional): Fração máxima de linhas de ligação. Defaults to 0.1.
+
+    Returns:
+        np.ndarray: Bloco de cada restrição, -1 nas linhas de ligação (formato de row_blocks)
+    """
+    A = sp.csr_matrix(A)
+    if linking_rows is not None:
+        return _row_components(A, linking_rows)
+
+    order = np.argsort(-np.diff(A.indptr), kind="stable")
+    limit = int(max_linking_fraction * A.shape[0])
+    candidates = [0] + [1 << power for power in range(max(limit, 1).bit_length()) if 1 << power <= limit]
+
+    best_score, best = None, None
+    for count in candidates:
+        row_blocks = _row_components(A, order[:count])
+        block_rows = np.bincount(row_blocks[row_blocks >= 0])
+        score = count + (block_rows.max() if len(block_rows) else 0)
+        if best_score is None or score < best_score:
+            best_score, best = score, row_blocks
+    return best
+
+
+def _column_blocks(A, row_blocks):
+    """
+    Atribui cada coluna ao bloco das suas restrições (-1: coluna só nas linhas de ligação).
+
+    Raises:
+        ValueError: Se alguma coluna tiver coeficientes em dois blocos diferentes
+    """
+    A = sp.csc_matrix(A)
+    cols = np.repeat(np.arange(A.shape[1]), np.diff(A.indptr))
+    labels = row_blocks[A.indices]
+    inside = labels >= 0
+
+    first = np.full(A.shape[1], np.iinfo(np.int64).max)
+    last = np.full(A.shape[1], -1)
+    np.minimum.at(first, cols[inside], labels[inside])
+    np.maximum.at(last, cols[inside], labels[inside])
+
+    crossing = np.flatnonzero((last >= 0) & (first != last))
+    if len(crossing):
+        raise ValueError(f"A partição não é bloco-angular: a coluna {crossing[0]} tem coeficientes "
+                         f"nos blocos {first[crossing[0]]} e {last[crossing[0]]}")
+    return last
+
+
+def _build_subproblems(blocks):
+    """Cria um HighsSolver por bloco (o modelo e a base ficam carregados entre as rodadas)."""
+    return {
+        k: HighsSolver(lp=_highs_lp(**data), options=SUBPROBLEM_OPTIONS)
+        for k, data in blocks.items()
+    }
+
+
+def _solve_subproblems(solvers, costs):
+    """
+    Resolve os subproblemas com os custos reduzidos da rodada.
+
+    Returns:
+        dict: {bloco: (status, objetivo, ponto ou raio, duais das linhas do bloco)}, com
+            status "optimal", "unbounded" (raio no lugar do ponto) ou o status do HiGHS
+    """
+    results = {}
+    for k, cost in costs.items():
+        solver = solvers[k]
+        # Os custos reduzidos podem ser muito grandes (duais do mestre); são divididos por uma
+        # potência de 2 (sem erro de arredondamento) para que o simplex dual não falhe por
+        # duais excessivos, e o objetivo e os duais são reescalados
+        largest = np.abs(cost).max() if len(cost) else 0.0
+        scale = 2.0 ** np.ceil(np.log2(largest)) if largest > 1.0 else 1.0
+        solver.change_costs(np.arange(len(cost)), cost / scale)
+        solver.run()
+        # Os tempos de cada subproblema não são guardados (seriam milhares de eventos)
+        solver.tracer.events.clear()
+
+        status = solver.model.getModelStatus()
+        if status == highspy.HighsModelStatus.kOptimal:
+            results[k] = ("optimal", scale * solver.model.getObjectiveValue(),
+                          np.asarray(solver.res.col_value, dtype=np.float64),
+                          scale * np.asarray(solver.res.row_dual, dtype=np.float64))
+        elif status == highspy.HighsModelStatus.kUnbounded:
+            _, has_ray, ray = solver.model.getPrimalRay()
+            results[k] = ("unbounded", None, np.asarray(ray, dtype=np.float64) if has_ray else None, None)
+        else:
+            results[k] = (solver.model.modelStatusToString(status), None, None, None)
+    return results
+
+
+def _subproblem_worker(blocks, conn):
+    """
+    Processo que mantém os subproblemas de um grupo de blocos e os resolve a cada rodada.
+
+    Recebe {bloco: custos} pelo pipe e responde com _solve_subproblems(); None encerra.
+    """
+    try:
+        solvers = _build_subproblems(blocks)
+        while True:
+            costs = conn.recv()
+            if costs is None:
+                break
+            conn.send(_solve_subproblems(solvers, costs))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+class _SubproblemPool:
+    """
+    Subproblemas distribuídos entre processos, com os modelos mantidos entre as rodadas.
+
+    Os blocos são distribuídos pelos processos em ordem decrescente de
+    não-zeros, sempre para o processo com menos carga. Com um único processo
+    os subproblemas são resolvidos no processo principal.
+    """
+
+    def __init__(self, blocks, workers):
+        self.solvers = None
+        self.connections = []
+        self.processes = []
+        self.owner = {}
+
+        # Processos daemon (ex: jobs do benchmark) não podem criar processos filhos
+        if workers <= 1 or mp.current_process().daemon:
+            self.solvers = _build_subproblems(blocks)
+            return
+
+        loads = np.zeros(workers)
+        groups = [{} for _ in range(workers)]
+        for k in sorted(blocks, key=lambda k: -blocks[k]["A"].nnz):
+            worker = int(np.argmin(loads))
+            groups[worker][k] = blocks[k]
+            loads[worker] += blocks[k]["A"].nnz + 1
+            self.owner[k] = worker
+
+        for group in groups:
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_subproblem_worker, args=(group, child), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def solve(self, costs):
+        """Resolve os subproblemas de {bloco: custos} em paralelo e reúne os resultados."""
+        if self.solvers is not None:
+            return _solve_subproblems(self.solvers, costs)
+
+        shares = [{} for _ in self.connections]
+        for k, cost in costs.items():
+            shares[self.owner[k]][k] = cost
+
+        pending = []
+        for conn, share in zip(self.connections, shares):
+            if share:
+                conn.send(share)
+                pending.append(conn)
+
+        results = {}
+        while pending:
+            for conn in wait(pending):
+                try:
+                    results.update(conn.recv())
+                except EOFError:
+                    raise RuntimeError("Um processo de subproblemas terminou inesperadamente")
+                pending.remove(conn)
+        return results
+
+    def close(self):
+        """Encerra os processos dos subproblemas."""
+        for conn in self.connections:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+        self.connections, self.processes = [], []
+
+
+class DantzigWolfeSolver:
+    """
+    Classe para resolver LPs bloco-angulares pela decomposição de Dantzig-Wolfe.
+
+    As restrições são divididas em linhas de ligação (L) e blocos
+    independentes (B_k), cada um com as suas colunas:
+
+        min  sum_k c_k'x_k + c_s'x_s
+        s.a. row_lower_L <= sum_k A_Lk x_k + A_Ls x_s <= row_upper_L
+             row_lower_k <= B_k x_k <= row_upper_k,  lower <= x <= upper
+
+    As colunas x_s aparecem só nas linhas de ligação e ficam diretamente no
+    mestre. Cada x_k é escrito como combinação convexa de pontos extremos do
+    seu bloco (mais raios, se o bloco for ilimitado), e o problema mestre
+    restrito, resolvido pelo HighsSolver, escolhe os pesos. A cada rodada os
+    duais do mestre (pi nas linhas de ligação, mu nas linhas de convexidade)
+    dão os custos c_k - A_Lk'pi dos subproblemas, e os pontos (ou raios) com
+    custo reduzido negativo entram no mestre como novas colunas.
+
+    Detalhes:
+        - partição: informada (row_blocks) ou detectada (detect_blocks)
+        - subproblemas: resolvidos em paralelo em um conjunto de processos; cada
+          processo mantém os seus modelos do HiGHS e a base da rodada anterior
+          (só os custos mudam, via HighsSolver.change_costs)
+        - mestre: as colunas novas entram com HighsSolver.add_cols e a solução
+          parte da base anterior
+        - pool de colunas: quando o mestre passa de max_master_columns, as colunas
+          fora da base com custo reduzido positivo vão para um pool, que é
+          consultado antes dos subproblemas (reentrada sem resolver subproblemas)
+        - viabilidade: duas fases; na fase 1 o mestre minimiza a soma das variáveis
+          artificiais das linhas de ligação (custo zero nas demais colunas) e, ao
+          zerá-la, as artificiais são fixadas em zero e os custos originais entram
+        - parada: nenhuma coluna com custo reduzido negativo, ou gap relativo
+          entre o mestre e o limitante de Lagrange abaixo de tol
+
+    Os subproblemas são muito menores que o modelo monolítico, e a fatoração de
+    cada um é feita separadamente (sem o preenchimento da LU do modelo inteiro).
+
+    Atributos:
+        instance_path (str): Caminho para o arquivo MPS de entrada
+        data (dict): Dados do problema no modo esparso
+        row_blocks (np.ndarray): Bloco de cada restrição (-1: linha de ligação)
+        col_blocks (np.ndarray): Bloco de cada coluna (-1: coluna do mestre)
+        workers (int): Processos dos subproblemas
+        x (np.ndarray): Solução primal reportada
+        y (np.ndarray): Solução dual reportada (convenção do HiGHS)
+        progress_callback (callable): Recebe o progresso a cada rodada; se retornar
+            True, a otimização é interrompida (opcional)
+        tracer (Tracer): Tempos e memória de cada fase (leitura, montagem, solução, extração)
+        res (dict): Resultado da otimização após run()
+
+    Métodos:
+        run(): Executa a geração de colunas
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    def __init__(self, instance_path, cache=None, row_blocks=None, linking_rows=None, workers=None,
+                 tol=1e-6, max_iterations=1000, max_master_columns=None, time_limit=None, tracer=None):
+        """
+        Inicializa o solver de decomposição.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            row_blocks (array-like, optional): Bloco de cada restrição (-1 para ligação). Defaults to detectado.
+            linking_rows (array-like, optional): Linhas de ligação; os blocos são os componentes
+                conexos das demais (ignorado se row_blocks for informado)
+            workers (int, optional): Processos dos subproblemas. Defaults to min(CPUs, blocos).
+            tol (float, optional): Tolerância relativa de custo reduzido e gap. Defaults to 1e-6.
+            max_iterations (int, optional): Máximo de rodadas. Defaults to 1000.
+            max_master_columns (int, optional): Colunas geradas mantidas no mestre antes de
+                mover colunas para o pool. Defaults to 10 x (linhas do mestre).
+            time_limit (float, optional): Tempo limite em segundos. Defaults to None.
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
+
+        Raises:
+            ValueError: Se a partição informada não for bloco-angular
+        """
+        self.instance_path = instance_path
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.data = MPSParser(instance_path, cache=cache, tracer=self.tracer).parse(sparse=True)
+
+        with self.tracer.phase("montagem"):
+            A = self.data["A"]
+            if row_blocks is None:
+                row_blocks = detect_blocks(A, linking_rows)
+            self.row_blocks = np.asarray(row_blocks, dtype=np.int64)
+            if len(self.row_blocks) != A.shape[0]:
+                raise ValueError(f"row_blocks tem {len(self.row_blocks)} posições, mas o problema tem "
+                                 f"{A.shape[0]} restrições")
+            self.col_blocks = _column_blocks(A, self.row_blocks)
+
+        num_blocks = int(self.row_blocks.max()) + 1 if len(self.row_blocks) else 0
+        self.num_blocks = num_blocks
+        self.workers = max(1, min(workers or os.cpu_count() or 1, num_blocks))
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.max_master_columns = max_master_columns
+        self.time_limit = time_limit
+        self.x = None
+        self.y = None
+        self.progress_callback = None
+        self.res = None
+
+    def _blocks(self):
+        """Dados de cada subproblema: custos, limites e matriz das linhas do bloco."""
+        d = self.data
+        A = d["A"]
+        blocks, rows_of, cols_of = {}, {}, {}
+        for k in range(self.num_blocks):
+            rows = np.flatnonzero(self.row_blocks == k)
+            cols = np.flatnonzero(self.col_blocks == k)
+            rows_of[k], cols_of[k] = rows, cols
+            blocks[k] = {
+                "c": d["c"][cols], "lower": d["lower"][cols], "upper": d["upper"][cols],
+                "A": A[rows][:, cols].tocsc(),
+                "row_lower": d["row_lower"][rows], "row_upper": d["row_upper"][rows],
+            }
+        return blocks, rows_of, cols_of
+
+    def run(self):
+        """
+        Executa a geração de colunas de Dantzig-Wolfe.
+
+        A cada rodada: resolve o mestre restrito, procura colunas no pool e,
+        se não houver, resolve os subproblemas em paralelo e acrescenta as
+        colunas com custo reduzido negativo. Para ao comprovar a otimalidade,
+        ao atingir o gap tol, ou ao atingir o limite de rodadas ou de tempo.
+        """
+        start = time.perf_counter()
+        begin = self.tracer.snapshot()
+        d = self.data
+        A, c = d["A"], d["c"]
+        linking = np.flatnonzero(self.row_blocks < 0)
+        static = np.flatnonzero(self.col_blocks < 0)
+        num_linking, num_blocks = len(linking), self.num_blocks
+        A_link = A[linking].tocsc()
+
+        blocks, rows_of, cols_of = self._blocks()
+        link_of = {k: A_link[:, cols_of[k]] for k in range(num_blocks)}
+        pool = _SubproblemPool(blocks, self.workers)
+
+        # Colunas geradas: (bloco, ponto ou raio, é raio, custo, coluna nas linhas de ligação)
+        active, parked, seen = [], [], set()
+
+        def make_column(k, vector, is_ray):
+            link = sp.csc_matrix(link_of[k] @ vector.reshape(-1, 1))
+            return (k, vector, is_ray, float(c[cols_of[k]] @ vector), link)
+
+        def master_block(columns):
+            """Matriz (linhas de ligação + convexidade) e custos de um lote de colunas geradas."""
+            link = sp.hstack([column[4] for column in columns], format="csc")
+            convexity = sp.csc_matrix(
+                (np.ones(sum(not column[2] for column in columns)),
+                 ([column[0] for column in columns if not column[2]],
+                  [j for j, column in enumerate(columns) if not column[2]])),
+                shape=(num_blocks, len(columns)))
+            return sp.vstack([link, convexity], format="csc"), np.array([column[3] for column in columns])
+
+        def add_to_master(master, columns):
+            matrix, costs = master_block(columns)
+            master.add_cols(costs if feasible else np.zeros(len(costs)), 0.0, np.inf, matrix)
+            active.extend(columns)
+
+        status = "Iteration limit"
+        iteration = 0
+        lower_bound = -np.inf
+        block_duals = {}
+        # Fase 1 (feasible=False): o mestre minimiza a soma das artificiais, com custo zero
+        # nas demais colunas; fase 2: custos originais, artificiais fixadas em zero
+        feasible = num_linking == 0
+        try:
+            # Colunas iniciais: subproblemas com os custos originais (pi = 0). Um bloco
+            # ilimitado contribui com o raio e com um ponto do subproblema com custo zero
+            initial = pool.solve({k: blocks[k]["c"] for k in range(num_blocks)})
+            rays = {k: result[2] for k, result in initial.items() if result[0] == "unbounded" and result[2] is not None}
+            if rays:
+                initial.update(pool.solve({k: np.zeros(len(cols_of[k])) for k in rays}))
+            failure = next((result[0] for result in initial.values() if result[0] != "optimal"), None)
+            if failure is not None:
+                self._finish(None, None, "Infeasible" if "nfeasible" in failure else failure, 0, start, begin, -np.inf)
+                return
+            columns = [make_column(k, initial[k][2], False) for k in range(num_blocks)]
+            columns += [make_column(k, ray, True) for k, ray in rays.items()]
+            for column in columns:
+                seen.add((column[0], column[1].tobytes()))
+
+            # Mestre: colunas estáticas, artificiais (+/-) nas linhas de ligação e colunas iniciais
+            identity = sp.identity(num_linking, format="csc")
+            fixed = sp.vstack([
+                sp.hstack([A_link[:, static], identity, -identity], format="csc"),
+                sp.csc_matrix((num_blocks, len(static) + 2 * num_linking)),
+            ], format="csc")
+            artificial = np.arange(len(static), len(static) + 2 * num_linking)
+            first = len(static) + 2 * num_linking
+            master = HighsSolver(lp=_highs_lp(
+                np.concatenate((c[static] if feasible else np.zeros(len(static)), np.ones(2 * num_linking))),
+                np.concatenate((d["lower"][static], np.zeros(2 * num_linking))),
+                np.concatenate((d["upper"][static], np.full(2 * num_linking, np.inf))),
+                fixed,
+                np.concatenate((d["row_lower"][linking], np.ones(num_blocks))),
+                np.concatenate((d["row_upper"][linking], np.ones(num_blocks))),
+            ), options=MASTER_OPTIONS)
+            if columns:
+                add_to_master(master, columns)
+            max_columns = self.max_master_columns or 10 * (num_linking + num_blocks + 1)
+
+            while iteration < self.max_iterations:
+                iteration += 1
+                master.run()
+                if master.model.getModelStatus() not in MASTER_FINAL:
+                    # Falha numérica partindo da base anterior: nova tentativa sem a base
+                    master.model.clearSolver()
+                    master.run()
+                master.tracer.events.clear()
+                master_status = master.model.getModelStatus()
+                if master_status != highspy.HighsModelStatus.kOptimal:
+                    status = master.model.modelStatusToString(master_status)
+                    break
+
+                solution = master.res
+                row_dual = np.asarray(solution.row_dual, dtype=np.float64)
+                pi, mu = row_dual[:num_linking], row_dual[num_linking:]
+                objective = master.model.getObjectiveValue()
+                threshold = self.tol * (1.0 + abs(objective))
+
+                if not feasible and objective <= ARTIFICIAL_TOL:
+                    # Fim da fase 1: artificiais fixadas em zero e custos originais no mestre
+                    feasible = True
+                    master.change_col_bounds(artificial, 0.0, 0.0)
+                    master.change_costs(np.arange(first + len(active)), np.concatenate(
+                        (c[static], np.zeros(2 * num_linking), [column[3] for column in active])))
+                    continue
+
+                # Pool de colunas: reentrada das colunas com custo reduzido negativo
+                if parked:
+                    matrix, costs = master_block(parked)
+                    reduced = (costs if feasible else 0.0) - matrix.T @ row_dual
+                    entering = set(np.flatnonzero(reduced < -threshold).tolist())
+                    if entering:
+                        add_to_master(master, [parked[j] for j in sorted(entering)])
+                        parked = [column for j, column in enumerate(parked) if j not in entering]
+                        continue
+
+                # Subproblemas com os custos reduzidos c_k - A_Lk'pi (fase 1: -A_Lk'pi)
+                reduced_costs = (c if feasible else 0.0) - A_link.T @ pi
+                results = pool.solve({k: reduced_costs[cols_of[k]] for k in range(num_blocks)})
+
+                columns, bounded, pricing, failure = [], True, 0.0, None
+                for k in range(num_blocks):
+                    kind, value, vector, duals = results[k]
+                    if kind == "optimal":
+                        block_duals[k] = duals
+                        pricing += min(0.0, value - mu[k])
+                        is_ray = False
+                        if value - mu[k] >= -threshold:
+                            continue
+                    elif kind == "unbounded" and vector is not None:
+                        bounded, is_ray = False, True
+                    else:
+                        failure = kind
+                        break
+                    key = (k, vector.tobytes())
+                    if key not in seen:
+                        seen.add(key)
+                        columns.append(make_column(k, vector, is_ray))
+                if failure is not None:
+                    status = "Infeasible" if "nfeasible" in failure else failure
+                    break
+
+                # Limitante de Lagrange: z + sum_k min(0, custo reduzido do subproblema k)
+                if bounded and feasible:
+                    lower_bound = max(lower_bound, objective + pricing)
+                gap = (objective - lower_bound) / (1.0 + abs(objective)) if np.isfinite(lower_bound) else np.inf
+
+                if not columns or gap <= self.tol:
+                    # Na fase 1, sem colunas que reduzam as artificiais, o problema é inviável
+                    status = "Optimal" if feasible else "Infeasible"
+                    break
+
+                add_to_master(master, columns)
+
+                # Colunas fora da base com custo reduzido positivo vão para o pool
+                if len(active) > max_columns:
+                    col_dual = np.asarray(solution.col_dual, dtype=np.float64)[first:first + len(active) - len(columns)]
+                    idle = np.flatnonzero(col_dual > threshold)
+                    if len(idle):
+                        idle_set = set(idle.tolist())
+                        parked.extend(active[j] for j in idle)
+                        active[:] = [column for j, column in enumerate(active) if j not in idle_set]
+                        master.delete_cols(first + idle)
+
+                if self.progress_callback is not None and self.progress_callback(
+                        {"iterations": iteration,
+                         "objective_value": d["objective_sense"] * (objective + d["objective_offset"]),
+                         "gap": gap, "phase": 2 if feasible else 1}):
+                    status = "Interrupted"
+                    break
+                if self.time_limit is not None and time.perf_counter() - start > self.time_limit:
+                    status = "Time limit"
+                    break
+
+            if master.res is None:
+                # Parada logo após acrescentar colunas: o mestre é resolvido com as colunas atuais
+                master.run()
+
+            # Solução do problema original: pesos do mestre aplicados aos pontos e raios
+            x = np.zeros(A.shape[1])
+            y = np.zeros(A.shape[0])
+            if master.res is not None and master.res.value_valid:
+                col_value = np.asarray(master.res.col_value, dtype=np.float64)
+                x[static] = col_value[:len(static)]
+                for weight, (k, vector, _, _, _) in zip(col_value[first:], active):
+                    x[cols_of[k]] += weight * vector
+                y[linking] = np.asarray(master.res.row_dual, dtype=np.float64)[:num_linking]
+            for k, duals in block_duals.items():
+                y[rows_of[k]] = duals
+        finally:
+            pool.close()
+
+        self._finish(x, y, status, iteration, start, begin, lower_bound, len(active) + len(parked))
+
+    def _finish(self, x, y, status, iteration, start, begin, lower_bound, columns=0):
+        """
+        Calcula as métricas no problema original e guarda o resultado.
+
+        A geração de colunas minimiza (o parser troca o sinal de c em problemas de
+        maximização); objetivo, limitante e duais voltam ao sentido original aqui.
+        """
+        d = self.data
+        sense = d["objective_sense"]
+        if x is None:
+            x, y = np.clip(np.zeros(d["A"].shape[1]), d["lower"], d["upper"]), np.zeros(d["A"].shape[0])
+        self.x, self.y = x, sense * y
+        metrics = kkt_metrics(d["A"], d["c"], d["row_lower"], d["row_upper"], d["lower"], d["upper"],
+                              x, y, d["objective_offset"])
+        self.tracer.add("solucao", begin, self.tracer.snapshot())
+        self.res = {
+            "status": status,
+            "metrics": to_objective_sense(metrics, sense),
+            "iterations": iteration,
+            "dual_bound": sense * (lower_bound + d["objective_offset"]),
+            "columns": columns,
+            "runtime": time.perf_counter() - start,
+        }
+
+    def print_results(self):
+        """
+        Imprime os resultados da otimização.
+        """
+        if self.res is None:
+            print("Nenhum resultado disponível.")
+            return
+
+        metrics = self.res["metrics"]
+        print(f"Status: {self.res['status']}")
+        print(f"Valor objetivo: {metrics['primal_objective']}")
+        print(f"Sucesso: {self.res['status'] == 'Optimal'}")
+        print(f"Número de iterações: {self.res['iterations']}")
+        print(f"Blocos: {self.num_blocks}, linhas de ligação: {int((self.row_blocks < 0).sum())}, "
+              f"colunas geradas: {self.res['columns']}")
+        print(f"Limitante de Lagrange: {self.res['dual_bound']}")
+
+    def get_results(self):
+        """
+        Retorna os resultados da otimização em formato de dicionário.
+
+        Returns:
+            dict: Dicionário com status, objective_value, success e iterations (rodadas
+                de geração de colunas, como em HighsSolver.get_results()), além de
+                dual_objective (limitante de Lagrange), gap, primal_feasibility,
+                dual_feasibility, blocks, linking_rows, columns (colunas geradas),
+                runtime, as soluções primal_solution, dual_prices (custos
+                reduzidos), slacks e dual_solution, os tempos por fase (timings) e
+                os eventos do tracer (trace)
+            None: Se não houver resultado
+        """
+        if self.res is None:
+            return None
+
+        metrics = self.res["metrics"]
+        with self.tracer.phase("extracao"):
+            slacks = row_slacks(metrics["activity"], self.data["row_lower"], self.data["row_upper"])
+        return {
+            "status": self.res["status"],
+            "objective_value": metrics["primal_objective"],
+            "dual_objective": self.res["dual_bound"],
+            "success": self.res["status"] == "Optimal",
+            "iterations": self.res["iterations"],
+            "gap": metrics["gap"],
+            "has_feasibility": True,
+            "primal_feasibility": metrics["primal_feasibility"],
+            "dual_feasibility": metrics["dual_feasibility"],
+            "blocks": self.num_blocks,
+            "linking_rows": int((self.row_blocks < 0).sum()),
+            "columns": self.res["columns"],
+            "runtime": self.res["runtime"],
+            "primal_solution": self.x,
+            "dual_prices": metrics["reduced_costs"],
+            "slacks": slacks,
+            "dual_solution": self.y,
+            "timings": self.tracer.summary(),
+            "trace": self.tracer.events,
+        }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python Decomposition_solver.py arquivo.mps [processos]")
+        sys.exit(1)
+
+    solver = DantzigWolfeSolver(sys.argv[1], workers=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    solver.run()
+    solver.print_results()
+
+
+if __name__ == "__main__":
+    main()
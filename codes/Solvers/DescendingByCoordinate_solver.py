@@ -0,0 +1,204 @@
+import sys
+import time
+import numpy as np
+
+from codes.lp_metrics import converged
+from codes.scaled_solver import ScaledSolver
+from codes.scaling import DEFAULT_METHOD
+
+# Equilíbrio da penalidade: razão tolerada entre os resíduos primal e dual e fator máximo de cada ajuste
+RHO_IMBALANCE = 10.0
+RHO_MAX_FACTOR = 2.0
+
+
+class CoordinateDescentSolver(ScaledSolver):
+    """
+    Classe para resolver problemas de programação linear por descida por coordenada.
+
+    O problema min c'x s.a. row_lower <= Ax <= row_upper, lower <= x <= upper é
+    escrito com variáveis de folga s = Ax e resolvido pelo método do Lagrangiano
+    aumentado:
+
+        L(x, s, lam) = c'x + lam'(Ax - s) + (rho/2) ||Ax - s||^2
+
+    Em cada época, s é minimizado de forma exata (projeção nos limites das
+    restrições) e x é minimizado por blocos de coordenadas, com passos de
+    Newton projetados nos limites das variáveis. O resíduo Ax - s é mantido
+    incrementalmente, de modo que atualizar um bloco custa O(nnz das colunas
+    do bloco). O passo de cada coordenada usa o limitante ESO
+    v_j = rho * sum_i A_ij^2 * w_i, onde w_i é o número de colunas do bloco na
+    linha i, o que garante descida mesmo atualizando o bloco inteiro de uma vez.
+
+    Não há fatoração: a memória é O(nnz + m + n), adequada para instâncias muito
+    largas. A leitura, a escala e os resultados vêm de ScaledSolver.
+
+    Atributos (além dos de ScaledSolver, com a matriz em CSC):
+        block_size (int): Número de colunas atualizadas por bloco
+        selection (str): Seleção dos blocos, "random" ou "cyclic"
+
+    Métodos:
+        run(): Executa a descida por coordenada
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    def __init__(self, instance_path, cache=None, block_size=32, selection="random", rho=1.0,
+                 tol=1e-4, max_iterations=5000, inner_sweeps=5, check_interval=10, time_limit=None, seed=0,
+                 tracer=None, scaling=DEFAULT_METHOD):
+        """
+        Inicializa o solver de descida por coordenada.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            block_size (int, optional): Colunas por bloco. Defaults to 32.
+            selection (str, optional): "random" (permutação a cada época) ou "cyclic". Defaults to "random".
+            rho (float, optional): Penalidade inicial do Lagrangiano aumentado. Defaults to 1.0.
+            tol (float, optional): Tolerância relativa de gap e resíduos. Defaults to 1e-4.
+            max_iterations (int, optional): Máximo de atualizações do multiplicador. Defaults to 5000.
+            inner_sweeps (int, optional): Épocas de descida entre atualizações do multiplicador. Defaults to 5.
+            check_interval (int, optional): Iterações entre testes de parada. Defaults to 10.
+            time_limit (float, optional): Tempo limite em segundos. Defaults to None.
+            seed (int, optional): Semente da seleção aleatória. Defaults to 0.
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
+            scaling (str, optional): Métodos de Scaling ("ruiz", "geometric", "pock_chambolle",
+                combinados com "+"), ou None para não escalar. Defaults to "ruiz+pock_chambolle".
+        """
+        if selection not in ("random", "cyclic"):
+            raise ValueError(f"Seleção de blocos inválida: {selection}")
+
+        super().__init__(instance_path, cache=cache, tracer=tracer, scaling=scaling, format="csc")
+        self.block_size = max(1, int(block_size))
+        self.selection = selection
+        self.rho = rho
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.inner_sweeps = inner_sweeps
+        self.check_interval = check_interval
+        self.time_limit = time_limit
+        self.rng = np.random.default_rng(seed)
+
+    def _block_step(self, A, cols, x, r, c, lower, upper, rho):
+        """
+        Atualiza um bloco de coordenadas de x e o resíduo r = Ax - s + lam/rho.
+
+        Returns:
+            np.ndarray: Incremento de Ax causado pela atualização do bloco
+        """
+        block = A[:, cols]
+
+        # Gradiente do Lagrangiano aumentado em relação às coordenadas do bloco
+        gradient = c[cols] + rho * (block.T @ r)
+
+        # Limitante ESO: w_i = número de colunas do bloco que tocam a linha i
+        counts = np.diff(block.indptr)
+        _, inverse, row_counts = np.unique(block.indices, return_inverse=True, return_counts=True)
+        col_of_nz = np.repeat(np.arange(len(cols)), counts)
+        curvature = rho * np.bincount(col_of_nz, weights=block.data ** 2 * row_counts[inverse], minlength=len(cols))
+
+        old = x[cols]
+        step = np.zeros(len(cols))
+        active = curvature > 0
+        step[active] = gradient[active] / curvature[active]
+        # Colunas vazias: a direção é dada só pelo custo (vai para o limite finito)
+        empty = ~active
+        step[empty & (gradient > 0) & np.isfinite(lower[cols])] = np.inf
+        step[empty & (gradient < 0) & np.isfinite(upper[cols])] = -np.inf
+
+        new = np.clip(old - step, lower[cols], upper[cols])
+        new = np.where(np.isfinite(new), new, old)
+        delta = new - old
+        x[cols] = new
+
+        increment = block @ delta
+        r += increment
+        return increment
+
+    def run(self):
+        """
+        Executa a descida por coordenada com Lagrangiano aumentado.
+
+        A cada check_interval iterações calcula o gap de dualidade e os resíduos
+        primal/dual (com y = -lam) e para quando todos estão abaixo de tol.
+
+        A penalidade parte de self.rho a cada execução e é ajustada para
+        equilibrar os resíduos primal e dual: quando um passa de RHO_IMBALANCE
+        vezes o outro, rho é multiplicado pela raiz da razão entre eles
+        (limitada a RHO_MAX_FACTOR). Os ajustes ficam cada vez mais espaçados,
+        para que o método de multiplicadores convirja com a penalidade já
+        equilibrada em vez de oscilar entre dois valores.
+        """
+        start = time.perf_counter()
+        begin = self.tracer.snapshot()
+        A = self.scaled["A"]
+        c = self.scaled["c"]
+        row_lower, row_upper = self.scaled["row_lower"], self.scaled["row_upper"]
+        lower, upper = self.scaled["lower"], self.scaled["upper"]
+        num_row, num_col = A.shape
+
+        rho = self.rho
+        next_update, updates = self.check_interval, 0
+        x = np.clip(np.zeros(num_col), lower, upper)
+        lam = np.zeros(num_row)
+        activity = A @ x
+        metrics = None
+        status = "Iteration limit"
+        iteration = 0
+
+        for iteration in range(1, self.max_iterations + 1):
+            for _ in range(self.inner_sweeps):
+                # Minimização exata em s: projeção de Ax + lam/rho nos limites das restrições
+                shifted = activity + lam / rho
+                s = np.clip(shifted, row_lower, row_upper)
+                r = shifted - s
+
+                order = self.rng.permutation(num_col) if self.selection == "random" else np.arange(num_col)
+                for first in range(0, num_col, self.block_size):
+                    cols = np.sort(order[first:first + self.block_size])
+                    activity += self._block_step(A, cols, x, r, c, lower, upper, rho)
+
+            s = np.clip(activity + lam / rho, row_lower, row_upper)
+            lam += rho * (activity - s)
+
+            if iteration % self.check_interval == 0 or iteration == self.max_iterations:
+                metrics = self._metrics(x, -lam)
+                # Evita acúmulo de erro do resíduo incremental (Ax do problema original, levado ao escalado)
+                activity = self.scaling.scale_activity(metrics["activity"])
+                if converged(metrics, self.tol):
+                    status = "Optimal"
+                    break
+                if self._progress(iteration, metrics):
+                    status = "Interrupted"
+                    break
+                if self.time_limit is not None and time.perf_counter() - start > self.time_limit:
+                    status = "Time limit"
+                    break
+
+                # Equilíbrio entre resíduos primal e dual, com ajustes cada vez mais espaçados
+                if iteration >= next_update:
+                    ratio = metrics["primal_feasibility"] / max(metrics["dual_feasibility"], np.finfo(float).tiny)
+                    if not 1.0 / RHO_IMBALANCE <= ratio <= RHO_IMBALANCE:
+                        rho *= np.clip(np.sqrt(ratio), 1.0 / RHO_MAX_FACTOR, RHO_MAX_FACTOR)
+                        updates += 1
+                    next_update = iteration + self.check_interval * (1 + updates)
+
+        if metrics is None:
+            metrics = self._metrics(x, -lam)
+
+        self.x = self.scaling.unscale_primal(x)
+        self.y = self.scaling.unscale_dual(-lam)
+        self._finish(status, metrics, iteration, start, begin)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python DescendingByCoordinate_solver.py arquivo.mps")
+        sys.exit(1)
+
+    solver = CoordinateDescentSolver(sys.argv[1])
+    solver.run()
+    solver.print_results()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,84 @@
 import sys
 import logging
 import highspy
+import numpy as np
+import scipy.sparse as sp
 
 from highspy import Highs
+from codes.compressed_io import detect_compression
+from codes.read_instance_regex import MPSParser, row_bounds
+from codes.basis_cache import BasisCache, model_fingerprint
+from codes.lp_metrics import row_slacks
+from codes.tracing import Tracer
+
+
+def build_highs_lp(raw):
+    """
+    Monta um HighsLp em memória a partir do dicionário de MPSParser.read().
+
+    A matriz é convertida das triplas COO para CSC (formato por colunas do
+    HiGHS) e os vetores NumPy são repassados diretamente, sem gravar nenhum
+    arquivo intermediário.
+
+    Args:
+        raw (dict): Dicionário retornado por MPSParser.read()
+
+    Returns:
+        HighsLp: Modelo pronto para Highs.passModel()
+    """
+    num_row = len(raw["row_names"])
+    num_col = len(raw["col_names"])
+    A = sp.csc_matrix((raw["values"], (raw["row_idx"], raw["col_idx"])), shape=(num_row, num_col))
+    row_lower, row_upper = row_bounds(raw["row_types"], raw["rhs"], raw["ranges"])
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = num_col
+    lp.num_row_ = num_row
+    lp.offset_ = float(raw["objective_offset"])
+    lp.sense_ = highspy.ObjSense.kMaximize if raw["objective_sense"] < 0 else highspy.ObjSense.kMinimize
+    lp.col_cost_ = raw["c"]
+    lp.col_lower_ = raw["lower"]
+    lp.col_upper_ = raw["upper"]
+    lp.row_lower_ = row_lower
+    lp.row_upper_ = row_upper
+    lp.col_names_ = raw["col_names"]
+    lp.row_names_ = raw["row_names"]
+
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.num_col_ = num_col
+    lp.a_matrix_.num_row_ = num_row
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    return lp
+
 
 class HighsSolver:
     """
     Classe para resolver problemas de programação linear usando o solver HiGHS.
 
     Esta classe encapsula a funcionalidade do solver HiGHS, permitindo carregar
-    e resolver problemas de programação linear no formato MPS.
+    e resolver problemas de programação linear no formato MPS. O modelo pode vir
+    do arquivo (readModel), de um HighsLp montado em memória (passModel) ou de
+    um objeto Highs que já tenha o modelo carregado.
 
     Atributos:
         instance_path (str): Caminho para o arquivo MPS de entrada
         model (Highs): Instância do solver HiGHS
+        lp (HighsLp): Modelo em memória a ser passado ao HiGHS (opcional)
+        options (dict): Opções do HiGHS aplicadas antes da solução (ex: {"solver": "ipm"})
+        basis_cache (BasisCache): Cache de bases para warm start (opcional)
+        warm_start (bool): Indica se a última solução partiu de uma base do cache ou da solução anterior
+        tracer (Tracer): Tempos e memória de cada fase (leitura, montagem, presolve, solução, extração)
         res (HighsSolution): Resultado da otimização após resolver o problema
 
     Métodos:
+        from_data(raw): Cria o solver a partir do dicionário de MPSParser.read()
+        from_file(path, cache): Cria o solver lendo o arquivo pelo MPSParser
+        load(): Carrega o modelo no HiGHS, se ainda não estiver carregado
         run(): Carrega e resolve o problema de otimização
+        change_costs, change_col_bounds, change_row_bounds, change_coefficients: Alteram o modelo carregado
+        add_rows, add_cols, delete_rows, delete_cols: Acrescentam ou removem linhas e colunas em lote
         print_results(): Imprime os resultados da otimização no console
         get_results(): Retorna um dicionário com os resultados da otimização
 
@@ -28,51 +89,330 @@ class HighsSolver:
     - Interface Python via highspy
     """
 
-    def __init__(self, instance_path):
+    def __init__(self, instance_path=None, lp=None, model=None, options=None, basis_cache=None, tracer=None):
         """
         Inicializa o solver HiGHS.
 
         Args:
-            instance_path (str): Caminho para o arquivo MPS que será resolvido
+            instance_path (str, optional): Caminho para o arquivo MPS que será resolvido
+            lp (HighsLp, optional): Modelo em memória, usado no lugar do arquivo
+            model (Highs, optional): Objeto Highs com o modelo já carregado
+            options (dict, optional): Opções do HiGHS, no formato {nome: valor}
+            basis_cache (BasisCache, optional): Cache de bases finais; quando informado,
+                a solução parte da base guardada para o mesmo modelo (ou para um
+                modelo com a mesma estrutura) e a base final é guardada ao terminar
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
 
         Atributos inicializados:
             instance_path: Armazena o caminho do arquivo
-            model: Cria uma nova instância do solver HiGHS
+            model: Usa o objeto Highs informado ou cria uma nova instância
+            lp: Armazena o modelo em memória
             res: Armazena o resultado da otimização (inicialmente None)
         """
+        if instance_path is None and lp is None and model is None:
+            raise ValueError("Informe o caminho da instância, um HighsLp ou um objeto Highs carregado")
+
         self.instance_path = instance_path
-        self.model = Highs()
+        self.lp = lp
+        self.model = model if model is not None else Highs()
+        self._loaded = model is not None
+        self.options = dict(options or {})
+        self.basis_cache = basis_cache
+        self.warm_start = False
+        self.cold_iterations = None
+        self.tracer = tracer if tracer is not None else Tracer()
         self.res = None
 
+        for name, value in self.options.items():
+            if self.model.setOptionValue(name, value) == highspy.HighsStatus.kError:
+                raise ValueError(f"Opção inválida do HiGHS: {name}={value!r}")
+
+    @classmethod
+    def from_data(cls, raw, instance_path=None, options=None, basis_cache=None, tracer=None):
+        """
+        Cria o solver a partir do dicionário de MPSParser.read(), sem reler o arquivo.
+
+        Args:
+            raw (dict): Dicionário retornado por MPSParser.read()
+            instance_path (str, optional): Caminho de origem, apenas para referência
+            options (dict, optional): Opções do HiGHS, no formato {nome: valor}
+            basis_cache (BasisCache, optional): Cache de bases para warm start
+            tracer (Tracer, optional): Tracer onde a montagem do HighsLp é registrada
+
+        Returns:
+            HighsSolver: Solver com o modelo montado em memória
+        """
+        tracer = tracer if tracer is not None else Tracer()
+        with tracer.phase("montagem"):
+            lp = build_highs_lp(raw)
+        return cls(instance_path, lp=lp, options=options, basis_cache=basis_cache, tracer=tracer)
+
+    @classmethod
+    def from_file(cls, instance_path, cache=None, options=None, basis_cache=None, tracer=None):
+        """
+        Cria o solver lendo o arquivo pelo MPSParser (e pelo cache binário, se informado).
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS (comprimido ou não)
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            options (dict, optional): Opções do HiGHS, no formato {nome: valor}
+            basis_cache (BasisCache, optional): Cache de bases para warm start
+            tracer (Tracer, optional): Tracer onde a leitura e a montagem são registradas
+
+        Returns:
+            HighsSolver: Solver com o modelo montado em memória
+        """
+        tracer = tracer if tracer is not None else Tracer()
+        raw = MPSParser(instance_path, cache=cache, tracer=tracer).read()
+        return cls.from_data(raw, instance_path, options=options, basis_cache=basis_cache, tracer=tracer)
+
+    def load(self):
+        """
+        Carrega o modelo no HiGHS, se ainda não estiver carregado.
+
+        Usa passModel() quando há um HighsLp em memória e readModel() caso contrário.
+        Arquivos comprimidos (gzip, bz2, xz) são lidos em streaming pelo MPSParser
+        e passados ao HiGHS com passModel(), sem cópia descomprimida em disco.
+
+        Raises:
+            Exception: Se o HiGHS não conseguir carregar o modelo
+        """
+        if self._loaded:
+            return
+
+        if self.lp is None and detect_compression(self.instance_path):
+            raw = MPSParser(self.instance_path, tracer=self.tracer).read()
+            with self.tracer.phase("montagem"):
+                self.lp = build_highs_lp(raw)
+
+        if self.lp is not None:
+            with self.tracer.phase("montagem"):
+                status = self.model.passModel(self.lp)
+        else:
+            # O readModel() do HiGHS lê o arquivo e monta o modelo em uma só etapa
+            with self.tracer.phase("leitura"):
+                status = self.model.readModel(self.instance_path)
+
+        if status == highspy.HighsStatus.kError:
+            raise Exception("Erro ao carregar o modelo MPS.")
+        self._loaded = True
+
     def run(self):
         """
         Executa o solver HiGHS para resolver o problema.
 
         Este método:
-        1. Carrega o modelo do arquivo MPS usando readModel()
+        1. Carrega o modelo usando load() (passModel() ou readModel())
         2. Verifica se o carregamento foi bem sucedido
-        3. Executa o solver usando run()
-        4. Obtém a solução usando getSolution()
+        3. Se o HiGHS já tem uma base válida (solução anterior, mantida pelas
+           modificações incrementais), parte dela (hot start); caso contrário
+           aplica a base do cache de bases, se houver uma para o modelo
+        4. Executa o solver usando run()
+        5. Obtém a solução usando getSolution() e guarda a base final no cache
 
         Em caso de erro:
         - Registra o erro no log
         - Define self.res como None
         """
         try:
-            # Carregar o modelo a partir do arquivo MPS
-            status = self.model.readModel(self.instance_path)
-            
-            if status != highspy.HighsStatus.kOk:
-                raise Exception("Erro ao carregar o modelo MPS.")
-            
+            # Carregar o modelo (em memória ou a partir do arquivo MPS)
+            self.load()
+
+            # Base da solução anterior, mantida pelo HiGHS após as modificações do modelo
+            hot_start = self.model.getBasis().valid
+            if hot_start:
+                self.warm_start = True
+
+            key = None
+            if self.basis_cache is not None:
+                key = model_fingerprint(self.lp if self.lp is not None else self.model.getLp())
+                entry = self.basis_cache.load(key) if not hot_start else None
+                if entry is not None:
+                    self.warm_start = BasisCache.apply(self.model, entry)
+                    self.cold_iterations = entry["cold_iterations"]
+
             # Resolver o problema de otimização
-            self.model.run()
+            self._timed_run()
             self.res = self.model.getSolution()
+            if not self.warm_start and self.cold_iterations is None:
+                # Referência para as iterações economizadas nas soluções seguintes
+                self.cold_iterations = self.iteration_count()
+
+            if key is not None and self.model.getModelStatus() == highspy.HighsModelStatus.kOptimal:
+                try:
+                    self.basis_cache.store(key, self.model.getBasis(), self.res, self.iteration_count())
+                except OSError as e:
+                    logging.warning(f"Não foi possível gravar a base no cache: {e}")
         
         except Exception as e:
             logging.error(f"Erro na execução do solver: {e}")
             self.res = None
 
+    def _prepare_edit(self):
+        """
+        Prepara o modelo para uma modificação incremental.
+
+        O modelo é carregado, se ainda não estiver, e o HighsLp montado deixa de
+        ser usado (o modelo do HiGHS passa a ser a referência, via getLp()). A
+        solução anterior é descartada, mas a base continua no HiGHS e é usada
+        pela próxima chamada de run().
+        """
+        self.load()
+        self.lp = None
+        self.res = None
+
+    @staticmethod
+    def _check(status, action):
+        """Levanta ValueError se o HiGHS recusar a modificação."""
+        if status == highspy.HighsStatus.kError:
+            raise ValueError(f"O HiGHS recusou a operação: {action}")
+
+    @staticmethod
+    def _indices(indices):
+        return np.ascontiguousarray(np.atleast_1d(indices), dtype=np.int32)
+
+    @staticmethod
+    def _values(values, size):
+        """Converte valores (escalares são repetidos) em um array float64 de tamanho size."""
+        return np.ascontiguousarray(np.broadcast_to(np.asarray(values, dtype=np.float64), (size,)))
+
+    def change_costs(self, indices, costs):
+        """
+        Altera os custos das colunas indicadas.
+
+        Args:
+            indices (array-like): Índices das colunas (base 0)
+            costs (array-like or float): Novos custos
+        """
+        self._prepare_edit()
+        indices = self._indices(indices)
+        self._check(self.model.changeColsCost(len(indices), indices, self._values(costs, len(indices))),
+                    "alterar custos")
+
+    def change_col_bounds(self, indices, lower, upper):
+        """
+        Altera os limites das colunas indicadas.
+
+        Args:
+            indices (array-like): Índices das colunas (base 0)
+            lower, upper (array-like or float): Novos limites (-inf/inf para livre)
+        """
+        self._prepare_edit()
+        indices = self._indices(indices)
+        self._check(self.model.changeColsBounds(len(indices), indices, self._values(lower, len(indices)),
+                                                self._values(upper, len(indices))), "alterar limites das colunas")
+
+    def change_row_bounds(self, indices, lower, upper):
+        """
+        Altera os limites das restrições indicadas.
+
+        O highspy não tem a versão em lote de changeRowBounds(), por isso as
+        restrições são alteradas uma a uma.
+
+        Args:
+            indices (array-like): Índices das restrições (base 0)
+            lower, upper (array-like or float): Novos limites (-inf/inf para sem limite)
+        """
+        self._prepare_edit()
+        indices = self._indices(indices)
+        lower, upper = self._values(lower, len(indices)), self._values(upper, len(indices))
+        for row, row_lower, row_upper in zip(indices.tolist(), lower.tolist(), upper.tolist()):
+            self._check(self.model.changeRowBounds(row, row_lower, row_upper), f"alterar limites da restrição {row}")
+
+    def change_coefficients(self, rows, cols, values):
+        """
+        Altera (ou cria, ou zera) coeficientes da matriz, um a um pelo changeCoeff() do HiGHS.
+
+        Args:
+            rows, cols (array-like): Posições dos coeficientes (base 0)
+            values (array-like or float): Novos valores (0 remove o coeficiente)
+        """
+        self._prepare_edit()
+        rows, cols = self._indices(rows), self._indices(cols)
+        values = self._values(values, len(rows))
+        for row, col, value in zip(rows.tolist(), cols.tolist(), values.tolist()):
+            self._check(self.model.changeCoeff(row, col, value), f"alterar o coeficiente ({row}, {col})")
+
+    def add_rows(self, lower, upper, matrix=None):
+        """
+        Acrescenta restrições em lote.
+
+        Args:
+            lower, upper (array-like): Limites das novas restrições
+            matrix (scipy.sparse matrix, optional): Coeficientes das novas linhas
+                (k x número de colunas). Defaults to linhas vazias.
+        """
+        self._prepare_edit()
+        lower = np.atleast_1d(np.asarray(lower, dtype=np.float64))
+        count = len(lower)
+        matrix = sp.csr_matrix(matrix if matrix is not None else (count, self.model.getNumCol()))
+        self._check(self.model.addRows(count, lower, self._values(upper, count), matrix.nnz,
+                                       self._indices(matrix.indptr[:-1]), self._indices(matrix.indices),
+                                       self._values(matrix.data, matrix.nnz)), "acrescentar restrições")
+
+    def add_cols(self, costs, lower, upper, matrix=None):
+        """
+        Acrescenta colunas (variáveis) em lote.
+
+        Args:
+            costs (array-like): Custos das novas colunas
+            lower, upper (array-like or float): Limites das novas colunas
+            matrix (scipy.sparse matrix, optional): Coeficientes das novas colunas
+                (número de restrições x k). Defaults to colunas vazias.
+        """
+        self._prepare_edit()
+        costs = np.atleast_1d(np.asarray(costs, dtype=np.float64))
+        count = len(costs)
+        matrix = sp.csc_matrix(matrix if matrix is not None else (self.model.getNumRow(), count))
+        self._check(self.model.addCols(count, costs, self._values(lower, count), self._values(upper, count),
+                                       matrix.nnz, self._indices(matrix.indptr[:-1]), self._indices(matrix.indices),
+                                       self._values(matrix.data, matrix.nnz)), "acrescentar colunas")
+
+    def delete_rows(self, indices):
+        """Remove as restrições indicadas (índices base 0)."""
+        self._prepare_edit()
+        indices = self._indices(indices)
+        self._check(self.model.deleteRows(len(indices), indices), "remover restrições")
+
+    def delete_cols(self, indices):
+        """Remove as colunas indicadas (índices base 0)."""
+        self._prepare_edit()
+        indices = self._indices(indices)
+        self._check(self.model.deleteCols(len(indices), indices), "remover colunas")
+
+    def _timed_run(self):
+        """
+        Executa model.run() registrando as fases "presolve" e "solucao".
+
+        O HiGHS não informa o tempo do presolve; o fim do presolve é marcado
+        pela primeira chamada dos callbacks de iteração do simplex ou do IPM.
+        Se nenhum for chamado (ex: presolve resolve o modelo, ou PDLP), todo o
+        tempo é registrado como "solucao".
+        """
+        split = []
+
+        def on_first_iteration(event):
+            if not split:
+                split.append(self.tracer.snapshot())
+
+        callbacks = (self.model.cbSimplexInterrupt, self.model.cbIpmInterrupt)
+        for callback in callbacks:
+            callback.subscribe(on_first_iteration)
+
+        begin = self.tracer.snapshot()
+        try:
+            self.model.run()
+        finally:
+            end = self.tracer.snapshot()
+            for callback in callbacks:
+                callback.unsubscribe(on_first_iteration)
+
+        if split:
+            self.tracer.add("presolve", begin, split[0])
+            self.tracer.add("solucao", split[0], end)
+        else:
+            self.tracer.add("solucao", begin, end)
+
     def print_results(self):
         """
         Imprime os resultados da otimização no console.
@@ -95,11 +435,70 @@ class HighsSolver:
             print(f"Status: {self.model.modelStatusToString(self.model.getModelStatus())}")
             print(f"Valor objetivo: {self.model.getObjectiveValue()}")
             print(f"success: {self.model.getModelStatus()}")
-            print(f"Número de iterações: {self.model.getInfo().simplex_iteration_count}")
+            print(f"Número de iterações: {self.iteration_count()}")
         
         except Exception as e:
             raise Exception(f"Erro ao imprimir resultados: {e}")
     
+    def iteration_count(self):
+        """
+        Retorna o total de iterações da última solução (simplex, IPM e PDLP).
+        """
+        info = self.model.getInfo()
+        return info.simplex_iteration_count + info.ipm_iteration_count + info.pdlp_iteration_count
+
+    def iterations_saved(self):
+        """
+        Estima as iterações economizadas pelo warm start.
+
+        Returns:
+            int: Iterações da solução a frio registrada no cache menos as iterações
+                desta solução (0 se não houve warm start)
+        """
+        if not self.warm_start or self.cold_iterations is None:
+            return 0
+        return max(0, self.cold_iterations - self.iteration_count())
+
+    def solution_arrays(self):
+        """
+        Extrai a solução completa do HiGHS como arrays NumPy.
+
+        O highspy entrega os vetores de HighsSolution como listas; cada vetor é
+        convertido uma única vez por np.asarray (laço em C), sem conversão
+        elemento a elemento em Python.
+
+        Returns:
+            dict: Dicionário contendo (vazio se não houver solução):
+                - primal_solution: Valores das colunas
+                - dual_prices: Custos reduzidos das colunas
+                - row_activity: Atividade das restrições (Ax)
+                - slacks: Folgas das restrições em relação ao limite finito
+                - dual_solution: Duais das restrições
+                - col_status / row_status: Status da base final (int8), quando a base é
+                  válida, para que outro processo parta da mesma base (BasisCache.apply)
+        """
+        arrays = {}
+        if self.res is None:
+            return arrays
+
+        if self.res.value_valid:
+            lp = self.lp if self.lp is not None else self.model.getLp()
+            arrays["primal_solution"] = np.asarray(self.res.col_value, dtype=np.float64)
+            arrays["row_activity"] = np.asarray(self.res.row_value, dtype=np.float64)
+            arrays["slacks"] = row_slacks(
+                arrays["row_activity"],
+                np.asarray(lp.row_lower_, dtype=np.float64),
+                np.asarray(lp.row_upper_, dtype=np.float64),
+            )
+        if self.res.dual_valid:
+            arrays["dual_prices"] = np.asarray(self.res.col_dual, dtype=np.float64)
+            arrays["dual_solution"] = np.asarray(self.res.row_dual, dtype=np.float64)
+        basis = self.model.getBasis()
+        if basis.valid:
+            arrays["col_status"] = np.array([int(status) for status in basis.col_status], dtype=np.int8)
+            arrays["row_status"] = np.array([int(status) for status in basis.row_status], dtype=np.int8)
+        return arrays
+
     def get_results(self):
         """
         Retorna os resultados da otimização em formato de dicionário.
@@ -109,7 +508,13 @@ class HighsSolver:
                 - status: Status do modelo em formato string
                 - objective_value: Valor final da função objetivo
                 - success: Status numérico do modelo
-                - iterations: Número de iterações do simplex
+                - iterations: Número de iterações (simplex, IPM e PDLP)
+                - warm_start: Se a solução partiu de uma base do cache ou da solução anterior
+                - iterations_saved: Iterações economizadas em relação à solução a frio
+                - runtime: Tempo de execução reportado pelo HiGHS
+                - os arrays de solution_arrays(), quando a solução é válida
+                - timings: Tempo de parede, tempo de CPU e pico de memória por fase
+                - trace: Eventos do tracer (formato Chrome trace)
             None: Se não houver resultado ou ocorrer erro
 
         O método captura exceções e registra erros no log caso ocorram.
@@ -118,11 +523,19 @@ class HighsSolver:
             return None
         
         try:
+            with self.tracer.phase("extracao"):
+                arrays = self.solution_arrays()
             return {
                 "status": self.model.modelStatusToString(self.model.getModelStatus()),
                 "objective_value": self.model.getObjectiveValue(),
                 "success": self.model.getModelStatus(),
-                "iterations": self.model.getInfo().simplex_iteration_count,
+                "iterations": self.iteration_count(),
+                "warm_start": self.warm_start,
+                "iterations_saved": self.iterations_saved(),
+                "runtime": self.model.getRunTime(),
+                **arrays,
+                "timings": self.tracer.summary(),
+                "trace": self.tracer.events,
             }
         
         except Exception as e:
@@ -1,10 +1,11 @@
 import sys
 import logging
-import highspy
+import numpy as np
 
-from highspy import Highs
 from scipy.optimize import linprog
 from codes.read_instance_regex import MPSParser
+from codes.lp_metrics import row_slacks
+from codes.tracing import Tracer
 
 class LinprogSolver:
     """
@@ -17,6 +18,7 @@ class LinprogSolver:
         instance_path (str): Caminho para o arquivo MPS de entrada
         parser (MPSParser): Parser para ler o arquivo MPS
         data (dict): Dados do problema extraídos do arquivo MPS
+        tracer (Tracer): Tempos e memória de cada fase (leitura, montagem, solução, extração)
         res (OptimizeResult): Resultado da otimização retornado pelo linprog
 
     Métodos:
@@ -25,16 +27,19 @@ class LinprogSolver:
         get_results(): Retorna um dicionário com os resultados da otimização
     """
 
-    def __init__(self, instance_path):
+    def __init__(self, instance_path, cache=None, tracer=None):
         """
         Inicializa o solver com o caminho do arquivo MPS.
 
         Args:
             instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
         """
         self.instance_path = instance_path
-        self.parser = MPSParser(instance_path)
-        self.data = self.parser.parse()
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.parser = MPSParser(instance_path, cache=cache, tracer=self.tracer)
+        self.data = self.parser.parse(sparse=True)
         self.res = None
 
     def run(self):
@@ -42,7 +47,8 @@ class LinprogSolver:
         Executa o solver linprog com os dados do problema.
 
         Extrai os dados necessários do dicionário self.data e chama o método
-        linprog do SciPy para resolver o problema de otimização.
+        linprog do SciPy para resolver o problema de otimização. As matrizes
+        esparsas do parser são repassadas diretamente, sem conversão para denso.
         """
         c = self.data["c"]
         A_ub = self.data["A_ub"]
@@ -51,13 +57,63 @@ class LinprogSolver:
         b_eq = self.data["b_eq"]
         bounds = self.data["bounds"]
         
-        self.res = linprog(
-            c=c,
-            A_ub=A_ub, b_ub=b_ub,
-            A_eq=A_eq, b_eq=b_eq,
-            bounds=bounds,
-            method="highs"
-        )
+        with self.tracer.phase("solucao"):
+            self.res = linprog(
+                c=c,
+                A_ub=A_ub, b_ub=b_ub,
+                A_eq=A_eq, b_eq=b_eq,
+                bounds=bounds,
+                method="highs"
+            )
+
+    def objective_value(self):
+        """
+        Retorna o valor objetivo incluindo a constante da função objetivo do MPS.
+
+        O linprog não recebe a constante (RHS da linha objetivo), então ela é
+        somada aqui para que o valor coincida com o reportado pelo HiGHS. Em
+        problemas de maximização o linprog minimiza -c'x, e o sinal é desfeito.
+        """
+        if self.res is None or self.res.fun is None:
+            return None
+        return self.data["objective_sense"] * (self.res.fun + self.data.get("objective_offset", 0.0))
+
+    def solution_arrays(self):
+        """
+        Extrai a solução completa do OptimizeResult como arrays NumPy.
+
+        Os multiplicadores do linprog se referem às linhas de A_ub e A_eq; eles
+        são levados de volta às restrições originais (ub_rows/ub_sign e
+        eq_rows), na convenção do HiGHS (custos reduzidos = c - A'y), e multiplicados
+        por objective_sense em problemas de maximização.
+
+        Returns:
+            dict: Dicionário contendo (vazio se não houver solução):
+                - primal_solution: Valores das variáveis
+                - dual_prices: Custos reduzidos das variáveis
+                - row_activity: Atividade das restrições (Ax)
+                - slacks: Folgas das restrições em relação ao limite finito
+                - dual_solution: Duais das restrições
+        """
+        arrays = {}
+        if self.res is None or self.res.x is None:
+            return arrays
+
+        x = np.asarray(self.res.x, dtype=np.float64)
+        arrays["primal_solution"] = x
+        arrays["row_activity"] = self.data["A"] @ x
+        arrays["slacks"] = row_slacks(arrays["row_activity"], self.data["row_lower"], self.data["row_upper"])
+
+        if getattr(self.res, "ineqlin", None) is not None:
+            sense = self.data["objective_sense"]
+            arrays["dual_prices"] = sense * (self.res.lower.marginals + self.res.upper.marginals)
+
+            dual = np.zeros(self.data["A"].shape[0])
+            # Uma restrição com RANGES gera duas linhas em A_ub (no máximo uma ativa)
+            np.add.at(dual, self.data["ub_rows"], self.data["ub_sign"] * self.res.ineqlin.marginals)
+            dual[self.data["eq_rows"]] = self.res.eqlin.marginals
+            arrays["dual_solution"] = sense * dual
+        return arrays
 
     def print_results(self):
         """
@@ -72,7 +128,7 @@ class LinprogSolver:
         
         try:
             print(f"Status: {self.res.message}")
-            print(f"Valor objetivo: {self.res.fun}")
+            print(f"Valor objetivo: {self.objective_value()}")
             print(f"Sucesso: {self.res.success}")
             print(f"Número de iterações: {self.res.nit}")
         
@@ -84,18 +140,24 @@ class LinprogSolver:
         Retorna um dicionário com os resultados da otimização.
 
         Returns:
-            dict: Dicionário contendo status, valor objetivo, sucesso e número de iterações
-                 ou None se não houver resultados ou ocorrer erro
+            dict: Dicionário contendo status, valor objetivo, sucesso, número de iterações,
+                 os arrays de solution_arrays(), os tempos por fase (timings) e os eventos
+                 do tracer (trace), ou None se não houver resultados ou ocorrer erro
         """
         if self.res is None:
             return None
         
         try:
+            with self.tracer.phase("extracao"):
+                arrays = self.solution_arrays()
             return {
                 "status": self.res.message,
-                "objective_value": self.res.fun,
+                "objective_value": self.objective_value(),
                 "success": self.res.success,
                 "iterations": self.res.nit,
+                **arrays,
+                "timings": self.tracer.summary(),
+                "trace": self.tracer.events,
             }
         
         except Exception as e:
@@ -105,13 +167,15 @@ class LinprogSolver:
 
 def main():
     if len(sys.argv) < 3:
-        print("Uso: python run_solver.py -h|-l arquivo.mps")
+        print("Uso: python Linprog_solver.py -h|-l arquivo.mps")
         sys.exit(1)
     
     solver_flag = sys.argv[1]
     mps_file = sys.argv[2]
     
     if solver_flag == "-h":
+        # Importado só quando pedido: o linprog não depende do highspy
+        from codes.Solvers.HighsSolver import HighsSolver
         solver = HighsSolver(mps_file)
     
     elif solver_flag == "-l":
@@ -0,0 +1,202 @@
+import time
+import logging
+import highspy
+import multiprocessing as mp
+
+from multiprocessing.connection import wait
+from codes.read_instance_regex import MPSParser
+from codes.Solvers.HighsSolver import HighsSolver
+from codes.Solvers.Linprog_solver import LinprogSolver
+
+# Métodos disputados na corrida: nome -> (backend, opções do HiGHS)
+PORTFOLIO_METHODS = {
+    "HiGHS simplex dual": ("highs", {"solver": "simplex", "simplex_strategy": 1}),
+    "HiGHS IPM": ("highs", {"solver": "ipm"}),
+    "HiGHS PDLP": ("highs", {"solver": "pdlp"}),
+    "Linprog": ("linprog", {}),
+}
+
+# Arrays da solução repassados pelo processo vencedor (ver HighsSolver.solution_arrays())
+SOLUTION_ARRAYS = ("primal_solution", "dual_prices", "slacks", "dual_solution")
+
+
+def _race_worker(method_name, backend, options, instance_path, raw, cache, conn):
+    """
+    Resolve o problema com um dos métodos do portfólio e envia o resultado pelo pipe.
+
+    O resultado é reduzido a tipos simples (str, float, int, bool, os tempos
+    por fase e os arrays NumPy de SOLUTION_ARRAYS) para poder ser enviado
+    entre processos.
+    """
+    start = time.perf_counter()
+    message = {"method": method_name, "results": None, "optimal": False, "error": None}
+    try:
+        if backend == "highs":
+            solver = HighsSolver.from_data(raw, instance_path, options={"output_flag": False, **options})
+            solver.run()
+            optimal = solver.model.getModelStatus() == highspy.HighsModelStatus.kOptimal
+        else:
+            solver = LinprogSolver(instance_path, cache=cache)
+            solver.run()
+            optimal = solver.res is not None and solver.res.status == 0
+
+        results = solver.get_results()
+        if results is not None:
+            message["results"] = {
+                "status": str(results["status"]),
+                "objective_value": results["objective_value"],
+                "success": bool(optimal),
+                "iterations": int(results["iterations"] or 0),
+                "timings": results.get("timings"),
+                "trace": results.get("trace"),
+                **{key: results[key] for key in SOLUTION_ARRAYS if key in results},
+            }
+            message["optimal"] = bool(optimal)
+
+    except Exception as e:
+        message["error"] = str(e)
+
+    message["time"] = time.perf_counter() - start
+    conn.send(message)
+    conn.close()
+
+
+class PortfolioSolver:
+    """
+    Classe que resolve o mesmo problema com vários métodos em paralelo ("corrida").
+
+    Cada método de PORTFOLIO_METHODS roda em um processo separado sobre o mesmo
+    modelo (lido uma única vez pelo processo principal). O primeiro resultado
+    com otimalidade comprovada é aceito e os demais processos são encerrados,
+    de modo que o tempo total fica próximo ao do melhor método para a instância.
+
+    Atributos:
+        instance_path (str): Caminho para o arquivo MPS de entrada
+        methods (list): Nomes dos métodos disputados
+        time_limit (float): Tempo limite da corrida em segundos (None para sem limite)
+        winner (str): Método vencedor após run()
+        attempts (dict): Resultado e tempo de cada método que terminou
+        res (dict): Resultado do método vencedor
+
+    Métodos:
+        run(): Executa a corrida entre os métodos
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    def __init__(self, instance_path, methods=None, cache=None, time_limit=None):
+        """
+        Inicializa o portfólio.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            methods (list, optional): Subconjunto de PORTFOLIO_METHODS. Defaults to todos.
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            time_limit (float, optional): Tempo limite da corrida em segundos
+        """
+        self.instance_path = instance_path
+        self.methods = list(methods or PORTFOLIO_METHODS)
+        for name in self.methods:
+            if name not in PORTFOLIO_METHODS:
+                raise ValueError(f"Método desconhecido no portfólio: {name}")
+
+        self.cache = cache
+        self.time_limit = time_limit
+        self.raw = MPSParser(instance_path, cache=cache).read()
+        self.winner = None
+        self.attempts = {}
+        self.res = None
+
+    def run(self):
+        """
+        Executa a corrida entre os métodos.
+
+        Inicia um processo por método e espera pelos resultados. O primeiro
+        resultado ótimo encerra a corrida; se nenhum método comprovar a
+        otimalidade, é usado o primeiro resultado disponível.
+        """
+        running = {}
+        for name in self.methods:
+            backend, options = PORTFOLIO_METHODS[name]
+            reader, writer = mp.Pipe(duplex=False)
+            process = mp.Process(
+                target=_race_worker,
+                args=(name, backend, options, self.instance_path, self.raw, self.cache, writer),
+                daemon=True,
+            )
+            process.start()
+            writer.close()
+            running[reader] = (name, process)
+
+        start = time.monotonic()
+        fallback = None
+        try:
+            while running and self.winner is None:
+                remaining = None
+                if self.time_limit is not None:
+                    remaining = self.time_limit - (time.monotonic() - start)
+                    if remaining <= 0:
+                        logging.warning("Tempo limite do portfólio excedido.")
+                        break
+
+                for reader in wait(list(running), timeout=remaining):
+                    name, process = running.pop(reader)
+                    try:
+                        message = reader.recv()
+                    except EOFError:
+                        message = {"results": None, "optimal": False, "time": None,
+                                   "error": f"Processo encerrado (código {process.exitcode})"}
+                    reader.close()
+                    process.join()
+
+                    self.attempts[name] = {key: message.get(key) for key in ("optimal", "time", "error")}
+                    self.attempts[name]["results"] = message["results"] and {
+                        key: value for key, value in message["results"].items() if key not in SOLUTION_ARRAYS}
+                    if message["optimal"] and self.winner is None:
+                        self.winner = name
+                        self.res = message["results"]
+                    elif message["results"] is not None and fallback is None:
+                        fallback = (name, message["results"])
+        finally:
+            # Encerra os métodos que ainda estão rodando
+            for reader, (name, process) in running.items():
+                process.kill()
+                process.join()
+                reader.close()
+
+        if self.winner is None and fallback is not None:
+            self.winner, self.res = fallback
+
+    def print_results(self):
+        """
+        Imprime os resultados da otimização e o método vencedor.
+        """
+        if self.res is None:
+            print("Nenhum resultado disponível.")
+            return
+
+        print(f"Método vencedor: {self.winner}")
+        print(f"Status: {self.res['status']}")
+        print(f"Valor objetivo: {self.res['objective_value']}")
+        print(f"Sucesso: {self.res['success']}")
+        print(f"Número de iterações: {self.res['iterations']}")
+
+    def get_results(self):
+        """
+        Retorna os resultados do método vencedor em formato de dicionário.
+
+        Returns:
+            dict: Dicionário com status, objective_value, success, iterations e as
+                soluções primal_solution, dual_prices, slacks e dual_solution do
+                método vencedor, além de winner (método vencedor) e attempts
+                (métodos que terminaram, sem os arrays da solução)
+            None: Se nenhum método retornou resultado
+        """
+        if self.res is None:
+            return None
+
+        return {
+            **self.res,
+            "winner": self.winner,
+            "attempts": self.attempts,
+        }
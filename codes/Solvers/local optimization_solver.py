@@ -0,0 +1,203 @@
+import sys
+import time
+import numpy as np
+
+from codes.lp_metrics import kkt_error, restart_due
+from codes.scaled_solver import ScaledSolver
+from codes.scaling import DEFAULT_METHOD
+
+# Suavização da atualização do peso primal
+PRIMAL_WEIGHT_SMOOTHING = 0.5
+
+
+class PDHGSolver(ScaledSolver):
+    """
+    Classe para resolver problemas de programação linear pelo PDHG com reinícios (estilo PDLP).
+
+    O LP min c'x s.a. row_lower <= Ax <= row_upper, lower <= x <= upper é
+    resolvido como o problema de ponto de sela
+
+        max_y min_x  c'x - y'Ax + sum_i min(y_i row_lower_i, y_i row_upper_i)
+
+    pelo método primal-dual do gradiente híbrido (Chambolle-Pock), com as
+    melhorias do PDLP:
+        - passo adaptativo: cada passo é aceito só se respeitar o limite local
+          ||dz||^2 / (2 |dx' A' dy|), e o próximo passo é ajustado a partir dele
+        - reinícios adaptativos: a cada check_interval iterações o iterado
+          corrente e a média desde o último reinício são comparados pelo erro
+          KKT, e o método reinicia no melhor quando o erro cai o suficiente
+        - peso primal: atualizado em cada reinício para equilibrar o
+          deslocamento primal e dual
+
+    Só usa produtos matriz-vetor esparsos: a memória é O(nnz + m + n), sem
+    fatoração. A leitura, a escala (Ruiz seguido de Pock-Chambolle, por padrão)
+    e os resultados vêm de ScaledSolver; o resultado inclui o número de reinícios.
+
+    Métodos:
+        run(): Executa o PDHG com reinícios
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    RESULT_LABELS = {"restarts": "Reinícios"}
+
+    def __init__(self, instance_path, cache=None, tol=1e-4, max_iterations=100000,
+                 check_interval=64, time_limit=None, tracer=None, scaling=DEFAULT_METHOD):
+        """
+        Inicializa o solver PDHG.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            tol (float, optional): Tolerância relativa de gap e resíduos. Defaults to 1e-4.
+            max_iterations (int, optional): Máximo de iterações PDHG. Defaults to 100000.
+            check_interval (int, optional): Iterações entre testes de reinício e parada. Defaults to 64.
+            time_limit (float, optional): Tempo limite em segundos. Defaults to None.
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
+            scaling (str, optional): Métodos de Scaling ("ruiz", "geometric", "pock_chambolle",
+                combinados com "+"), ou None para não escalar. Defaults to "ruiz+pock_chambolle".
+        """
+        super().__init__(instance_path, cache=cache, tracer=tracer, scaling=scaling)
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.check_interval = max(1, int(check_interval))
+        self.time_limit = time_limit
+
+    def run(self):
+        """
+        Executa o PDHG com passo adaptativo, reinícios e atualização do peso primal.
+
+        Para quando gap e resíduos relativos ficam abaixo de tol, ou ao atingir
+        o limite de iterações ou de tempo. A solução reportada é o último
+        candidato avaliado (iterado corrente ou média).
+        """
+        start = time.perf_counter()
+        begin = self.tracer.snapshot()
+        scaling = self.scaling
+        A = self.scaled["A"]
+        c = self.scaled["c"]
+        row_lower, row_upper = self.scaled["row_lower"], self.scaled["row_upper"]
+        lower, upper = self.scaled["lower"], self.scaled["upper"]
+        num_row, num_col = A.shape
+
+        finite_bounds = np.concatenate((row_lower[np.isfinite(row_lower)], row_upper[np.isfinite(row_upper)]))
+        cost_norm, bound_norm = np.linalg.norm(c), np.linalg.norm(finite_bounds)
+        weight = cost_norm / bound_norm if cost_norm > 0 and bound_norm > 0 else 1.0
+
+        max_entry = np.abs(A.data).max() if A.nnz else 1.0
+        step = 1.0 / max_entry
+
+        x = np.clip(np.zeros(num_col), lower, upper)
+        y = np.zeros(num_row)
+        activity = A @ x
+        dual_product = np.zeros(num_col)  # A'y
+
+        # Estado do ciclo desde o último reinício
+        x_start, y_start = x.copy(), y.copy()
+        x_sum, y_sum = np.zeros(num_col), np.zeros(num_row)
+        step_sum = 0.0
+        start_error = previous_error = np.inf
+        cycle_start = 0
+        restarts = 0
+
+        metrics = None
+        status = "Iteration limit"
+        iteration = 0
+        total_steps = 0
+
+        while iteration < self.max_iterations:
+            iteration += 1
+
+            # Passo PDHG com busca do passo adaptativo
+            while True:
+                total_steps += 1
+                primal_step, dual_step = step / weight, step * weight
+                x_new = np.clip(x - primal_step * (c - dual_product), lower, upper)
+                activity_new = A @ x_new
+                v = y - dual_step * (2.0 * activity_new - activity)
+                y_new = v + dual_step * np.clip(-v / dual_step, row_lower, row_upper)
+                dual_product_new = A.T @ y_new
+
+                dx, dy = x_new - x, y_new - y
+                movement = 0.5 * weight * (dx @ dx) + 0.5 * (dy @ dy) / weight
+                interaction = abs(dx @ (dual_product_new - dual_product))
+                limit = movement / interaction if interaction > 0 else np.inf
+
+                # Regra de atualização do passo do PDLP
+                next_step = min((1.0 - (total_steps + 1) ** -0.3) * limit, (1.0 + (total_steps + 1) ** -0.6) * step)
+                if step <= limit:
+                    break
+                step = next_step
+
+            x, y, activity, dual_product = x_new, y_new, activity_new, dual_product_new
+            x_sum += step * x
+            y_sum += step * y
+            step_sum += step
+            step = next_step
+
+            if iteration % self.check_interval != 0 and iteration != self.max_iterations:
+                continue
+
+            # Candidato a reinício: iterado corrente ou média do ciclo, o de menor erro KKT
+            current = self._metrics(x, y)
+            x_average, y_average = x_sum / step_sum, y_sum / step_sum
+            average = self._metrics(x_average, y_average)
+            if kkt_error(average) < kkt_error(current):
+                candidate, x_candidate, y_candidate = average, x_average, y_average
+            else:
+                candidate, x_candidate, y_candidate = current, x.copy(), y.copy()
+            metrics = candidate
+            self.x, self.y = scaling.unscale_primal(x_candidate), scaling.unscale_dual(y_candidate)
+
+            error = kkt_error(candidate)
+            if error <= self.tol:
+                status = "Optimal"
+                break
+            if self._progress(iteration, candidate):
+                status = "Interrupted"
+                break
+            if self.time_limit is not None and time.perf_counter() - start > self.time_limit:
+                status = "Time limit"
+                break
+
+            restart = restart_due(error, start_error, previous_error, iteration, cycle_start)
+            previous_error = error
+
+            if restart:
+                # Peso primal: razão entre os deslocamentos dual e primal do ciclo
+                primal_distance = np.linalg.norm(x_candidate - x_start)
+                dual_distance = np.linalg.norm(y_candidate - y_start)
+                if primal_distance > 1e-10 and dual_distance > 1e-10:
+                    weight = np.exp(PRIMAL_WEIGHT_SMOOTHING * np.log(dual_distance / primal_distance)
+                                    + (1.0 - PRIMAL_WEIGHT_SMOOTHING) * np.log(weight))
+
+                # Ax e A'y do candidato, levados das métricas (problema original) para o escalado
+                x, y = x_candidate.copy(), y_candidate.copy()
+                activity = scaling.scale_activity(candidate["activity"])
+                dual_product = c - scaling.scale_reduced_costs(candidate["reduced_costs"])
+                x_start, y_start = x.copy(), y.copy()
+                x_sum[:], y_sum[:] = 0.0, 0.0
+                step_sum = 0.0
+                start_error = previous_error = error
+                cycle_start = iteration
+                restarts += 1
+
+        if metrics is None:
+            self.x, self.y = scaling.unscale_primal(x), scaling.unscale_dual(y)
+            metrics = self._metrics(x, y)
+
+        self._finish(status, metrics, iteration, start, begin, restarts=restarts)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Uso: python "local optimization_solver.py" arquivo.mps')
+        sys.exit(1)
+
+    solver = PDHGSolver(sys.argv[1])
+    solver.run()
+    solver.print_results()
+
+
+if __name__ == "__main__":
+    main()
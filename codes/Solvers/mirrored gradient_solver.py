@@ -0,0 +1,234 @@
+import sys
+import time
+import numpy as np
+
+from codes.lp_metrics import converged, kkt_error, restart_due
+from codes.scaled_solver import ScaledSolver
+from codes.scaling import DEFAULT_METHOD
+
+# Limite das coordenadas espelhadas, para evitar overflow em exp()
+THETA_MAX = 700.0
+
+
+def _operator_norm(A, iterations=30):
+    """Estima ||A||_2 pelo método da potência (apenas produtos matriz-vetor)."""
+    v = np.ones(A.shape[1]) / np.sqrt(max(A.shape[1], 1))
+    norm = 0.0
+    for _ in range(iterations):
+        w = A.T @ (A @ v)
+        norm = np.linalg.norm(w)
+        if norm == 0:
+            return 0.0
+        v = w / norm
+    return np.sqrt(norm)
+
+
+class MirrorDescentSolver(ScaledSolver):
+    """
+    Classe para resolver problemas de programação linear por gradiente espelhado.
+
+    O LP min c'x s.a. row_lower <= Ax <= row_upper, lower <= x <= upper é tratado
+    como o problema de ponto de sela
+
+        max_y min_x  c'x - y'Ax + sum_i min(y_i row_lower_i, y_i row_upper_i)
+
+    e resolvido pelo método mirror-prox (gradiente espelhado extragradiente).
+    Cada variável usa a geometria (divergência de Bregman) adequada aos seus limites:
+        - caixa [l, u]: entropia de Fermi-Dirac, x = l + (u - l) sigmoid(theta),
+          com atualizações aditivas em theta (as variáveis nunca ficam presas nos limites)
+        - semi-limitadas e livres: euclidiana, com projeção nos limites
+    O termo das restrições é tratado pelo seu operador proximal, de forma que
+    os duais recebem um passo euclidiano exato no domínio de sinal de cada linha.
+
+    O passo é adaptativo (reduzido quando a condição de Lipschitz local falha
+    e aumentado aos poucos depois) e os iterados médios são ponderados pelos
+    passos. Como no PDHG, o método reinicia no melhor entre o iterado e a
+    média do ciclo quando o erro KKT cai o suficiente (critérios do PDLP, ver
+    restart_due): sem reinícios, a média ergódica converge só a O(1/k). O
+    critério de parada usa o gap de dualidade e os resíduos relativos, todos
+    vetorizados. Cada iteração custa quatro produtos matriz-vetor esparsos,
+    sem fatoração. A leitura, a escala e os resultados vêm de ScaledSolver; o
+    resultado inclui o número de reinícios.
+
+    Métodos:
+        run(): Executa o gradiente espelhado
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    RESULT_LABELS = {"restarts": "Reinícios"}
+
+    def __init__(self, instance_path, cache=None, tol=1e-4, max_iterations=20000,
+                 check_interval=50, time_limit=None, tracer=None, scaling=DEFAULT_METHOD):
+        """
+        Inicializa o solver de gradiente espelhado.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            tol (float, optional): Tolerância relativa de gap e resíduos. Defaults to 1e-4.
+            max_iterations (int, optional): Máximo de iterações. Defaults to 20000.
+            check_interval (int, optional): Iterações entre testes de parada. Defaults to 50.
+            time_limit (float, optional): Tempo limite em segundos. Defaults to None.
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
+            scaling (str, optional): Métodos de Scaling ("ruiz", "geometric", "pock_chambolle",
+                combinados com "+"), ou None para não escalar. Defaults to "ruiz+pock_chambolle".
+        """
+        super().__init__(instance_path, cache=cache, tracer=tracer, scaling=scaling)
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.check_interval = check_interval
+        self.time_limit = time_limit
+
+    def _mirror_step(self, theta, x, y, primal_gradient, dual_gradient, primal_step, dual_step):
+        """
+        Dá um passo espelhado a partir de (theta, x, y).
+
+        Returns:
+            tuple: (theta, x, y) após o passo
+        """
+        lower, upper = self.scaled["lower"], self.scaled["upper"]
+        row_lower, row_upper = self.scaled["row_lower"], self.scaled["row_upper"]
+        box, width = self._box, self._width
+
+        # Entropia de Fermi-Dirac escalada por (u - l) / 4, que a torna 1-fortemente convexa
+        theta = np.clip(theta - primal_step * primal_gradient * 4.0 / width, -THETA_MAX, THETA_MAX)
+        x = np.clip(x - primal_step * primal_gradient, lower, upper)
+        x[box] = lower[box] + width[box] / (1.0 + np.exp(-theta[box]))
+
+        # Operador proximal de -sum_i min(y_i row_lower_i, y_i row_upper_i)
+        v = y + dual_step * dual_gradient
+        y = v + dual_step * np.clip(-v / dual_step, row_lower, row_upper)
+        return theta, x, y
+
+    def _theta(self, x):
+        """Coordenadas espelhadas das variáveis de caixa no ponto x (inversa da sigmoide)."""
+        lower, box, width = self.scaled["lower"], self._box, self._width
+        theta = np.zeros_like(x)
+        fraction = np.clip((x[box] - lower[box]) / width[box], np.finfo(float).tiny, 1.0 - np.finfo(float).eps)
+        theta[box] = np.clip(np.log(fraction) - np.log1p(-fraction), -THETA_MAX, THETA_MAX)
+        return theta
+
+    def run(self):
+        """
+        Executa o mirror-prox com passos adaptativos, médias ergódicas e reinícios.
+
+        A cada check_interval iterações avalia o iterado médio do ciclo e o
+        último iterado, reinicia no de menor erro KKT quando restart_due()
+        indicar, guarda o melhor candidato visto e para quando gap e resíduos
+        ficam abaixo de tol.
+        """
+        start = time.perf_counter()
+        begin = self.tracer.snapshot()
+        scaling = self.scaling
+        A = self.scaled["A"]
+        c = self.scaled["c"]
+        row_lower, row_upper = self.scaled["row_lower"], self.scaled["row_upper"]
+        lower, upper = self.scaled["lower"], self.scaled["upper"]
+
+        self._box = np.isfinite(lower) & np.isfinite(upper) & (lower < upper)
+        self._width = np.where(self._box, upper - lower, 1.0)
+
+        # Peso primal: equilibra as escalas dos custos e dos lados direitos
+        finite_bounds = np.concatenate((row_lower[np.isfinite(row_lower)], row_upper[np.isfinite(row_upper)]))
+        cost_norm, bound_norm = np.linalg.norm(c), np.linalg.norm(finite_bounds)
+        weight = cost_norm / bound_norm if cost_norm > 0 and bound_norm > 0 else 1.0
+
+        norm = _operator_norm(A)
+        step = 0.9 / norm if norm > 0 else 1.0
+
+        theta = np.zeros(A.shape[1])
+        x = np.clip(np.zeros(A.shape[1]), lower, upper)
+        x[self._box] = lower[self._box] + self._width[self._box] / 2.0
+        y = np.zeros(A.shape[0])
+        x_sum, y_sum = np.zeros_like(x), np.zeros_like(y)
+        step_sum = 0.0
+
+        # Estado do ciclo desde o último reinício
+        start_error = previous_error = np.inf
+        cycle_start = 0
+        restarts = 0
+
+        best, best_error = None, np.inf
+        status = "Iteration limit"
+        iteration = 0
+
+        for iteration in range(1, self.max_iterations + 1):
+            primal_gradient, dual_gradient = c - A.T @ y, -(A @ x)
+
+            while True:
+                primal_step, dual_step = step / weight, step * weight
+                theta_half, x_half, y_half = self._mirror_step(
+                    theta, x, y, primal_gradient, dual_gradient, primal_step, dual_step)
+                primal_half, dual_half = c - A.T @ y_half, -(A @ x_half)
+
+                # Condição de Lipschitz local na norma ponderada pelo peso primal
+                movement = np.sqrt(weight * np.sum((x_half - x) ** 2) + np.sum((y_half - y) ** 2) / weight)
+                change = np.sqrt(np.sum((primal_half - primal_gradient) ** 2) / weight
+                                 + weight * np.sum((dual_half - dual_gradient) ** 2))
+                if step * change <= movement or step < 1e-12:
+                    break
+                step /= 2.0
+
+            theta, x, y = self._mirror_step(theta, x, y, primal_half, dual_half, primal_step, dual_step)
+
+            # Média ergódica dos pontos intermediários, ponderada pelos passos
+            x_sum += step * x_half
+            y_sum += step * y_half
+            step_sum += step
+            step *= 1.05
+
+            if iteration % self.check_interval == 0 or iteration == self.max_iterations:
+                # Candidato: iterado corrente ou média do ciclo, o de menor erro KKT
+                x_average, y_average = x_sum / step_sum, y_sum / step_sum
+                current, average = self._metrics(x, y), self._metrics(x_average, y_average)
+                if kkt_error(average) < kkt_error(current):
+                    candidate, x_candidate, y_candidate = average, x_average, y_average
+                else:
+                    candidate, x_candidate, y_candidate = current, x.copy(), y.copy()
+
+                error = kkt_error(candidate)
+                if error < best_error:
+                    best = (scaling.unscale_primal(x_candidate), scaling.unscale_dual(y_candidate), candidate)
+                    best_error = error
+
+                if converged(best[2], self.tol):
+                    status = "Optimal"
+                    break
+                if self._progress(iteration, best[2]):
+                    status = "Interrupted"
+                    break
+                if self.time_limit is not None and time.perf_counter() - start > self.time_limit:
+                    status = "Time limit"
+                    break
+
+                restart = restart_due(error, start_error, previous_error, iteration, cycle_start)
+                previous_error = error
+                if restart:
+                    x, y = x_candidate, y_candidate
+                    theta = self._theta(x)
+                    x_sum[:], y_sum[:] = 0.0, 0.0
+                    step_sum = 0.0
+                    start_error = previous_error = error
+                    cycle_start = iteration
+                    restarts += 1
+
+        if best is None:
+            best = (scaling.unscale_primal(x), scaling.unscale_dual(y), self._metrics(x, y))
+
+        self.x, self.y, metrics = best
+        self._finish(status, metrics, iteration, start, begin, restarts=restarts)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Uso: python "mirrored gradient_solver.py" arquivo.mps')
+        sys.exit(1)
+
+    solver = MirrorDescentSolver(sys.argv[1])
+    solver.run()
+    solver.print_results()
+
+
+if __name__ == "__main__":
+    main()
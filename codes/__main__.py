@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import argparse
+
+# Só a biblioteca padrão e o registro são importados aqui: o módulo do solver escolhido
+# (e com ele highspy, SciPy etc.) é carregado em _solve(), depois de ler os argumentos
+from codes.solver_registry import SOLVERS, create_solver
+
+
+def _solve(args):
+    """Resolve uma instância com o solver escolhido e imprime (e opcionalmente grava) os resultados."""
+    if not os.path.exists(args.instance):
+        print(f"Erro: Arquivo '{args.instance}' não encontrado.")
+        return 1
+
+    method = args.method
+    if method == "auto":
+        from codes.memory_estimator import MemoryEstimate, MemoryBudgetError
+        try:
+            method = MemoryEstimate.from_file(args.instance).choose_solver(args.memory_budget)
+        except MemoryBudgetError as e:
+            print(f"Erro: {e}")
+            return 1
+        print(f"Solver escolhido pela memória: {method}")
+
+    options = {}
+    if args.cache:
+        from codes.instance_cache import InstanceCache
+        options["cache"] = InstanceCache(args.cache)
+
+    start = time.perf_counter()
+    solver = create_solver(method, args.instance, **options)
+
+    if method == "highs":
+        if args.quiet:
+            solver.model.setOptionValue("output_flag", False)
+        if args.time_limit:
+            solver.model.setOptionValue("time_limit", float(args.time_limit))
+    elif args.time_limit:
+        if hasattr(solver, "time_limit"):
+            solver.time_limit = args.time_limit
+        else:
+            print(f"Aviso: o solver {method} não tem tempo limite; --time-limit ignorado")
+
+    solver.run()
+    solver.print_results()
+    results = solver.get_results()
+    elapsed = time.perf_counter() - start
+    print(f"Tempo total: {elapsed:.3f} s")
+    if results is None:
+        return 1
+
+    if args.trace and results.get("trace"):
+        from codes.tracing import Tracer
+        tracer = Tracer()
+        tracer.extend(results["trace"])
+        print(f"Trace gravado em: {tracer.export_chrome_trace(args.trace)}")
+
+    if args.output:
+        from codes.generate_output_file import generate_output_file
+        name = os.path.basename(args.instance).split(".")[0]
+        output_path = generate_output_file(
+            output_folder=args.output,
+            problem_name=f"{SOLVERS[method].label}_{name}",
+            solver_results={
+                "valor_otimo_primal": results.get("objective_value", 0),
+                "iterations": results.get("iterations", 0),
+                "gap": results.get("gap", 0),
+                "valor_otimo_dual": results.get("dual_objective", results.get("objective_value", 0)),
+                "viabilidade_primal": results.get("primal_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
+                "viabilidade_dual": results.get("dual_feasibility", 0) if results.get("has_feasibility", False) else 0.0,
+                "tempo": results.get("runtime", elapsed),
+            },
+            primal_solution=results.get("primal_solution"),
+            dual_prices=results.get("dual_prices"),
+            slacks=results.get("slacks"),
+            dual_solution=results.get("dual_solution")
+        )
+        print(f"Arquivo gerado: {output_path}")
+    return 0
+
+
+def _list(args):
+    """Lista os solvers registrados."""
+    for name, spec in SOLVERS.items():
+        print(f"{name:<12} {spec.label:<24} {spec.description}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m codes", description="Solver de programação linear")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="Resolve uma instância MPS")
+    solve.add_argument("instance", help="Arquivo .mps (ou .mps.gz/.bz2/.xz)")
+    solve.add_argument("-m", "--method", default="highs", choices=list(SOLVERS) + ["auto"],
+                       help="Solver (auto: o primeiro que cabe na memória). Padrão: highs")
+    solve.add_argument("--time-limit", type=float, default=None, help="Tempo limite em segundos")
+    solve.add_argument("--memory-budget", type=float, default=None,
+                       help="Orçamento de memória em MB para --method auto (padrão: memória disponível)")
+    solve.add_argument("--cache", default=None, help="Pasta do cache binário de instâncias")
+    solve.add_argument("--output", default=None, help="Pasta onde gravar o arquivo de resultados")
+    solve.add_argument("--trace", default=None, help="Arquivo JSON do trace por fase (Chrome/Perfetto)")
+    solve.add_argument("-q", "--quiet", action="store_true", help="Desliga o log do HiGHS")
+    solve.set_defaults(handler=_solve)
+
+    listing = commands.add_parser("list", help="Lista os solvers disponíveis")
+    listing.set_defaults(handler=_list)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
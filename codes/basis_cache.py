@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import highspy
+import numpy as np
+
+from codes.disk_cache import DiskCache
+
+# Vetores da solução guardados junto com a base (iterado final do IPM/PDLP)
+SOLUTION_KEYS = ("col_value", "col_dual", "row_value", "row_dual")
+
+
+def model_fingerprint(lp):
+    """
+    Calcula a impressão digital estrutural de um modelo HiGHS.
+
+    A impressão considera apenas as dimensões e o padrão de esparsidade da
+    matriz, não os valores de custos, limites ou coeficientes. Assim, um modelo
+    com pequenas alterações nesses valores reaproveita a base do original.
+
+    Args:
+        lp (HighsLp): Modelo do HiGHS (ex: Highs.getLp())
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    digest = hashlib.sha256(f"{lp.num_col_}x{lp.num_row_}".encode())
+    digest.update(np.asarray(lp.a_matrix_.start_, dtype=np.int64).tobytes())
+    digest.update(np.asarray(lp.a_matrix_.index_, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+class BasisCache(DiskCache):
+    """
+    Cache em disco das bases finais do HiGHS, por impressão digital do modelo.
+
+    Cada entrada guarda os status da base (colunas e linhas), os vetores da
+    solução e o número de iterações da solução original a frio, usado para
+    estimar as iterações economizadas pelo warm start.
+
+    Métodos:
+        load(key): Retorna a entrada com a base e a solução, ou None
+        store(key, basis, solution, iterations): Grava a base final de uma solução
+        apply(highs, entry): Aplica a base (ou a solução) a um objeto Highs
+    """
+
+    def __init__(self, cache_dir="cache/bases", max_bytes=256 << 20):
+        """
+        Inicializa o cache de bases.
+
+        Args:
+            cache_dir (str, optional): Pasta do cache. Defaults to "cache/bases".
+            max_bytes (int, optional): Tamanho máximo do cache. Defaults to 256 MiB.
+        """
+        super().__init__(cache_dir, max_bytes)
+
+    def load(self, key):
+        """
+        Carrega a base guardada para um modelo.
+
+        Returns:
+            dict: Dicionário com col_status, row_status, os vetores de SOLUTION_KEYS,
+                basis_valid e cold_iterations, ou None se não houver entrada
+        """
+        path = self.lookup(key)
+        if path is None:
+            return None
+
+        try:
+            with open(os.path.join(path, "meta.json"), "r") as file:
+                entry = json.load(file)
+            with np.load(os.path.join(path, "basis.npz")) as arrays:
+                entry.update({name: arrays[name] for name in arrays.files})
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def store(self, key, basis, solution, iterations):
+        """
+        Grava a base final e a solução de um modelo.
+
+        Se já existir uma entrada, o número de iterações a frio é preservado, para
+        que as iterações economizadas continuem sendo medidas contra a solução original.
+
+        Args:
+            key (str): Impressão digital do modelo
+            basis (HighsBasis): Base final do HiGHS
+            solution (HighsSolution): Solução final do HiGHS
+            iterations (int): Iterações usadas nesta solução
+        """
+        previous = self.load(key)
+        cold_iterations = previous["cold_iterations"] if previous else iterations
+
+        def writer(tmp_dir):
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as file:
+                json.dump({"basis_valid": bool(basis.valid), "cold_iterations": int(cold_iterations)}, file)
+            arrays = {name: np.asarray(getattr(solution, name), dtype=np.float64) for name in SOLUTION_KEYS}
+            arrays["col_status"] = np.array([int(status) for status in basis.col_status], dtype=np.int8)
+            arrays["row_status"] = np.array([int(status) for status in basis.row_status], dtype=np.int8)
+            np.savez(os.path.join(tmp_dir, "basis.npz"), **arrays)
+
+        if previous is not None:
+            # Substitui a entrada anterior pela base mais recente
+            self.remove(key)
+        self.commit(key, writer)
+
+    @staticmethod
+    def apply(highs, entry):
+        """
+        Aplica uma entrada do cache a um objeto Highs com o modelo já carregado.
+
+        Usa setBasis() quando a base é válida (simplex) e setSolution() com o
+        iterado guardado caso contrário (IPM/PDLP sem crossover).
+
+        Returns:
+            bool: True se o warm start foi aceito pelo HiGHS
+        """
+        if entry["basis_valid"] and len(entry["col_status"]) == highs.getNumCol() \
+                and len(entry["row_status"]) == highs.getNumRow():
+            basis = highspy.HighsBasis()
+            basis.valid = True
+            basis.col_status = [highspy.HighsBasisStatus(int(status)) for status in entry["col_status"]]
+            basis.row_status = [highspy.HighsBasisStatus(int(status)) for status in entry["row_status"]]
+            return highs.setBasis(basis) == highspy.HighsStatus.kOk
+
+        if len(entry["col_value"]) == highs.getNumCol() and len(entry["row_dual"]) == highs.getNumRow():
+            solution = highspy.HighsSolution()
+            solution.value_valid = True
+            solution.dual_valid = True
+            for name in SOLUTION_KEYS:
+                setattr(solution, name, entry[name])
+            return highs.setSolution(solution) == highspy.HighsStatus.kOk
+
+        return False
@@ -0,0 +1,301 @@
+import os
+import csv
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import resource
+import multiprocessing as mp
+
+from collections import deque
+from multiprocessing.connection import wait
+
+from codes.compressed_io import list_instances
+from codes.instance_cache import InstanceCache
+from codes.netlib_reference import reference_objective, check_objective
+from codes.result_cache import ResultCache, is_optimal
+from codes.read_instance_regex import MPSParser
+from codes.solver_registry import SOLVERS, create_solver
+from codes.Solvers.HighsSolver import HighsSolver
+from codes.Solvers.Linprog_solver import LinprogSolver
+from codes.tracing import Tracer
+
+# Campos gravados para cada par (instância, solver)
+FIELDS = [
+    "instance", "solver", "status", "success", "objective_value", "reference",
+    "verified", "iterations", "parse_time", "solve_time", "peak_rss_mb", "cache_hit", "error",
+]
+# Tempo dado a um job para encerrar os seus processos filhos após SIGTERM, antes de SIGKILL
+TERMINATE_GRACE = 5.0
+
+
+def _highs_backend(instance_path, cache):
+    tracer = Tracer()
+    raw = MPSParser(instance_path, cache=cache, tracer=tracer).read()
+    solver = HighsSolver.from_data(raw, instance_path, tracer=tracer)
+    solver.model.setOptionValue("output_flag", False)
+    solver.load()
+    return solver
+
+
+def _linprog_backend(instance_path, cache):
+    return LinprogSolver(instance_path, cache=cache)
+
+
+# Cada backend recebe (caminho, cache) e devolve o solver já com o modelo carregado.
+# Os demais solvers do registro (PDHG, decomposição, ...) são criados por create_solver().
+BACKENDS = {
+    "highs": _highs_backend,
+    "linprog": _linprog_backend,
+}
+
+
+def _create_backend(solver_name, instance_path, cache):
+    """Cria o solver pelo backend dedicado ou, se não houver, pelo registro de solvers."""
+    if solver_name in BACKENDS:
+        return BACKENDS[solver_name](instance_path, cache)
+    return create_solver(solver_name, instance_path, cache=cache)
+
+
+def _solve_job(instance_path, solver_name, conn, memory_limit_mb, cache_dir, result_cache_dir=None):
+    """
+    Resolve uma instância em um processo separado e envia o registro pelo pipe.
+
+    O tempo de leitura (parse_time) inclui o parsing e o carregamento do modelo
+    no solver; o tempo de solução (solve_time) inclui apenas run(). Com o cache
+    de resultados, o modelo é lido primeiro para calcular a impressão digital e,
+    em caso de acerto, o solver não é executado (solve_time = 0).
+    """
+    # SIGTERM vira SystemExit, para que os processos filhos do solver (ex: portfólio) sejam encerrados
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+    if memory_limit_mb:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    record = {"instance": os.path.basename(instance_path), "solver": solver_name}
+    try:
+        cache = InstanceCache(cache_dir) if cache_dir else None
+        result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+        results = key = None
+
+        start = time.perf_counter()
+        if result_cache is not None:
+            key = result_cache.key(MPSParser(instance_path, cache=cache).read(), solver_name)
+            results = result_cache.load(key)
+            record["cache_hit"] = results is not None
+
+        if results is None:
+            solver = _create_backend(solver_name, instance_path, cache)
+            record["parse_time"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            solver.run()
+            record["solve_time"] = time.perf_counter() - start
+
+            results = solver.get_results()
+            if result_cache is not None:
+                result_cache.store(key, results)
+        else:
+            record["parse_time"] = time.perf_counter() - start
+            record["solve_time"] = 0.0
+
+        if results is None:
+            record["status"] = "erro"
+            record["error"] = "O solver não retornou resultados"
+        else:
+            record["status"] = str(results["status"])
+            record["success"] = is_optimal(results)
+            record["objective_value"] = results["objective_value"]
+            record["iterations"] = results["iterations"]
+
+    except MemoryError:
+        record["status"] = "limite de memória"
+        record["error"] = f"Limite de {memory_limit_mb} MB excedido"
+    except Exception as e:
+        record["status"] = "erro"
+        record["error"] = str(e)
+
+    record["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    conn.send(record)
+    conn.close()
+
+
+def _finalize(record, rtol=1e-6):
+    """Completa o registro com o valor de referência e a verificação do objetivo (tolerância relativa rtol)."""
+    record["reference"] = reference_objective(record["instance"])
+    record["verified"] = check_objective(record["instance"], record.get("objective_value"), rtol)
+    return {field: record.get(field) for field in FIELDS}
+
+
+def _stop(process):
+    """Encerra um job: SIGTERM e, se ele não terminar em TERMINATE_GRACE segundos, SIGKILL."""
+    process.terminate()
+    process.join(TERMINATE_GRACE)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def run_benchmark(instances, solvers, workers=None, timeout=600.0, memory_limit_mb=None, cache_dir=None,
+                  result_cache_dir=None, rtol=1e-6):
+    """
+    Resolve todas as combinações (instância, solver) em um conjunto de processos.
+
+    Cada job roda no seu próprio processo, o que permite encerrar apenas o job
+    que excedeu o tempo limite e aplicar um limite de memória (RLIMIT_AS) por job.
+    Os processos não são daemon, para que solvers que criam processos (portfólio
+    e decomposição) possam ser executados; os que restarem são encerrados no fim.
+
+    Args:
+        instances (list): Caminhos das instâncias MPS
+        solvers (list): Nomes dos solvers (chaves de SOLVERS no registro)
+        workers (int, optional): Número máximo de jobs simultâneos. Defaults to os.cpu_count().
+        timeout (float, optional): Tempo limite por job em segundos. Defaults to 600.
+        memory_limit_mb (int, optional): Limite de memória por job em MB. Defaults to None.
+        cache_dir (str, optional): Pasta do cache binário de instâncias. Defaults to None.
+        result_cache_dir (str, optional): Pasta do cache de resultados (ResultCache). Defaults to None.
+        rtol (float, optional): Tolerância relativa da verificação do objetivo. Defaults to 1e-6.
+
+    Returns:
+        list: Registros (dicionários com os campos de FIELDS), na ordem de término
+    """
+    for name in solvers:
+        if name not in SOLVERS:
+            raise ValueError(f"Solver desconhecido: {name}. Opções: {', '.join(SOLVERS)}")
+
+    workers = workers or os.cpu_count() or 1
+    jobs = deque((path, name) for path in instances for name in solvers)
+    running = {}
+    results = []
+
+    try:
+        while jobs or running:
+            while jobs and len(running) < workers:
+                instance_path, solver_name = jobs.popleft()
+                reader, writer = mp.Pipe(duplex=False)
+                process = mp.Process(
+                    target=_solve_job,
+                    args=(instance_path, solver_name, writer, memory_limit_mb, cache_dir, result_cache_dir),
+                )
+                process.start()
+                writer.close()
+                running[reader] = (process, instance_path, solver_name, time.monotonic())
+
+            now = time.monotonic()
+            deadline = min(start + timeout for _, _, _, start in running.values())
+            wait(list(running), timeout=max(0.0, deadline - now))
+
+            for reader in list(running):
+                process, instance_path, solver_name, start = running[reader]
+                record = None
+
+                if reader.poll():
+                    try:
+                        record = reader.recv()
+                    except EOFError:
+                        record = None
+                    if record is None:
+                        process.join()
+                        record = {
+                            "instance": os.path.basename(instance_path),
+                            "solver": solver_name,
+                            "status": "erro",
+                            "error": f"Processo encerrado sem resultado (código {process.exitcode})",
+                        }
+                elif time.monotonic() - start > timeout:
+                    _stop(process)
+                    record = {
+                        "instance": os.path.basename(instance_path),
+                        "solver": solver_name,
+                        "status": "tempo esgotado",
+                        "error": f"Tempo limite de {timeout} s excedido",
+                    }
+                else:
+                    continue
+
+                process.join()
+                reader.close()
+                del running[reader]
+                results.append(_finalize(record, rtol))
+                hit = " (cache de resultados)" if record.get("cache_hit") else ""
+                logging.info(f"{record['instance']} [{solver_name}]: {record['status']}{hit}")
+
+    finally:
+        # Encerra os jobs que ainda estão rodando (ex: interrupção pelo teclado)
+        for process, _, _, _ in running.values():
+            _stop(process)
+
+    return results
+
+
+def write_results(results, csv_path=None, json_path=None):
+    """Grava os registros do benchmark em CSV e/ou JSON."""
+    if csv_path:
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+def print_summary(results):
+    """Imprime um resumo por solver: resolvidas, verificadas e tempos totais."""
+    for solver_name in sorted({record["solver"] for record in results}):
+        records = [record for record in results if record["solver"] == solver_name]
+        solved = sum(1 for record in records if record["success"])
+        verified = sum(1 for record in records if record["verified"])
+        mismatched = [record["instance"] for record in records if record["verified"] is False]
+        parse_time = sum(record["parse_time"] or 0.0 for record in records)
+        solve_time = sum(record["solve_time"] or 0.0 for record in records)
+
+        print(f"{solver_name}: {solved}/{len(records)} resolvidas, {verified} verificadas, "
+              f"leitura {parse_time:.2f} s, solução {solve_time:.2f} s")
+        lookups = [record for record in records if record["cache_hit"] is not None]
+        if lookups:
+            hits = sum(1 for record in lookups if record["cache_hit"])
+            print(f"  Cache de resultados: {hits}/{len(lookups)} acertos ({hits / len(lookups):.0%})")
+        if mismatched:
+            print(f"  Objetivo divergente da referência: {', '.join(mismatched)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos solvers nas instâncias Netlib")
+    parser.add_argument("--instances", default="Instancias/mps",
+                        help="Pasta com os arquivos .mps ou lista de arquivos separados por vírgula")
+    parser.add_argument("--solver", nargs="+", default=["highs"], choices=sorted(SOLVERS))
+    parser.add_argument("--workers", type=int, default=None, help="Jobs simultâneos (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Tempo limite por job em segundos")
+    parser.add_argument("--memory-limit", type=int, default=None, help="Limite de memória por job em MB")
+    parser.add_argument("--cache", default=None, help="Pasta do cache binário de instâncias")
+    parser.add_argument("--result-cache", default=None,
+                        help="Pasta do cache de resultados (pula soluções já feitas do mesmo modelo)")
+    parser.add_argument("--rtol", type=float, default=1e-6,
+                        help="Tolerância relativa da verificação do objetivo (ex: 1e-3 para os métodos de primeira ordem)")
+    parser.add_argument("--csv", default=None, help="Arquivo CSV de saída")
+    parser.add_argument("--json", default=None, help="Arquivo JSON de saída")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.instances):
+        instances = list_instances(args.instances)
+    else:
+        instances = args.instances.split(",")
+
+    if not instances:
+        print(f"Nenhuma instância encontrada em '{args.instances}'.")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_benchmark(instances, args.solver, args.workers, args.timeout, args.memory_limit, args.cache,
+                            args.result_cache, args.rtol)
+    write_results(results, args.csv, args.json)
+    print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import bz2
+import glob
+import gzip
+import lzma
+
+# Assinaturas (magic bytes) dos formatos de compressão aceitos
+MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+# Funções de abertura em streaming de cada formato
+OPENERS = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+# Extensões removidas do nome dos arquivos comprimidos
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".xz")
+
+
+def detect_compression(file_path):
+    """
+    Detecta a compressão de um arquivo pelos primeiros bytes (não pela extensão).
+
+    Returns:
+        str: "gzip", "bz2" ou "xz", ou None se o arquivo não estiver comprimido
+    """
+    with open(file_path, "rb") as file:
+        header = file.read(6)
+    for magic, name in MAGIC_BYTES:
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def open_instance(file_path, mode="rt", encoding=None):
+    """
+    Abre um arquivo de instância, comprimido ou não, para leitura em streaming.
+
+    A descompressão é feita à medida que o arquivo é lido, sem gravar uma
+    cópia descomprimida em disco.
+
+    Args:
+        file_path (str): Caminho do arquivo
+        mode (str, optional): "rt" (texto) ou "rb" (binário). Defaults to "rt".
+        encoding (str, optional): Codificação no modo texto. Defaults to None (padrão do sistema).
+
+    Returns:
+        file object: Arquivo aberto para leitura
+    """
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, mode, encoding=encoding)
+    return OPENERS[compression](file_path, mode, encoding=encoding)
+
+
+def strip_compression_extension(file_path):
+    """Remove a extensão de compressão do nome (ex: "afiro.mps.gz" -> "afiro.mps")."""
+    for extension in COMPRESSED_EXTENSIONS:
+        if file_path.endswith(extension):
+            return file_path[: -len(extension)]
+    return file_path
+
+
+def list_instances(folder):
+    """
+    Lista os arquivos MPS de uma pasta, comprimidos (.gz, .bz2, .xz) ou não.
+
+    Returns:
+        list: Caminhos em ordem alfabética
+    """
+    patterns = ["*.mps"] + [f"*.mps{extension}" for extension in COMPRESSED_EXTENSIONS]
+    return sorted(path for pattern in patterns for path in glob.glob(os.path.join(folder, pattern)))
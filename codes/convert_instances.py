@@ -1,18 +1,41 @@
 import os
+import sys
+import json
+import time
+import logging
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from highspy import Highs
+from codes.disk_cache import DiskCache
+from codes.instance_cache import InstanceCache
+from codes.read_instance_regex import MPSParser
+from codes.compressed_io import detect_compression, strip_compression_extension, list_instances
+from codes.Solvers.HighsSolver import build_highs_lp
+from codes.tracing import trace_phase
+
+# Versão da conversão para .lp; alterar opções do conversor deve incrementá-la
+LP_FORMAT_VERSION = "highs-lp-v1"
+# Manifesto da conversão incremental, gravado na pasta de saída
+MANIFEST_NAME = ".manifest.json"
 
 class MpsToLpConverter:
-    def __init__(self, mps_path=None, instances_folder=None):
+    def __init__(self, mps_path=None, instances_folder=None, output_flag=True, tracer=None):
         """
         Inicializa o conversor com os caminhos necessários.
         
         Args:
-            mps_path (str, optional): Caminho completo para o arquivo .mps. Defaults to None.
+            mps_path (str, optional): Caminho completo para o arquivo .mps (ou .mps.gz/.bz2/.xz). Defaults to None.
             instances_folder (str, optional): Caminho para a pasta de instâncias. Defaults to None.
+            output_flag (bool, optional): Exibe o log do HiGHS. Defaults to True.
+            tracer (Tracer, optional): Registra a fase "conversao" em convert(). Defaults to None.
         """
         self.mps_path = mps_path
         self.instances_folder = instances_folder
+        self.output_flag = output_flag
+        self.tracer = tracer
         self.lp_path = None
+        self.highs = None
         
         if self.mps_path is not None:
             self._set_lp_path()
@@ -20,6 +43,7 @@ class MpsToLpConverter:
     def set_mps_path(self, mps_path):
         """Define o caminho do arquivo .mps e atualiza o caminho do .lp correspondente."""
         self.mps_path = mps_path
+        self.highs = None
         self._set_lp_path()
     
     def set_instances_folder(self, instances_folder):
@@ -35,29 +59,52 @@ class MpsToLpConverter:
         else:
             folder = self.instances_folder
             
-        filename = os.path.splitext(os.path.basename(self.mps_path))[0] + '.lp'
+        filename = os.path.splitext(os.path.basename(strip_compression_extension(self.mps_path)))[0] + '.lp'
         self.lp_path = os.path.join(folder, filename).replace("\\", "/")
     
-    def convert(self):
+    def load(self):
         """
-        Converte o arquivo .mps para .lp usando o HiGHS.
-        
+        Carrega o arquivo .mps em um objeto Highs e o mantém em self.highs.
+
+        O objeto pode ser reaproveitado para resolver o problema diretamente
+        (ex: HighsSolver(model=converter.load())), sem gravar nem reler um .lp.
+        Arquivos comprimidos são lidos em streaming pelo MPSParser e passados
+        ao HiGHS com passModel().
+
         Returns:
-            str: Caminho do arquivo .lp gerado
+            Highs: Objeto Highs com o modelo carregado
         """
         if self.mps_path is None:
             raise ValueError("Caminho do arquivo .mps não foi definido")
         
         if not os.path.exists(self.mps_path):
             raise FileNotFoundError(f"Arquivo .mps não encontrado: {self.mps_path}")
+
+        if self.highs is None:
+            highs = Highs()
+            highs.setOptionValue("output_flag", self.output_flag)
+            if detect_compression(self.mps_path):
+                highs.passModel(build_highs_lp(MPSParser(self.mps_path).read()))
+            else:
+                highs.readModel(self.mps_path)
+            self.highs = highs
+        return self.highs
+
+    def convert(self):
+        """
+        Converte o arquivo .mps para .lp usando o HiGHS.
         
-        # Criar pasta de saída se não existir
-        if self.instances_folder is not None:
-            os.makedirs(self.instances_folder, exist_ok=True)
-        
-        highs = Highs()
-        highs.readModel(self.mps_path)
-        highs.writeModel(self.lp_path)
+        Returns:
+            str: Caminho do arquivo .lp gerado
+        """
+        with trace_phase(self.tracer, "conversao"):
+            highs = self.load()
+
+            # Criar pasta de saída se não existir
+            if self.instances_folder is not None:
+                os.makedirs(self.instances_folder, exist_ok=True)
+
+            highs.writeModel(self.lp_path)
         
         return self.lp_path
     
@@ -74,11 +121,159 @@ class MpsToLpConverter:
         return self.instances_folder
 
 
-# Exemplo de uso:
+def _convert_to_lp(mps_path, output_folder, options_key, previous, force):
+    """
+    Converte um arquivo para .lp, se necessário (executado no pool de processos).
+
+    O arquivo é ignorado quando o .lp existe e: o manifesto registra as mesmas
+    opções e o mesmo conteúdo (mesmo tamanho e data de modificação, ou mesmo
+    hash), ou não há registro no manifesto e o .lp é mais novo que o .mps.
+
+    Returns:
+        tuple: (nome do arquivo, situação, entrada do manifesto, mensagem de erro)
+    """
+    name = os.path.basename(mps_path)
+    converter = MpsToLpConverter(mps_path, output_folder, output_flag=False)
+    lp_path = converter.get_lp_path()
+    stat = os.stat(mps_path)
+    entry = {"options": options_key, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    try:
+        if not force and os.path.exists(lp_path):
+            if previous is None:
+                if os.path.getmtime(lp_path) >= stat.st_mtime:
+                    return name, "ignorado", entry, None
+            elif previous.get("options") == options_key:
+                if (previous.get("size"), previous.get("mtime")) == (stat.st_size, stat.st_mtime):
+                    return name, "ignorado", previous, None
+                entry["hash"] = DiskCache.file_hash(mps_path)
+                if previous.get("hash") == entry["hash"]:
+                    return name, "ignorado", entry, None
+
+        entry.setdefault("hash", DiskCache.file_hash(mps_path))
+        # Grava em um arquivo temporário (.lp, para o HiGHS escolher o formato) e renomeia
+        tmp_path = os.path.join(output_folder, f".{os.getpid()}.tmp.lp")
+        converter.lp_path = tmp_path
+        converter.convert()
+        os.replace(tmp_path, lp_path)
+        return name, "convertido", entry, None
+
+    except Exception as e:
+        return name, "erro", None, str(e)
+
+
+def _convert_to_binary(mps_path, output_folder, max_bytes, force):
+    """
+    Grava um arquivo no formato binário do InstanceCache, se ainda não estiver lá.
+
+    A chave do cache já é o hash do conteúdo (com a versão do formato), então
+    arquivos sem alteração são ignorados sem novo parsing.
+
+    Returns:
+        tuple: (nome do arquivo, situação, None, mensagem de erro)
+    """
+    name = os.path.basename(mps_path)
+    try:
+        cache = InstanceCache(output_folder, max_bytes)
+        key = cache.key(mps_path)
+        if force:
+            cache.remove(key)
+        elif cache.lookup(key) is not None:
+            return name, "ignorado", None, None
+
+        MPSParser(mps_path, cache=cache).read()
+        return name, "convertido", None, None
+
+    except Exception as e:
+        return name, "erro", None, str(e)
+
+
+def convert_directory(source_folder, output_folder, output_format="lp", workers=None, force=False,
+                      max_bytes=16 << 30):
+    """
+    Converte todos os arquivos .mps de uma pasta (comprimidos ou não), em paralelo e de forma incremental.
+
+    Os arquivos são distribuídos em um pool de processos, dos maiores para os
+    menores (melhor balanceamento). Só são convertidos os arquivos novos ou
+    alterados (ver _convert_to_lp e _convert_to_binary), e o manifesto da
+    pasta de saída é atualizado ao final.
+
+    Args:
+        source_folder (str): Pasta com os arquivos .mps
+        output_folder (str): Pasta de saída (.lp) ou do cache binário
+        output_format (str, optional): "lp" ou "binary". Defaults to "lp".
+        workers (int, optional): Número de processos. Defaults to os.cpu_count().
+        force (bool, optional): Converte todos os arquivos, mesmo sem alteração. Defaults to False.
+        max_bytes (int, optional): Tamanho máximo do cache binário. Defaults to 16 GiB.
+
+    Returns:
+        dict: Situação de cada arquivo ("convertido", "ignorado" ou "erro: ...")
+    """
+    if output_format not in ("lp", "binary"):
+        raise ValueError(f"Formato de saída inválido: {output_format}")
+
+    mps_files = sorted(list_instances(source_folder), key=os.path.getsize, reverse=True)
+    os.makedirs(output_folder, exist_ok=True)
+
+    manifest_path = os.path.join(output_folder, MANIFEST_NAME)
+    manifest = {}
+    if output_format == "lp" and os.path.exists(manifest_path):
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+
+    summary = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        if output_format == "lp":
+            futures = [
+                executor.submit(_convert_to_lp, path, output_folder, LP_FORMAT_VERSION,
+                                manifest.get(os.path.basename(path)), force)
+                for path in mps_files
+            ]
+        else:
+            futures = [executor.submit(_convert_to_binary, path, output_folder, max_bytes, force)
+                       for path in mps_files]
+
+        for future in as_completed(futures):
+            name, status, entry, error = future.result()
+            if entry is not None:
+                manifest[name] = entry
+            summary[name] = f"erro: {error}" if error else status
+            if status != "ignorado":
+                logging.info(f"{name}: {summary[name]}")
+
+    if output_format == "lp":
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversão em lote das instâncias MPS")
+    parser.add_argument("source", nargs="?", default="Instancias/mps", help="Pasta com os arquivos .mps")
+    parser.add_argument("--output", default=None,
+                        help="Pasta de saída (padrão: Instancias/lp ou cache/instances no formato binário)")
+    parser.add_argument("--format", choices=("lp", "binary"), default="lp", help="Formato de saída")
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument("--force", action="store_true", help="Converte todos os arquivos, mesmo sem alteração")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        print(f"Pasta não encontrada: {args.source}")
+        sys.exit(1)
+
+    output = args.output or ("Instancias/lp" if args.format == "lp" else "cache/instances")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    start = time.perf_counter()
+    summary = convert_directory(args.source, output, args.format, args.workers, args.force)
+    converted = sum(1 for status in summary.values() if status == "convertido")
+    skipped = sum(1 for status in summary.values() if status == "ignorado")
+    errors = len(summary) - converted - skipped
+    print(f"{converted} convertidos, {skipped} ignorados, {errors} erros em {time.perf_counter() - start:.2f} s")
+
+
 if __name__ == "__main__":
-    # Exemplo 1: Especificando apenas o caminho do MPS
-    converter1 = MpsToLpConverter(mps_path='/home/vaio/ufpb/Large-Scale-Optimization/Instancias/mps/25fv47.mps',instances_folder="/home/vaio/ufpb/Large-Scale-Optimization/Instancias/lp")
-    lp_path1 = converter1.convert()
-    print(f"Arquivo LP gerado em: {lp_path1}")
-    
-  
+    main()
@@ -0,0 +1,151 @@
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+
+
+class DiskCache:
+    """
+    Cache em disco endereçado por conteúdo, com limite de tamanho e remoção LRU.
+
+    Cada entrada é um diretório cujo nome é a chave (um hash). O horário de
+    modificação do diretório marca o último acesso, e as entradas menos usadas
+    recentemente são removidas quando o tamanho total passa de max_bytes.
+
+    Atributos:
+        cache_dir (str): Pasta raiz do cache
+        max_bytes (int): Tamanho máximo total das entradas em bytes
+
+    Métodos:
+        entry_path(key): Caminho do diretório de uma entrada
+        lookup(key): Retorna o diretório da entrada (e marca o acesso) ou None
+        commit(key, writer): Grava uma nova entrada de forma atômica
+        remove(key): Remove uma entrada
+        evict(keep): Remove entradas antigas até respeitar o limite de tamanho
+        file_hash(path): Calcula o hash SHA-256 do conteúdo de um arquivo
+    """
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir (str): Pasta raiz do cache (criada se não existir)
+            max_bytes (int, optional): Tamanho máximo do cache. Defaults to 1 GiB.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def entry_path(self, key):
+        """Retorna o caminho do diretório da entrada com a chave informada."""
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, key):
+        """
+        Procura uma entrada no cache.
+
+        Returns:
+            str: Caminho do diretório da entrada, ou None se não existir
+        """
+        path = self.entry_path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            os.utime(path)  # Marca o uso recente para a política LRU
+        except OSError:
+            return None
+        return path
+
+    def commit(self, key, writer):
+        """
+        Grava uma nova entrada de forma atômica.
+
+        O conteúdo é escrito em um diretório temporário pela função writer e
+        depois renomeado para o nome final, de modo que leitores concorrentes
+        nunca vejam uma entrada incompleta. A entrada recém-gravada não é
+        removida pela limpeza LRU, mesmo que sozinha passe de max_bytes (nesse
+        caso é registrado um aviso e ela sai na próxima gravação).
+
+        Args:
+            key (str): Chave da entrada
+            writer (callable): Função que recebe o diretório temporário e grava os arquivos
+
+        Returns:
+            str: Caminho do diretório da entrada
+
+        Raises:
+            OSError: Se a gravação falhar (a entrada não é criada); a corrida com outra
+                execução que já gravou a mesma entrada não é erro
+        """
+        path = self.entry_path(key)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+        try:
+            writer(tmp_dir)
+        except BaseException:
+            # Falha de gravação (disco cheio, permissão, ...): não deixa entrada parcial
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        try:
+            os.rename(tmp_dir, path)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+            # Outra execução já gravou a mesma entrada
+        self.evict(keep=path)
+        return path
+
+    def remove(self, key):
+        """Remove a entrada com a chave informada, se existir."""
+        shutil.rmtree(self.entry_path(key), ignore_errors=True)
+
+    def evict(self, keep=None):
+        """
+        Remove as entradas menos usadas recentemente até o cache caber em max_bytes.
+
+        Args:
+            keep (str, optional): Diretório de uma entrada que nunca é removido
+                (a entrada recém-gravada por commit()). Defaults to None.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = self.entry_path(name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            total += size
+            if path == keep:
+                if size > self.max_bytes:
+                    logging.warning(f"Entrada do cache maior que o limite ({size} > {self.max_bytes} bytes): {path}")
+                continue
+            entries.append((os.stat(path).st_mtime, size, path))
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logging.info(f"Entrada removida do cache: {path}")
+
+    @staticmethod
+    def file_hash(path, salt=b"", chunk_size=1 << 20):
+        """
+        Calcula o hash SHA-256 do conteúdo de um arquivo, lido em blocos.
+
+        Args:
+            path (str): Caminho do arquivo
+            salt (bytes, optional): Prefixo misturado ao hash (ex: versão do formato)
+            chunk_size (int, optional): Tamanho dos blocos de leitura
+
+        Returns:
+            str: Hash em hexadecimal
+        """
+        digest = hashlib.sha256(salt)
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
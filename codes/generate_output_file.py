@@ -1,9 +1,104 @@
 import os
+import numpy as np
 from datetime import datetime
 
-def generate_output_file(output_folder, problem_name, solver_results, primal_vars=None, dual_vars=None):
+# Formato de cada linha das tabelas de variáveis e de restrições
+ROW_FORMAT = "%8d %25.10f %30.5f\n"
+# Linhas formatadas por operação de escrita
+CHUNK_ROWS = 1 << 16
+
+
+def _as_columns(rows, first=None, second=None):
+    """
+    Normaliza uma tabela para três colunas NumPy (índice, valor, valor).
+
+    Aceita a lista de tuplas [(índice, a, b)] usada anteriormente ou dois
+    arrays já prontos (índices 1..n).
+
+    Returns:
+        tuple: (índices, primeira coluna, segunda coluna) ou None se a tabela estiver vazia
+    """
+    if first is not None and second is not None:
+        first = np.asarray(first, dtype=np.float64)
+        second = np.asarray(second, dtype=np.float64)
+        if len(first) == 0:
+            return None
+        return np.arange(1, len(first) + 1), first, second
+
+    if not rows:
+        return None
+    index, first, second = zip(*rows)
+    return np.asarray(index), np.asarray(first, dtype=np.float64), np.asarray(second, dtype=np.float64)
+
+
+def _write_rows(f, columns):
+    """
+    Escreve as linhas da tabela em blocos, formatando cada bloco de uma vez.
+
+    Cada bloco é formatado com uma única operação de string (ROW_FORMAT
+    repetido), o que produz exatamente o mesmo texto que formatar linha a linha.
+    """
+    index, first, second = columns
+    for start in range(0, len(index), CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, len(index))
+        values = [None] * (3 * (stop - start))
+        values[0::3] = index[start:stop].tolist()
+        values[1::3] = first[start:stop].tolist()
+        values[2::3] = second[start:stop].tolist()
+        f.write((ROW_FORMAT * (stop - start)) % tuple(values))
+
+
+def write_parquet(output_folder, problem_name, primal_solution=None, dual_prices=None, slacks=None,
+                  dual_solution=None):
+    """
+    Grava a solução em formato colunar (Parquet), para análise sem interpretar o texto.
+
+    São gerados dois arquivos: <problema>_variaveis.parquet (indice, sol_primal,
+    dual_price) e <problema>_restricoes.parquet (indice, folga, sol_dual).
+
+    Raises:
+        ImportError: Se o pyarrow não estiver instalado
+
+    Returns:
+        list: Caminhos dos arquivos gravados
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("A saída em Parquet requer o pacote pyarrow (pip install pyarrow)") from e
+
+    os.makedirs(output_folder, exist_ok=True)
+    safe_problem_name = os.path.splitext(problem_name)[0]
+    tables = (
+        ("variaveis", ("sol_primal", primal_solution), ("dual_price", dual_prices)),
+        ("restricoes", ("folga", slacks), ("sol_dual", dual_solution)),
+    )
+
+    paths = []
+    for suffix, (first_name, first), (second_name, second) in tables:
+        if first is None or second is None:
+            continue
+        first = np.asarray(first, dtype=np.float64)
+        table = pa.table({
+            "indice": np.arange(1, len(first) + 1, dtype=np.int64),
+            first_name: first,
+            second_name: np.asarray(second, dtype=np.float64),
+        })
+        path = os.path.join(output_folder, f"{safe_problem_name}_{suffix}.parquet")
+        pq.write_table(table, path)
+        paths.append(path)
+    return paths
+
+
+def generate_output_file(output_folder, problem_name, solver_results, primal_vars=None, dual_vars=None,
+                         primal_solution=None, dual_prices=None, slacks=None, dual_solution=None):
     """
     Gera um arquivo de texto formatado com os resultados da otimização.
+
+    As tabelas podem ser informadas como listas de tuplas ou, de forma muito
+    mais rápida em modelos grandes, diretamente pelos arrays da solução; o
+    texto gerado é o mesmo nos dois casos.
     
     Args:
         output_folder (str): Pasta onde o arquivo será salvo.
@@ -11,6 +106,8 @@ def generate_output_file(output_folder, problem_name, solver_results, primal_var
         solver_results (dict): Resultados gerais (ex: valor ótimo, iterações, viabilidade, tempo).
         primal_vars (list of tuples): Lista [(índice, valor primal, preço dual)].
         dual_vars (list of tuples): Lista [(índice, folga, valor dual)].
+        primal_solution, dual_prices (array-like): Valores primais e preços duais, no lugar de primal_vars.
+        slacks, dual_solution (array-like): Folgas e valores duais, no lugar de dual_vars.
     """
 
     # Criar pasta se não existir
@@ -40,9 +137,9 @@ def generate_output_file(output_folder, problem_name, solver_results, primal_var
         f.write("     VAR.           SOL. PRIMAL                 DUAL_PRICES\n")
         f.write("_" * 65 + "\n")
 
-        if primal_vars:
-            for idx, primal_value, dual_price in primal_vars:
-                f.write(f"{idx:>8} {primal_value:>25.10f} {dual_price:>30.5f}\n")
+        columns = _as_columns(primal_vars, primal_solution, dual_prices)
+        if columns is not None:
+            _write_rows(f, columns)
         else:
             f.write("Nenhuma variável encontrada.\n")
 
@@ -52,9 +149,9 @@ def generate_output_file(output_folder, problem_name, solver_results, primal_var
         f.write("    RESTR            FOLGAS                    SOL. DUAL\n")
         f.write("_" * 65 + "\n")
 
-        if dual_vars:
-            for idx, folga, sol_dual in dual_vars:
-                f.write(f"{idx:>8} {folga:>25.10f} {sol_dual:>30.5f}\n")
+        columns = _as_columns(dual_vars, slacks, dual_solution)
+        if columns is not None:
+            _write_rows(f, columns)
         else:
             f.write("Nenhuma restrição encontrada.\n")
 
@@ -1,18 +1,106 @@
 import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from codes.disk_cache import DiskCache
+
+# Manifesto dos downloads (hash, ETag e Last-Modified de cada arquivo)
+MANIFEST_NAME = ".downloads.json"
+# Tamanho dos blocos lidos da resposta e gravados em disco
+CHUNK_SIZE = 1 << 20
+# Códigos HTTP tratados como falhas temporárias
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
 
 class MPSDownloader:
-    def __init__(self, url, save_dir):
+    """
+    Classe para baixar as instâncias MPS de uma biblioteca (por padrão, a Netlib).
+
+    Os arquivos são baixados em paralelo por uma sessão HTTP com conexões
+    reaproveitadas (uma por thread) e novas tentativas com espera exponencial.
+    Um download interrompido fica em <arquivo>.part, com o ETag/Last-Modified
+    da resposta em <arquivo>.part.json, e é retomado com um pedido Range e
+    If-Range na próxima tentativa (sem validador, recomeça do zero). O arquivo
+    só aparece com o nome final depois de completo (e conferido, quando há
+    checksum), por os.replace.
+
+    Um arquivo já baixado é ignorado quando seu SHA-256 confere com o checksum
+    informado ou, sem checksum, quando o servidor responde 304 ao pedido
+    condicional (ETag/Last-Modified registrados no manifesto).
+
+    Atributos:
+        url (str): Página com os links para os arquivos .mps
+        save_dir (str): Pasta onde os arquivos são salvos
+        url_raw (str): Endereço base do conteúdo dos arquivos
+        workers (int): Número de downloads simultâneos
+        checksums (dict): SHA-256 esperado de cada arquivo (opcional)
+        mps_links (list): Links encontrados por fetch_mps_links()
+
+    Métodos:
+        fetch_mps_links(): Obtém a lista de arquivos .mps da página
+        download_files(): Baixa os arquivos em paralelo
+        run(): Executa as duas etapas
+    """
+
+    def __init__(self, url, save_dir, url_raw=None, workers=8, retries=5, backoff=0.5, timeout=30,
+                 checksums=None):
+        """
+        Inicializa o downloader.
+
+        Args:
+            url (str): Página com os links para os arquivos .mps
+            save_dir (str): Pasta onde os arquivos são salvos
+            url_raw (str, optional): Endereço base do conteúdo dos arquivos. Defaults to o repositório da Netlib.
+            workers (int, optional): Número de downloads simultâneos. Defaults to 8.
+            retries (int, optional): Número de novas tentativas por arquivo. Defaults to 5.
+            backoff (float, optional): Espera base (segundos) entre tentativas, dobrada a cada falha. Defaults to 0.5.
+            timeout (float, optional): Tempo limite de conexão e leitura, em segundos. Defaults to 30.
+            checksums (dict, optional): {nome do arquivo: SHA-256 em hexadecimal}. Defaults to None.
+        """
         self.url = url
         self.save_dir = save_dir
         self.base_url = 'https://github.com'
-        self.url_raw = "https://raw.githubusercontent.com/ozy4dm/lp-data-netlib/main/mps_files/"
+        self.url_raw = url_raw or "https://raw.githubusercontent.com/ozy4dm/lp-data-netlib/main/mps_files/"
+        self.workers = max(1, int(workers))
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.checksums = checksums or {}
         self.mps_links = []
+        self.session = self._create_session()
+        self._manifest = {}
+        self._manifest_lock = threading.Lock()
+
+    def _create_session(self):
+        """
+        Cria a sessão HTTP com pool de conexões e novas tentativas automáticas.
+
+        O urllib3 repete as falhas de conexão e os códigos de RETRY_STATUS
+        (respeitando Retry-After); falhas no meio da transferência são
+        tratadas em _download_file, retomando do ponto em que pararam.
+        """
+        retry = Retry(total=self.retries, backoff_factor=self.backoff, status_forcelist=RETRY_STATUS,
+                      allowed_methods=("GET", "HEAD"), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def fetch_mps_links(self):
         # Realiza a requisição HTTP para obter o conteúdo da página
-        response = requests.get(self.url)
+        response = self.session.get(self.url, timeout=self.timeout)
         response.raise_for_status()  # Verifica se a requisição foi bem-sucedida
 
         # Analisa o conteúdo HTML da página
@@ -20,32 +108,235 @@ class MPSDownloader:
 
         # Encontra todas as tags <a> com o atributo href que contêm links para arquivos .mps
         links = soup.find_all('a', href=True)
-        self.mps_links = [self.base_url + link['href'] for link in links if link['href'].endswith('.mps')]
+        self.mps_links = [requests.compat.urljoin(self.url, link['href']) for link in links
+                          if link['href'].endswith('.mps')]
+
+    def _is_current(self, path, filename):
+        """
+        Verifica, sem rede, se o arquivo local confere com o checksum informado.
+
+        Returns:
+            bool: True se há checksum e o arquivo local confere
+        """
+        expected = self.checksums.get(filename)
+        return expected is not None and os.path.exists(path) and DiskCache.file_hash(path) == expected
+
+    @staticmethod
+    def _save_part_validator(part_path, headers):
+        """
+        Grava ao lado de <arquivo>.part (em <arquivo>.part.json) o ETag e o Last-Modified
+        da resposta que iniciou a parte, para que a retomada, mesmo em outra execução,
+        só junte bytes da mesma versão do arquivo.
+        """
+        validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        tmp_path = f"{part_path}.json.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(validators, file)
+        os.replace(tmp_path, f"{part_path}.json")
+
+    @staticmethod
+    def _part_validator(part_path):
+        """
+        Retorna o valor de If-Range da parte local: o ETag forte ou, na falta dele, o Last-Modified.
+
+        Returns:
+            str: Validador da parte, ou None se não houver um utilizável
+        """
+        try:
+            with open(f"{part_path}.json", "r") as file:
+                validators = json.load(file)
+        except (OSError, ValueError):
+            return None
+        etag = validators.get("etag")
+        # If-Range não aceita ETags fracos (W/"...")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return validators.get("last_modified")
+
+    @staticmethod
+    def _discard_part(part_path):
+        """Remove a parte local e o seu validador, se existirem."""
+        for stale in (part_path, f"{part_path}.json"):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    def _download_file(self, filename):
+        """
+        Baixa um arquivo, retomando um download parcial se houver.
+
+        Returns:
+            tuple: (nome do arquivo, situação, entrada do manifesto, mensagem de erro), com a
+                situação "baixado", "retomado", "ignorado" ou "erro"
+        """
+        path = os.path.join(self.save_dir, filename)
+        part_path = path + ".part"
+        expected = self.checksums.get(filename)
+        previous = self._manifest.get(filename)
+
+        if self._is_current(path, filename):
+            return filename, "ignorado", previous or {"sha256": expected}, None
+
+        # Pedido condicional: só vale se o arquivo local ainda é o registrado no manifesto
+        conditional = {}
+        if expected is None and previous is not None and os.path.exists(path):
+            stat = os.stat(path)
+            if (previous.get("size"), previous.get("mtime")) == (stat.st_size, stat.st_mtime):
+                if previous.get("etag"):
+                    conditional["If-None-Match"] = previous["etag"]
+                if previous.get("last_modified"):
+                    conditional["If-Modified-Since"] = previous["last_modified"]
+
+        resumed = False
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            headers = dict(conditional)
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if offset > 0:
+                # Se o arquivo mudou no servidor, If-Range faz a resposta vir completa (200);
+                # sem validador da parte, não há como conferir a versão e o download recomeça do zero
+                validator = self._part_validator(part_path)
+                if validator:
+                    headers["Range"] = f"bytes={offset}-"
+                    headers["If-Range"] = validator
+                else:
+                    self._discard_part(part_path)
+                    offset = 0
+
+            try:
+                with self.session.get(self.url_raw + filename, headers=headers, stream=True,
+                                      timeout=self.timeout) as response:
+                    if response.status_code == 304:
+                        return filename, "ignorado", previous, None
+                    if response.status_code == 416:
+                        # Parte local inválida (maior que o arquivo): recomeça do zero
+                        self._discard_part(part_path)
+                        continue
+                    response.raise_for_status()
+
+                    digest = hashlib.sha256()
+                    if response.status_code == 206 and offset > 0:
+                        resumed = True
+                        with open(part_path, "rb") as file:
+                            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                                digest.update(chunk)
+                        mode = "ab"
+                    else:
+                        # Nova parte: registra a versão do servidor antes de gravar os dados
+                        self._discard_part(part_path)
+                        self._save_part_validator(part_path, response.headers)
+                        mode = "wb"
+
+                    with open(part_path, mode) as file:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            file.write(chunk)
+                            digest.update(chunk)
+                        file.flush()
+                        os.fsync(file.fileno())
+
+                    sha256 = digest.hexdigest()
+                    if expected is not None and sha256 != expected:
+                        self._discard_part(part_path)
+                        error = f"checksum não confere (esperado {expected}, obtido {sha256})"
+                        continue
+
+                    os.replace(part_path, path)
+                    self._discard_part(part_path)
+                    stat = os.stat(path)
+                    entry = {
+                        "sha256": sha256,
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                    return filename, "retomado" if resumed else "baixado", entry, None
+
+            except requests.RequestException as e:
+                # Falha de rede ou HTTP: a parte já gravada é mantida para a próxima tentativa
+                error = str(e)
+
+        return filename, "erro", previous, error
+
+    def _save_manifest(self):
+        """Grava o manifesto dos downloads de forma atômica."""
+        manifest_path = os.path.join(self.save_dir, MANIFEST_NAME)
+        tmp_path = f"{manifest_path}.tmp"
+        with self._manifest_lock:
+            with open(tmp_path, "w") as file:
+                json.dump(self._manifest, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, manifest_path)
 
     def download_files(self):
+        """
+        Baixa os arquivos de mps_links em paralelo (workers downloads simultâneos).
+
+        Returns:
+            dict: {nome do arquivo: situação}
+        """
+        os.makedirs(self.save_dir, exist_ok=True)
+        manifest_path = os.path.join(self.save_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as file:
+                self._manifest = json.load(file)
+
         # Obtém o nome do arquivo a partir do link
         filenames = [os.path.basename(link) for link in self.mps_links]
 
-        for filename in filenames:
-            response = requests.get(self.url_raw + filename)
+        summary = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self._download_file, filename) for filename in filenames]
+            for future in as_completed(futures):
+                filename, status, entry, error = future.result()
+                summary[filename] = status
+                if status == "erro":
+                    logging.error(f"Falha ao baixar {filename}: {error}")
+                    continue
+                with self._manifest_lock:
+                    self._manifest[filename] = entry
+                if status != "ignorado":
+                    logging.info(f"Arquivo {filename} {status} com sucesso.")
 
-            if response.status_code == 200:
-                # Salvar o conteúdo do arquivo
-                with open(os.path.join(self.save_dir, filename), 'wb') as file:
-                    file.write(response.content)
-                print(f"Arquivo {filename} baixado com sucesso.")
-            else:
-                print(f"Falha ao baixar {filename}: {response.status_code}")
+        self._save_manifest()
+        return summary
 
     def run(self):
         self.fetch_mps_links()
-        self.download_files()
+        return self.download_files()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download das instâncias MPS")
+    parser.add_argument("--url", default='https://github.com/ozy4dm/lp-data-netlib/tree/main/mps_files',
+                        help="Página com os links para os arquivos .mps")
+    parser.add_argument("--raw-url", default=None, help="Endereço base do conteúdo dos arquivos")
+    parser.add_argument("--output", default="Instancias", help="Pasta onde os arquivos são salvos")
+    parser.add_argument("--workers", type=int, default=8, help="Downloads simultâneos")
+    parser.add_argument("--checksums", default=None,
+                        help="Arquivo JSON {arquivo: sha256} para conferir os downloads")
+    args = parser.parse_args()
+
+    checksums = None
+    if args.checksums:
+        with open(args.checksums, "r") as file:
+            checksums = json.load(file)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    start = time.perf_counter()
+    downloader = MPSDownloader(args.url, args.output, url_raw=args.raw_url, workers=args.workers,
+                               checksums=checksums)
+    summary = downloader.run()
+
+    downloaded = sum(1 for status in summary.values() if status in ("baixado", "retomado"))
+    skipped = sum(1 for status in summary.values() if status == "ignorado")
+    errors = len(summary) - downloaded - skipped
+    print(f"{downloaded} baixados, {skipped} ignorados, {errors} erros em {time.perf_counter() - start:.2f} s")
+    if errors:
+        sys.exit(1)
 
 
 # Uso da classe
 if __name__ == "__main__":
-    url = 'https://github.com/ozy4dm/lp-data-netlib/tree/main/mps_files'
-    save_dir = "Instancias"
-    
-    downloader = MPSDownloader(url, save_dir)
-    downloader.run()
\ No newline at end of file
+    main()
@@ -0,0 +1,100 @@
+import os
+import json
+import numpy as np
+
+from codes.disk_cache import DiskCache
+
+# Versão do formato binário; mudanças no parser devem incrementá-la para invalidar o cache
+FORMAT_VERSION = b"mps-coo-v2"
+
+# Arrays numéricos gravados como .npy e carregados via mmap
+ARRAY_KEYS = ("row_types", "row_idx", "col_idx", "values", "c", "rhs", "ranges", "lower", "upper")
+
+# Tabelas de nomes, gravadas como arrays de strings de largura fixa
+NAME_KEYS = ("row_names", "col_names")
+
+
+class InstanceCache(DiskCache):
+    """
+    Cache binário de instâncias já lidas pelo MPSParser.
+
+    A chave de cada entrada é o hash SHA-256 do conteúdo do arquivo MPS, de
+    modo que renomear ou copiar o arquivo não invalida o cache e editar o
+    arquivo gera uma nova entrada. Cada entrada guarda as triplas COO, c, rhs,
+    ranges, limites e tabelas de nomes em arquivos .npy, que são carregados
+    com np.load(mmap_mode="r") em vez de um novo parsing do texto.
+
+    Métodos:
+        load(file_path): Retorna o dicionário de MPSParser.read() do cache, ou None
+        store(file_path, raw): Grava no cache o dicionário de MPSParser.read()
+    """
+
+    def __init__(self, cache_dir="cache/instances", max_bytes=1 << 30):
+        """
+        Inicializa o cache de instâncias.
+
+        Args:
+            cache_dir (str, optional): Pasta do cache. Defaults to "cache/instances".
+            max_bytes (int, optional): Tamanho máximo do cache. Defaults to 1 GiB.
+        """
+        super().__init__(cache_dir, max_bytes)
+
+    def key(self, file_path):
+        """Retorna a chave (hash do conteúdo) de um arquivo de instância."""
+        return self.file_hash(file_path, salt=FORMAT_VERSION)
+
+    def load(self, file_path, key=None):
+        """
+        Carrega uma instância do cache.
+
+        Args:
+            file_path (str): Caminho do arquivo MPS
+            key (str, optional): Chave já calculada, para evitar ler o arquivo de novo
+
+        Returns:
+            dict: Mesmo formato de MPSParser.read(), com arrays mapeados em memória,
+                ou None se a instância não estiver no cache
+        """
+        path = self.lookup(key or self.key(file_path))
+        if path is None:
+            return None
+
+        try:
+            with open(os.path.join(path, "meta.json"), "r") as file:
+                raw = json.load(file)
+            for name in ARRAY_KEYS:
+                raw[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in NAME_KEYS:
+                raw[name] = np.load(os.path.join(path, f"{name}.npy")).tolist()
+        except (OSError, ValueError):
+            # Entrada corrompida ou removida durante a leitura
+            return None
+        return raw
+
+    def store(self, file_path, raw, key=None):
+        """
+        Grava uma instância no cache.
+
+        Args:
+            file_path (str): Caminho do arquivo MPS
+            raw (dict): Dicionário retornado por MPSParser.read()
+            key (str, optional): Chave já calculada
+
+        Returns:
+            str: Caminho do diretório da entrada
+        """
+        def writer(tmp_dir):
+            meta = {
+                "name": raw["name"],
+                "objective_row": raw["objective_row"],
+                "objective_offset": float(raw["objective_offset"]),
+                "objective_sense": int(raw["objective_sense"]),
+            }
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as file:
+                json.dump(meta, file)
+            for name in ARRAY_KEYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(raw[name]))
+            for name in NAME_KEYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.array(raw[name], dtype=str))
+
+        return self.commit(key or self.key(file_path), writer)
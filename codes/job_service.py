@@ -0,0 +1,484 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import highspy
+import resource
+import threading
+import urllib.error
+import urllib.request
+import multiprocessing as mp
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import wait
+
+from codes.benchmark import BACKENDS
+from codes.instance_cache import InstanceCache
+from codes.memory_estimator import MemoryEstimate, MemoryBudgetError
+from codes.Solvers.HighsSolver import HighsSolver
+
+DEFAULT_PORT = 8765
+# Campos escalares de get_results() guardados no repositório de resultados
+RESULT_FIELDS = ("status", "objective_value", "success", "iterations", "gap", "runtime")
+
+
+def estimate_memory_mb(instance_path, solver="highs", threads=1):
+    """
+    Estima a memória necessária para resolver uma instância, em MB.
+
+    Usa as contagens de linhas, colunas e não-zeros lidas por prescan() (sem
+    montar o problema) e o modelo de memória do solver (ver MemoryEstimate).
+    """
+    return int(MemoryEstimate.from_file(instance_path).solver_mb(solver, threads)) + 1
+
+
+def _to_json(value):
+    """Converte escalares NumPy/HiGHS para tipos JSON."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _service_job(instance_path, solver_name, threads, memory_mb, cache_dir, conn):
+    """
+    Resolve um job no processo do pool e envia o resultado pelo pipe.
+
+    A memória do processo é limitada à reserva do job (RLIMIT_AS) e o HiGHS
+    usa no máximo `threads` threads.
+    """
+    limit = int(memory_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    message = {}
+    try:
+        cache = InstanceCache(cache_dir) if cache_dir else None
+        start = time.perf_counter()
+        solver = BACKENDS[solver_name](instance_path, cache)
+        message["parse_time"] = time.perf_counter() - start
+
+        if isinstance(solver, HighsSolver):
+            solver.model.setOptionValue("threads", int(threads))
+
+        start = time.perf_counter()
+        solver.run()
+        message["solve_time"] = time.perf_counter() - start
+
+        results = solver.get_results()
+        if results is None:
+            message["error"] = "O solver não retornou resultados"
+        else:
+            message["results"] = {key: _to_json(results[key]) for key in RESULT_FIELDS if key in results}
+            if results.get("timings"):
+                # Tempo de parede, CPU e pico de memória por fase (ver codes.tracing)
+                message["results"]["timings"] = results["timings"]
+            if isinstance(results["success"], highspy.HighsModelStatus):
+                # HighsSolver informa o status do modelo no campo success
+                message["results"]["success"] = results["success"] == highspy.HighsModelStatus.kOptimal
+
+    except MemoryError:
+        message["error"] = f"Limite de {memory_mb} MB excedido"
+    except Exception as e:
+        message["error"] = str(e)
+
+    message["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    conn.send(message)
+    conn.close()
+
+
+class JobService:
+    """
+    Serviço local de jobs de otimização com fila, pool de processos e controle de admissão.
+
+    Os jobs entram em uma fila FIFO e são despachados por uma thread para, no
+    máximo, `workers` processos simultâneos. Cada job usa no máximo
+    `threads_per_job` threads do HiGHS (workers x threads nunca passa do
+    número de CPUs) e reserva uma quantidade de memória; um job só começa se a
+    soma das reservas dos jobs em execução couber em `memory_budget_mb`. A
+    reserva também é aplicada como limite (RLIMIT_AS) ao processo do job.
+    Os resultados ficam em memória e em arquivos JSON em `store_dir`, para
+    consulta pelos clientes.
+
+    Atributos:
+        workers (int): Número máximo de jobs simultâneos
+        threads_per_job (int): Threads do HiGHS por job
+        memory_budget_mb (int): Memória total disponível para os jobs
+        store_dir (str): Pasta do repositório de resultados
+        cache_dir (str): Pasta do cache binário de instâncias (opcional)
+        jobs (dict): Estado de cada job, por id
+
+    Métodos:
+        start(): Inicia a thread de despacho
+        stop(): Encerra a thread de despacho e os jobs em execução
+        submit(instance_path, solver, memory_mb): Coloca um job na fila
+        get(job_id): Retorna o estado de um job
+        list(): Retorna o estado de todos os jobs
+        cancel(job_id): Cancela um job na fila ou em execução
+    """
+
+    def __init__(self, workers=None, threads_per_job=1, memory_budget_mb=4096, store_dir="cache/jobs",
+                 cache_dir=None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            workers (int, optional): Jobs simultâneos. Defaults to os.cpu_count() // threads_per_job.
+            threads_per_job (int, optional): Threads do HiGHS por job. Defaults to 1.
+            memory_budget_mb (int, optional): Memória total para os jobs em MB. Defaults to 4096.
+            store_dir (str, optional): Pasta dos resultados. Defaults to "cache/jobs".
+            cache_dir (str, optional): Pasta do cache binário de instâncias. Defaults to None.
+        """
+        cpus = os.cpu_count() or 1
+        self.threads_per_job = max(1, min(int(threads_per_job), cpus))
+        max_workers = max(1, cpus // self.threads_per_job)
+        self.workers = min(int(workers), max_workers) if workers else max_workers
+        if workers and int(workers) > max_workers:
+            logging.warning(f"{workers} workers com {self.threads_per_job} threads excedem {cpus} CPUs; "
+                            f"usando {self.workers} workers")
+
+        self.memory_budget_mb = int(memory_budget_mb)
+        self.store_dir = store_dir
+        self.cache_dir = cache_dir
+        self.jobs = {}
+        self._queue = deque()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        os.makedirs(store_dir, exist_ok=True)
+
+    def start(self):
+        """Inicia a thread de despacho dos jobs."""
+        self._thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra a thread de despacho e os processos dos jobs em execução."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            for reader, (job_id, process) in list(self._running.items()):
+                process.kill()
+                process.join()
+                reader.close()
+                if self.jobs[job_id]["finished"] is None:
+                    self._finish(job_id, "cancelado", error="Serviço encerrado")
+            self._running.clear()
+
+    def submit(self, instance_path, solver="highs", memory_mb=None):
+        """
+        Coloca um job na fila.
+
+        Args:
+            instance_path (str): Caminho do arquivo MPS
+            solver (str, optional): Backend (chave de BACKENDS). Defaults to "highs".
+            memory_mb (int, optional): Reserva de memória do job. Defaults to estimate_memory_mb().
+
+        Raises:
+            ValueError: Se o solver for desconhecido ou o arquivo não existir
+            MemoryBudgetError: Se a reserva de memória for maior que o orçamento total
+
+        Returns:
+            dict: Estado do job criado
+        """
+        if solver not in BACKENDS:
+            raise ValueError(f"Solver desconhecido: {solver}. Opções: {', '.join(BACKENDS)}")
+        if not os.path.isfile(instance_path):
+            raise ValueError(f"Arquivo não encontrado: {instance_path}")
+
+        memory_mb = int(memory_mb) if memory_mb else estimate_memory_mb(instance_path, solver, self.threads_per_job)
+        if memory_mb > self.memory_budget_mb:
+            raise MemoryBudgetError(
+                f"O job precisa de {memory_mb} MB, acima do orçamento de {self.memory_budget_mb} MB")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "instance": os.path.abspath(instance_path),
+            "solver": solver,
+            "memory_mb": memory_mb,
+            "threads": self.threads_per_job,
+            "status": "na fila",
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "results": None,
+            "error": None,
+        }
+        with self._lock:
+            self.jobs[job["id"]] = job
+            self._queue.append(job["id"])
+        self._wakeup.set()
+        return dict(job)
+
+    def get(self, job_id):
+        """
+        Retorna o estado de um job.
+
+        Jobs de execuções anteriores do serviço são lidos do repositório em disco.
+
+        Returns:
+            dict: Estado do job, ou None se o id for desconhecido
+        """
+        with self._lock:
+            if job_id in self.jobs:
+                return dict(self.jobs[job_id])
+
+        path = os.path.join(self.store_dir, f"{os.path.basename(job_id)}.json")
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                return json.load(file)
+        return None
+
+    def list(self):
+        """Retorna o estado de todos os jobs desta execução do serviço."""
+        with self._lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def cancel(self, job_id):
+        """
+        Cancela um job na fila ou em execução.
+
+        Returns:
+            bool: True se o job foi cancelado
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job["finished"] is not None:
+                return False
+
+            if job_id in self._queue:
+                self._queue.remove(job_id)
+            for running_id, process in self._running.values():
+                if running_id == job_id:
+                    # O pipe é fechado pela thread de despacho ao receber o fim do processo
+                    process.kill()
+            self._finish(job_id, "cancelado")
+        self._wakeup.set()
+        return True
+
+    def _reserved_mb(self):
+        """Soma das reservas de memória dos jobs em execução."""
+        return sum(self.jobs[job_id]["memory_mb"] for job_id, _ in self._running.values())
+
+    def _finish(self, job_id, status, results=None, error=None, **extra):
+        """Marca o job como terminado e grava o estado no repositório. Chamar com o lock."""
+        job = self.jobs[job_id]
+        job.update(status=status, results=results, error=error, finished=time.time(), **extra)
+
+        path = os.path.join(self.store_dir, f"{job_id}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(job, file, indent=2)
+        os.replace(tmp_path, path)
+
+    def _admit(self):
+        """Inicia os jobs da fila que cabem nos limites de processos e memória. Chamar com o lock."""
+        while self._queue and len(self._running) < self.workers:
+            job = self.jobs[self._queue[0]]
+            # FIFO: o primeiro da fila espera a memória liberar, sem ser ultrapassado
+            if self._reserved_mb() + job["memory_mb"] > self.memory_budget_mb:
+                break
+
+            self._queue.popleft()
+            reader, writer = mp.Pipe(duplex=False)
+            process = mp.Process(
+                target=_service_job,
+                args=(job["instance"], job["solver"], job["threads"], job["memory_mb"], self.cache_dir, writer),
+                daemon=True,
+            )
+            process.start()
+            writer.close()
+            self._running[reader] = (job["id"], process)
+            job.update(status="em execução", started=time.time())
+
+    def _collect(self, ready):
+        """Recebe os resultados dos jobs que terminaram. Chamar com o lock."""
+        for reader in ready:
+            if reader not in self._running:
+                continue
+            job_id, process = self._running.pop(reader)
+            if self.jobs[job_id]["finished"] is not None:
+                # Job cancelado: só libera o processo e o pipe
+                process.join()
+                reader.close()
+                continue
+            try:
+                message = reader.recv()
+            except (EOFError, OSError):
+                message = {"error": f"Processo encerrado sem resultado (código {process.exitcode})"}
+            process.join()
+            reader.close()
+
+            error = message.pop("error", None)
+            results = message.pop("results", None)
+            self._finish(job_id, "erro" if error else "concluído", results=results, error=error, **message)
+            logging.info(f"Job {job_id} ({os.path.basename(self.jobs[job_id]['instance'])}): "
+                         f"{self.jobs[job_id]['status']}")
+
+    def _dispatch_loop(self):
+        """Laço da thread de despacho: admite jobs e recolhe resultados."""
+        while not self._stopping.is_set():
+            with self._lock:
+                self._admit()
+                readers = list(self._running)
+
+            if readers:
+                ready = wait(readers, timeout=0.5)
+                with self._lock:
+                    self._collect(ready)
+            else:
+                self._wakeup.wait(timeout=0.5)
+                self._wakeup.clear()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    API HTTP do serviço (JSON):
+        POST   /jobs        {"instance": caminho, "solver": "highs", "memory_mb": opcional}
+        GET    /jobs        lista dos jobs
+        GET    /jobs/<id>   estado e resultado de um job
+        DELETE /jobs/<id>   cancela um job
+    """
+
+    service = None
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_id(self):
+        parts = self.path.strip("/").split("/")
+        return parts[1] if len(parts) == 2 and parts[0] == "jobs" else None
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/jobs":
+            self._reply(200, self.service.list())
+            return
+
+        job = self.service.get(self._job_id()) if self._job_id() else None
+        if job is None:
+            self._reply(404, {"error": "Job não encontrado"})
+        else:
+            self._reply(200, job)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._reply(404, {"error": "Rota não encontrada"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.service.submit(request["instance"], request.get("solver", "highs"), request.get("memory_mb"))
+        except KeyError:
+            self._reply(400, {"error": "Campo 'instance' obrigatório"})
+        except (ValueError, MemoryBudgetError, json.JSONDecodeError) as e:
+            self._reply(400, {"error": str(e)})
+        else:
+            self._reply(202, job)
+
+    def do_DELETE(self):
+        job_id = self._job_id()
+        if job_id is None or not self.service.cancel(job_id):
+            self._reply(404, {"error": "Job não encontrado ou já terminado"})
+        else:
+            self._reply(200, self.service.get(job_id))
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def serve(service, host="127.0.0.1", port=DEFAULT_PORT):
+    """Atende a API HTTP do serviço até ser interrompido (Ctrl+C)."""
+    handler = type("RequestHandler", (_RequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    service.start()
+    logging.info(f"Serviço de jobs em http://{host}:{port} ({service.workers} workers, "
+                 f"{service.threads_per_job} threads/job, {service.memory_budget_mb} MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+def _request(url, method="GET", payload=None):
+    """Envia uma requisição JSON ao serviço e retorna a resposta decodificada."""
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        print(json.load(e).get("error", str(e)))
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local de jobs de otimização")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}", help="Endereço do serviço (clientes)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Inicia o serviço")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--workers", type=int, default=None, help="Jobs simultâneos")
+    serve_parser.add_argument("--threads", type=int, default=1, help="Threads do HiGHS por job")
+    serve_parser.add_argument("--memory", type=int, default=4096, help="Memória total para os jobs em MB")
+    serve_parser.add_argument("--store", default="cache/jobs", help="Pasta dos resultados")
+    serve_parser.add_argument("--cache", default=None, help="Pasta do cache binário de instâncias")
+
+    submit_parser = commands.add_parser("submit", help="Envia um job")
+    submit_parser.add_argument("instance", help="Arquivo MPS")
+    submit_parser.add_argument("--solver", default="highs", choices=sorted(BACKENDS))
+    submit_parser.add_argument("--memory", type=int, default=None, help="Reserva de memória do job em MB")
+    submit_parser.add_argument("--wait", action="store_true", help="Aguarda o término e mostra o resultado")
+
+    status_parser = commands.add_parser("status", help="Mostra o estado de um job")
+    status_parser.add_argument("id")
+    cancel_parser = commands.add_parser("cancel", help="Cancela um job")
+    cancel_parser.add_argument("id")
+    commands.add_parser("list", help="Lista os jobs")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "serve":
+        service = JobService(args.workers, args.threads, args.memory, args.store, args.cache)
+        serve(service, args.host, args.port)
+        return
+
+    url = args.url.rstrip("/")
+    if args.command == "submit":
+        payload = {"instance": os.path.abspath(args.instance), "solver": args.solver, "memory_mb": args.memory}
+        job = _request(f"{url}/jobs", "POST", payload)
+        while args.wait and job["finished"] is None:
+            time.sleep(1.0)
+            job = _request(f"{url}/jobs/{job['id']}")
+        print(json.dumps(job, indent=2))
+    elif args.command == "status":
+        print(json.dumps(_request(f"{url}/jobs/{args.id}"), indent=2))
+    elif args.command == "cancel":
+        print(json.dumps(_request(f"{url}/jobs/{args.id}", "DELETE"), indent=2))
+    elif args.command == "list":
+        for job in _request(f"{url}/jobs"):
+            print(f"{job['id']}  {job['status']:<12} {job['solver']:<8} {os.path.basename(job['instance'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import numpy as np
+
+# Critérios de reinício do PDLP (Applegate et al., 2021), usados pelos métodos de ponto de sela
+RESTART_SUFFICIENT = 0.2
+RESTART_NECESSARY = 0.8
+RESTART_ARTIFICIAL = 0.36
+
+# Convenção de sinais (a mesma do HiGHS), para min c'x s.a. row_lower <= Ax <= row_upper, lower <= x <= upper:
+#   y (duais das linhas): y_i > 0 quando o limite inferior da linha está ativo, y_i < 0 quando o superior está
+#   z (custos reduzidos): z = c - A'y, com z_j > 0 no limite inferior e z_j < 0 no limite superior da variável
+
+
+def row_slacks(activity, row_lower, row_upper):
+    """
+    Calcula a folga de cada restrição em relação ao seu limite finito.
+
+    Para restrições com limite superior finito a folga é row_upper - Ax; caso
+    contrário é Ax - row_lower. Em ambos os casos a folga é >= 0 quando a
+    restrição é satisfeita.
+
+    Returns:
+        np.ndarray: Folga de cada restrição
+    """
+    return np.where(np.isfinite(row_upper), row_upper - activity, activity - row_lower)
+
+
+def _bound_dual_terms(dual, lower, upper):
+    """
+    Separa um vetor dual em parte absorvida pelos limites finitos e parte inviável.
+
+    Returns:
+        tuple: (contribuição para o objetivo dual, resíduo de viabilidade dual)
+    """
+    positive = np.maximum(dual, 0.0)
+    negative = np.maximum(-dual, 0.0)
+    finite_lower = np.isfinite(lower)
+    finite_upper = np.isfinite(upper)
+
+    objective = positive[finite_lower] @ lower[finite_lower] - negative[finite_upper] @ upper[finite_upper]
+    residual = np.where(finite_lower, 0.0, positive) + np.where(finite_upper, 0.0, negative)
+    return objective, residual
+
+
+def kkt_metrics(A, c, row_lower, row_upper, lower, upper, x, y, objective_offset=0.0):
+    """
+    Calcula objetivos, gap de dualidade e resíduos primal/dual de um par (x, y).
+
+    Todas as operações são vetorizadas (dois produtos matriz-vetor esparsos).
+    Os resíduos são relativos, no estilo dos critérios de parada do PDLP.
+
+    Args:
+        A (scipy.sparse matrix): Matriz das restrições
+        c (np.ndarray): Custos
+        row_lower, row_upper (np.ndarray): Limites das restrições
+        lower, upper (np.ndarray): Limites das variáveis
+        x (np.ndarray): Solução primal
+        y (np.ndarray): Solução dual das restrições
+        objective_offset (float, optional): Constante da função objetivo
+
+    Returns:
+        dict: Dicionário contendo:
+            - primal_objective / dual_objective: Valores objetivos primal e dual
+            - gap: Gap de dualidade relativo
+            - primal_feasibility: Violação relativa das restrições e limites
+            - dual_feasibility: Violação relativa da viabilidade dual
+            - activity: Ax
+            - reduced_costs: c - A'y
+    """
+    activity = A @ x
+    reduced_costs = c - A.T @ y
+
+    row_violation = activity - np.clip(activity, row_lower, row_upper)
+    bound_violation = x - np.clip(x, lower, upper)
+    primal_residual = np.sqrt(row_violation @ row_violation + bound_violation @ bound_violation)
+
+    row_objective, row_residual = _bound_dual_terms(y, row_lower, row_upper)
+    col_objective, col_residual = _bound_dual_terms(reduced_costs, lower, upper)
+    dual_residual = np.sqrt(row_residual @ row_residual + col_residual @ col_residual)
+
+    primal_objective = c @ x + objective_offset
+    dual_objective = row_objective + col_objective + objective_offset
+
+    finite_bounds = np.concatenate((row_lower[np.isfinite(row_lower)], row_upper[np.isfinite(row_upper)]))
+    return {
+        "primal_objective": float(primal_objective),
+        "dual_objective": float(dual_objective),
+        "gap": float(abs(primal_objective - dual_objective) / (1.0 + abs(primal_objective) + abs(dual_objective))),
+        "primal_feasibility": float(primal_residual / (1.0 + np.linalg.norm(finite_bounds))),
+        "dual_feasibility": float(dual_residual / (1.0 + np.linalg.norm(c))),
+        "activity": activity,
+        "reduced_costs": reduced_costs,
+    }
+
+
+def to_objective_sense(metrics, sense):
+    """
+    Leva as métricas de kkt_metrics() da forma de minimização ao sentido original do problema.
+
+    Os solvers resolvem min sense*c'x; em um problema de maximização (sense = -1)
+    os objetivos e os custos reduzidos trocam de sinal, como os duais na
+    convenção do HiGHS. Gap e resíduos não mudam.
+
+    Args:
+        metrics (dict): Dicionário de kkt_metrics() calculado com os custos sense*c
+        sense (int): 1 para minimizar, -1 para maximizar (objective_sense do parser)
+
+    Returns:
+        dict: Métricas no sentido original (o próprio dicionário quando sense = 1)
+    """
+    if sense == 1:
+        return metrics
+    return {
+        **metrics,
+        "primal_objective": sense * metrics["primal_objective"],
+        "dual_objective": sense * metrics["dual_objective"],
+        "reduced_costs": sense * metrics["reduced_costs"],
+    }
+
+
+def kkt_error(metrics):
+    """Erro KKT combinado: o maior entre gap e resíduos primal/dual relativos."""
+    return max(metrics["gap"], metrics["primal_feasibility"], metrics["dual_feasibility"])
+
+
+def converged(metrics, tol):
+    """Indica se gap e resíduos primal/dual estão abaixo da tolerância relativa."""
+    return kkt_error(metrics) <= tol
+
+
+def restart_due(error, start_error, previous_error, iteration, cycle_start):
+    """
+    Indica se um método de ponto de sela deve reiniciar no melhor candidato (critérios do PDLP).
+
+    Args:
+        error (float): Erro KKT do candidato atual
+        start_error (float): Erro KKT no início do ciclo (último reinício)
+        previous_error (float): Erro KKT do candidato no teste anterior
+        iteration (int): Iteração atual
+        cycle_start (int): Iteração do último reinício
+
+    Returns:
+        bool: True se o erro caiu o suficiente, parou de cair depois de cair o
+            necessário, ou se o ciclo já é longo em relação ao total de iterações
+    """
+    return (
+        error <= RESTART_SUFFICIENT * start_error
+        or (error <= RESTART_NECESSARY * start_error and error > previous_error)
+        or iteration - cycle_start >= RESTART_ARTIFICIAL * iteration
+    )
@@ -0,0 +1,247 @@
+import os
+import time
+
+from codes.compressed_io import open_instance
+
+# Memória de referência de um processo com Python, NumPy, SciPy e highspy carregados (MB)
+BASE_MB = 256
+# Fator de segurança sobre a parte variável: as estimativas servem de limite de espaço de endereçamento
+SAFETY_FACTOR = 2.0
+# Espaço de endereçamento reservado por thread do HiGHS (arena do malloc), em MB
+THREAD_MB = 64
+
+# Bytes por não-zero e por linha/coluna de cada etapa, medidos em instâncias da Netlib e em
+# LPs aleatórios com até 1,8 milhão de não-zeros
+PARSE_BYTES_PER_NNZ = 70        # triplas COO de read() e matriz CSR/CSC de parse(sparse=True)
+PARSE_BYTES_PER_VECTOR = 100    # nomes, limites e custos por linha/coluna
+# Cópias da matriz no HiGHS, presolve e fatoração LU: o preenchimento da LU depende da estrutura
+# (cerca de 350 B/nnz em pilot87 e 950 B/nnz em um LP aleatório); usa-se um valor intermediário
+HIGHS_BYTES_PER_NNZ = 600
+HIGHS_BYTES_PER_VECTOR = 600
+LINPROG_BYTES_PER_NNZ = 40      # A_ub/A_eq repassadas ao linprog, além do HiGHS interno
+FIRST_ORDER_VECTORS = 20        # vetores de tamanho m ou n mantidos pelos métodos de primeira ordem
+
+# Ordem de preferência usada por choose_solver()
+SOLVER_PREFERENCE = ("highs", "linprog", "pdhg", "coordinate", "mirror")
+
+
+class MemoryBudgetError(MemoryError):
+    """Erro levantado quando a instância não cabe no orçamento de memória."""
+
+
+def available_memory_mb():
+    """
+    Retorna a memória disponível no sistema em MB (MemAvailable no Linux).
+
+    Returns:
+        float: Memória disponível, ou None se não for possível obtê-la
+    """
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def prescan(file_path):
+    """
+    Conta linhas, colunas e não-zeros de um arquivo MPS sem montar o problema.
+
+    Lê só as seções ROWS e COLUMNS, em modo binário e sem converter números:
+    cada linha de COLUMNS contribui com (campos - 1) // 2 não-zeros. Se algum
+    nome da seção ROWS contém espaços (MPS fixo, ex: forplan.mps), as linhas
+    de COLUMNS são lidas pelas colunas fixas. A leitura para na primeira seção
+    seguinte (RHS, RANGES, BOUNDS). Arquivos comprimidos são lidos em streaming.
+
+    Returns:
+        dict: rows (restrições, sem as linhas N), eq_rows (restrições E), cols,
+            nnz (inclui os coeficientes da função objetivo) e scan_time
+    """
+    start = time.perf_counter()
+    rows = eq_rows = cols = nnz = 0
+    section = None
+    last_column = None
+    fixed = False
+
+    with open_instance(file_path, "rb") as file:
+        for line in file:
+            if not line.strip() or line.startswith(b"*"):
+                continue
+            if not line[:1].isspace():
+                section = line.split()[0].upper()
+                if section in (b"RHS", b"RANGES", b"BOUNDS", b"ENDATA"):
+                    break
+                continue
+
+            fields = line.split()
+            if section == b"ROWS":
+                row_type = fields[0].upper()
+                fixed = fixed or len(fields) > 2
+                if row_type != b"N":
+                    rows += 1
+                    eq_rows += row_type == b"E"
+            elif section == b"COLUMNS":
+                if b"'MARKER'" in line:
+                    continue
+                if fixed:
+                    # Campos 2 (nome da coluna) e 5 (segunda linha) do formato fixo
+                    column = line[4:12].strip()
+                    entries = 2 if line[39:47].strip() else 1
+                else:
+                    column = fields[0]
+                    entries = (len(fields) - 1) // 2
+                if column != last_column:
+                    cols += 1
+                    last_column = column
+                nnz += entries
+
+    return {"rows": rows, "eq_rows": eq_rows, "cols": cols, "nnz": nnz,
+            "scan_time": time.perf_counter() - start}
+
+
+class MemoryEstimate:
+    """
+    Estima a memória de cada representação e de cada solver para uma instância.
+
+    As estimativas são lineares no número de não-zeros e no tamanho dos
+    vetores (m + n), com coeficientes medidos (ver constantes do módulo), mais
+    a memória fixa do processo. Como são usadas também como limite de espaço
+    de endereçamento (RLIMIT_AS), incluem o fator SAFETY_FACTOR.
+
+    Atributos:
+        rows (int): Número de restrições
+        cols (int): Número de variáveis
+        nnz (int): Número de não-zeros
+        eq_rows (int): Número de restrições de igualdade
+
+    Métodos:
+        from_file(path): Cria a estimativa a partir de prescan()
+        representation_mb(sparse): Memória da montagem densa ou esparsa
+        solver_mb(solver, threads): Memória de um solver
+        estimates(): Memória de todos os solvers
+        check(solver, budget_mb): Levanta MemoryBudgetError se o solver não couber
+        choose_solver(budget_mb): Primeiro solver de SOLVER_PREFERENCE que cabe
+    """
+
+    def __init__(self, rows, cols, nnz, eq_rows=0):
+        self.rows = int(rows)
+        self.cols = int(cols)
+        self.nnz = int(nnz)
+        self.eq_rows = int(eq_rows)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Cria a estimativa a partir das contagens de prescan()."""
+        counts = prescan(file_path)
+        return cls(counts["rows"], counts["cols"], counts["nnz"], counts["eq_rows"])
+
+    def _vectors(self):
+        return self.rows + self.cols
+
+    def _sparse_bytes(self):
+        return PARSE_BYTES_PER_NNZ * self.nnz + PARSE_BYTES_PER_VECTOR * self._vectors()
+
+    def _total_mb(self, variable_bytes):
+        return BASE_MB + SAFETY_FACTOR * variable_bytes / (1 << 20)
+
+    def representation_mb(self, sparse=True):
+        """
+        Memória de MPSParser.parse() na forma esparsa ou densa, em MB.
+
+        A forma densa guarda A_ub e A_eq como arrays m x n (8 bytes por entrada),
+        além das estruturas esparsas usadas na montagem.
+        """
+        variable = self._sparse_bytes()
+        if not sparse:
+            variable += 8 * self.rows * self.cols
+        return self._total_mb(variable)
+
+    def solver_mb(self, solver, threads=1):
+        """
+        Memória estimada de um solver, em MB.
+
+        Args:
+            solver (str): "highs", "linprog", "pdhg", "coordinate", "mirror", "portfolio"
+                ou "decomposition"
+            threads (int, optional): Threads do HiGHS. Defaults to 1.
+
+        Raises:
+            ValueError: Se o solver não for conhecido
+        """
+        highs = HIGHS_BYTES_PER_NNZ * self.nnz + HIGHS_BYTES_PER_VECTOR * self._vectors()
+        first_order = self._sparse_bytes() + 8 * FIRST_ORDER_VECTORS * self._vectors()
+
+        if solver == "highs":
+            return self._total_mb(self._sparse_bytes() + highs) + THREAD_MB * max(0, threads - 1)
+        if solver == "linprog":
+            return self._total_mb(self._sparse_bytes() + highs + LINPROG_BYTES_PER_NNZ * self.nnz)
+        if solver in ("pdhg", "coordinate", "mirror"):
+            return self._total_mb(first_order)
+        if solver == "portfolio":
+            # Um processo por método (3 variantes do HiGHS e o linprog), além do processo principal
+            return (3 * self.solver_mb("highs") + self.solver_mb("linprog") + self.representation_mb())
+        if solver == "decomposition":
+            # Os modelos dos subproblemas somam no máximo o modelo inteiro no HiGHS; o mestre
+            # (linhas de ligação e colunas geradas) é pequeno perto deles
+            return self._total_mb(self._sparse_bytes() + highs)
+        raise ValueError(f"Solver desconhecido para a estimativa de memória: {solver}")
+
+    def estimates(self, threads=1):
+        """
+        Returns:
+            dict: {solver: MB} para os solvers de SOLVER_PREFERENCE e o portfólio
+        """
+        return {solver: self.solver_mb(solver, threads) for solver in SOLVER_PREFERENCE + ("portfolio",)}
+
+    def check(self, solver, budget_mb=None, threads=1):
+        """
+        Verifica se o solver cabe no orçamento, antes de ler a instância.
+
+        Args:
+            solver (str): Nome do solver (ver solver_mb)
+            budget_mb (float, optional): Orçamento em MB. Defaults to available_memory_mb().
+            threads (int, optional): Threads do HiGHS. Defaults to 1.
+
+        Raises:
+            MemoryBudgetError: Se a estimativa passar do orçamento
+
+        Returns:
+            float: Memória estimada em MB
+        """
+        budget_mb = budget_mb if budget_mb is not None else available_memory_mb()
+        required = self.solver_mb(solver, threads)
+        if budget_mb is not None and required > budget_mb:
+            raise MemoryBudgetError(
+                f"O solver {solver} precisa de cerca de {required:.0f} MB para {self.rows} restrições, "
+                f"{self.cols} variáveis e {self.nnz} não-zeros, acima do orçamento de {budget_mb:.0f} MB"
+            )
+        return required
+
+    def choose_solver(self, budget_mb=None, preference=SOLVER_PREFERENCE, threads=1):
+        """
+        Escolhe o primeiro solver da lista de preferência que cabe no orçamento.
+
+        Os métodos de primeira ordem (sem fatoração) ficam por último na
+        preferência, mas são os que cabem em instâncias muito grandes.
+
+        Raises:
+            MemoryBudgetError: Se nenhum solver couber
+
+        Returns:
+            str: Nome do solver escolhido
+        """
+        budget_mb = budget_mb if budget_mb is not None else available_memory_mb()
+        for solver in preference:
+            if budget_mb is None or self.solver_mb(solver, threads) <= budget_mb:
+                return solver
+        smallest = min(self.solver_mb(solver, threads) for solver in preference)
+        raise MemoryBudgetError(
+            f"Nenhum solver cabe no orçamento de {budget_mb:.0f} MB "
+            f"(o menor precisa de cerca de {smallest:.0f} MB)"
+        )
@@ -0,0 +1,136 @@
+# Valores ótimos conhecidos das instâncias Netlib (Instancias/mps), usados para
+# verificar os objetivos obtidos pelos solvers no benchmark.
+#
+# Os valores seguem a tabela publicada no README da Netlib, exceto que incluem a
+# constante da função objetivo (RHS da linha objetivo). A única instância afetada
+# é e226, cujo valor publicado (-1.8751929066E+01) não inclui a constante 7.113.
+
+NETLIB_OPTIMAL = {
+    "25fv47": 5.5018458883E+03,
+    "80bau3b": 9.8722419241E+05,
+    "adlittle": 2.2549496316E+05,
+    "afiro": -4.6475314286E+02,
+    "agg": -3.5991767287E+07,
+    "agg2": -2.0239252356E+07,
+    "agg3": 1.0312115935E+07,
+    "bandm": -1.5862801845E+02,
+    "beaconfd": 3.3592485807E+04,
+    "blend": -3.0812149846E+01,
+    "bnl1": 1.9776295615E+03,
+    "bnl2": 1.8112365404E+03,
+    "boeing1": -3.3521356751E+02,
+    "boeing2": -3.1501872802E+02,
+    "bore3d": 1.3730803942E+03,
+    "brandy": 1.5185098965E+03,
+    "capri": 2.6900129138E+03,
+    "cycle": -5.2263930249E+00,
+    "czprob": 2.1851966989E+06,
+    "d2q06c": 1.2278421081E+05,
+    "d6cube": 3.1549166667E+02,
+    "degen2": -1.4351780000E+03,
+    "degen3": -9.8729400000E+02,
+    "dfl001": 1.1266396047E+07,
+    "e226": -1.1638929066E+01,
+    "etamacro": -7.5571523330E+02,
+    "fffff800": 5.5567956482E+05,
+    "finnis": 1.7279106560E+05,
+    "fit1d": -9.1463780924E+03,
+    "fit1p": 9.1463780924E+03,
+    "fit2p": 6.8464293294E+04,
+    "forplan": -6.6421896127E+02,
+    "ganges": -1.0958573613E+05,
+    "gfrd-pnc": 6.9022359995E+06,
+    "greenbea": -7.2555248130E+07,
+    "greenbeb": -4.3022602612E+06,
+    "grow15": -1.0687094129E+08,
+    "grow22": -1.6083433648E+08,
+    "grow7": -4.7787811815E+07,
+    "israel": -8.9664482186E+05,
+    "kb2": -1.7499001299E+03,
+    "lotfi": -2.5264706062E+01,
+    "maros": -5.8063743701E+04,
+    "modszk1": 3.2061972906E+02,
+    "nesm": 1.4076036488E+07,
+    "perold": -9.3807552782E+03,
+    "pilot.ja": -6.1131364656E+03,
+    "pilot": -5.5748972929E+02,
+    "pilot.we": -2.7201075328E+06,
+    "pilot4": -2.5811392589E+03,
+    "pilot87": 3.0171034733E+02,
+    "pilotnov": -4.4972761882E+03,
+    "recipe": -2.6661600000E+02,
+    "sc105": -5.2202061212E+01,
+    "sc205": -5.2202061212E+01,
+    "sc50a": -6.4575077059E+01,
+    "sc50b": -7.0000000000E+01,
+    "scagr25": -1.4753433061E+07,
+    "scagr7": -2.3313898243E+06,
+    "scfxm1": 1.8416759028E+04,
+    "scfxm2": 3.6660261565E+04,
+    "scfxm3": 5.4901254550E+04,
+    "scorpion": 1.8781248227E+03,
+    "scrs8": 9.0429695380E+02,
+    "scsd1": 8.6666666743E+00,
+    "scsd6": 5.0500000078E+01,
+    "scsd8": 9.0499999993E+02,
+    "sctap1": 1.4122500000E+03,
+    "sctap2": 1.7248071429E+03,
+    "sctap3": 1.4240000000E+03,
+    "seba": 1.5711600000E+04,
+    "share1b": -7.6589318579E+04,
+    "share2b": -4.1573224074E+02,
+    "shell": 1.2088253460E+09,
+    "ship04l": 1.7933245380E+06,
+    "ship04s": 1.7987147004E+06,
+    "ship08l": 1.9090552114E+06,
+    "ship08s": 1.9200982105E+06,
+    "ship12l": 1.4701879193E+06,
+    "ship12s": 1.4892361344E+06,
+    "sierra": 1.5394362184E+07,
+    "stair": -2.5126695119E+02,
+    "standata": 1.2576995000E+03,
+    "standgub": 1.2576995000E+03,
+    "standmps": 1.4060175000E+03,
+    "stocfor1": -4.1131976219E+04,
+    "stocfor2": -3.9024408538E+04,
+    "truss": 4.5881584719E+05,
+    "tuff": 2.9214776509E-01,
+    "vtp.base": 1.2983146246E+05,
+    "wood1p": 1.4429024116E+00,
+    "woodw": 1.3044763331E+00,
+}
+
+
+def reference_objective(instance_name):
+    """
+    Retorna o valor ótimo conhecido de uma instância Netlib.
+
+    Args:
+        instance_name (str): Nome da instância, com ou sem caminho/extensão (ex: "afiro.mps")
+
+    Returns:
+        float: Valor ótimo de referência, ou None se a instância não estiver na tabela
+    """
+    name = instance_name.replace("\\", "/").rsplit("/", 1)[-1].lower()
+    for extension in (".gz", ".bz2", ".xz", ".mps", ".lp"):
+        if name.endswith(extension):
+            name = name[: -len(extension)]
+    return NETLIB_OPTIMAL.get(name)
+
+
+def check_objective(instance_name, objective_value, rtol=1e-6):
+    """
+    Compara um valor objetivo com o ótimo de referência da instância.
+
+    Args:
+        instance_name (str): Nome da instância
+        objective_value (float): Valor objetivo obtido pelo solver
+        rtol (float, optional): Tolerância relativa. Defaults to 1e-6.
+
+    Returns:
+        bool: True se o valor confere, False se diverge, None se não há referência
+    """
+    reference = reference_objective(instance_name)
+    if reference is None or objective_value is None:
+        return None
+    return abs(objective_value - reference) <= rtol * max(1.0, abs(reference))
@@ -2,16 +2,80 @@ import re
 import numpy as np
 import logging
 import sys
+import scipy.sparse as sp
 
-class MPSParser:
+from array import array
+from codes.compressed_io import open_instance
+from codes.tracing import trace_phase
+from codes.memory_estimator import MemoryBudgetError, available_memory_mb
+
+# Seções reconhecidas do formato MPS (linhas que começam na coluna 1)
+SECTIONS = ("NAME", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "OBJSENSE", "ENDATA")
+
+# Sentido da otimização (seção OBJSENSE), no formato do HiGHS: 1 minimiza, -1 maximiza
+OBJECTIVE_SENSES = {"MIN": 1, "MINIMIZE": 1, "MAX": -1, "MAXIMIZE": -1}
+
+# Tipos de limite que não trazem valor numérico na seção BOUNDS
+VALUELESS_BOUNDS = ("FR", "MI", "PL", "BV")
+
+# Colunas fixas (base 0) dos seis campos do formato MPS fixo
+FIXED_FIELDS = ((1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61))
+
+
+def fixed_fields(line):
+    """
+    Separa uma linha do formato MPS fixo pelos campos de coluna padrão.
+
+    Usado quando os nomes contêm espaços (ex: forplan.mps), caso em que
+    a separação por espaços em branco não funciona.
+
+    Returns:
+        list: Campos não vazios na ordem em que aparecem na linha
+    """
+    line = line.rstrip("\r\n")
+    fields = [line[a:b].strip() for a, b in FIXED_FIELDS]
+    return [field for field in fields if field]
+
+
+def row_bounds(row_types, rhs, ranges):
+    """
+    Converte tipo, lado direito e RANGES das restrições em limites inferior/superior.
+
+    Segue a convenção do formato MPS para RANGES (R):
+        L: [rhs - |R|, rhs]
+        G: [rhs, rhs + |R|]
+        E: [rhs, rhs + R] se R > 0, [rhs + R, rhs] se R < 0
 
+    Args:
+        row_types (np.ndarray): Tipos das restrições ("L", "G" ou "E")
+        rhs (np.ndarray): Lado direito das restrições
+        ranges (np.ndarray): Valores RANGES (NaN quando ausente)
+
+    Returns:
+        tuple: (row_lower, row_upper) como arrays NumPy
     """
+    row_lower = np.where(row_types == "L", -np.inf, rhs)
+    row_upper = np.where(row_types == "G", np.inf, rhs)
+
+    has_range = ~np.isnan(ranges)
+    size = np.abs(np.where(has_range, ranges, 0.0))
+    row_lower = np.where(has_range & (row_types == "L"), rhs - size, row_lower)
+    row_upper = np.where(has_range & (row_types == "G"), rhs + size, row_upper)
+    row_upper = np.where(has_range & (row_types == "E") & (ranges > 0), rhs + size, row_upper)
+    row_lower = np.where(has_range & (row_types == "E") & (ranges < 0), rhs - size, row_lower)
+    return row_lower, row_upper
 
-    
 
+class MPSParser:
+
+    """
     Classe para fazer parsing de arquivos no formato MPS (Mathematical Programming System).
     O formato MPS é um formato padrão da indústria para representar problemas de programação linear.
 
+    O arquivo é lido uma única vez, em streaming, por read(). A matriz de restrições é
+    guardada em coordenadas (COO) com índices inteiros, de modo que a memória usada
+    cresce com o número de não nulos e não com o tamanho do arquivo.
+
     Atributos:
         file_path (str): Caminho para o arquivo MPS a ser processado
         name (str): Nome do problema extraído do arquivo
@@ -20,40 +84,41 @@ class MPSParser:
         A (dict): Dicionário para armazenar os coeficientes da matriz de restrições
         rhs (dict): Dicionário para armazenar os valores do lado direito das restrições
         bounds (dict): Dicionário para armazenar os limites das variáveis
+        cache (InstanceCache): Cache binário de instâncias (opcional)
 
     Métodos:
+        read(): Lê o arquivo em uma única passada e retorna os arrays do problema
         extract_name(): Extrai o nome do problema do arquivo MPS
         extract_rows(): Extrai as informações da seção ROWS
         extract_columns(): Extrai os coeficientes da matriz de restrições
         extract_rhs(): Extrai os valores do lado direito das restrições
         extract_bounds(): Extrai os limites das variáveis
-        parse(): Executa todo o processo de parsing do arquivo
-
-    
-    
+        parse(sparse): Executa todo o processo de parsing do arquivo (denso ou esparso)
     """
 
-
-
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=None, tracer=None):
 
         """
         Inicializa um novo parser MPS.
 
         Args:
             file_path (str): Caminho para o arquivo MPS a ser processado.
+            cache (InstanceCache, optional): Cache binário de instâncias. Quando
+                informado, read() carrega a instância do cache se o conteúdo do
+                arquivo já foi lido antes, e grava o resultado caso contrário.
+            tracer (Tracer, optional): Registra as fases "leitura" (read) e
+                "montagem" (parse)
 
         Atributos inicializados:
             file_path (str): Caminho do arquivo
             name (str): Nome do problema (inicialmente vazio)
-            rows (list): Lista de restrições (inicialmente vazia) 
+            rows (list): Lista de restrições (inicialmente vazia)
             objective_row (str): Nome da função objetivo (inicialmente None)
             A (dict): Matriz de coeficientes (inicialmente vazio)
             rhs (dict): Valores do lado direito (inicialmente vazio)
             bounds (dict): Limites das variáveis (inicialmente vazio)
         """
 
-
         self.file_path = file_path
         self.name = ""
         self.rows = []
@@ -61,9 +126,293 @@ class MPSParser:
         self.A = {}
         self.rhs = {}
         self.bounds = {}
-    
+        self.cache = cache
+        self.tracer = tracer
+        self._raw = None
+
+    def read(self):
+
+        """
+        Lê o arquivo MPS em uma única passada, seção por seção.
+
+        As linhas são processadas à medida que são lidas, sem readlines(), e
+        seções opcionais (RANGES, BOUNDS) podem estar ausentes. Finais de linha
+        CRLF são aceitos. Linhas que não podem ser separadas por espaços (nomes
+        com espaços) são lidas pelas colunas fixas do formato MPS. Arquivos
+        comprimidos (gzip, bz2, xz) são descomprimidos em streaming.
+
+        As restrições são indexadas na ordem da seção ROWS (sem a função
+        objetivo e sem linhas livres extras) e as variáveis na ordem em que
+        aparecem na seção COLUMNS.
+
+        Returns:
+            dict: Dicionário contendo:
+                - name: Nome do problema
+                - objective_row: Nome da linha objetivo
+                - row_names / row_types: Nomes e tipos (L, G, E) das restrições
+                - col_names: Nomes das variáveis
+                - row_idx, col_idx, values: Triplas COO da matriz de restrições
+                - c: Coeficientes da função objetivo
+                - objective_offset: Constante da função objetivo
+                - objective_sense: 1 para minimizar, -1 para maximizar (seção OBJSENSE)
+                - rhs: Lado direito de cada restrição
+                - ranges: Valor RANGES de cada restrição (NaN quando ausente)
+                - lower / upper: Limites inferior e superior das variáveis
+        """
+
+        if self._raw is not None:
+            return self._raw
+
+        with trace_phase(self.tracer, "leitura"):
+            key = None
+            if self.cache is not None:
+                key = self.cache.key(self.file_path)
+                raw = self.cache.load(self.file_path, key)
+                if raw is not None:
+                    self.name = raw["name"]
+                    self.objective_row = raw["objective_row"]
+                    self.rows = [("N", self.objective_row)] + list(zip(raw["row_types"].tolist(), raw["row_names"]))
+                    self._raw = raw
+                    return self._raw
+
+            self._raw = self._read_text()
+            if self.cache is not None:
+                try:
+                    self.cache.store(self.file_path, self._raw, key)
+                except OSError as e:
+                    # O cache é opcional: a leitura continua válida sem ele
+                    logging.warning(f"Não foi possível gravar a instância no cache: {e}")
+            return self._raw
+
+    def _read_text(self):
+        """Faz a leitura em streaming do texto MPS (usada por read() quando não há cache)."""
+
+        row_index = {}
+        row_names = []
+        row_types = []
+        free_rows = set()
+        col_index = {}
+        col_names = []
+
+        row_idx = array("i")
+        col_idx = array("i")
+        values = array("d")
+        c = array("d")
+        objective_offset = 0.0
+        objective_sense = 1
+        rhs = ranges = lower = upper = None
+
+        section = None
+        current_col = None
+        current_j = -1
+
+        with open_instance(self.file_path) as file:
+            for line in file:
+                if not line.strip() or line.startswith("*"):
+                    continue
+
+                # Cabeçalho de seção: começa na primeira coluna
+                if not line[0].isspace():
+                    parts = line.split()
+                    section = parts[0]
+                    if section not in SECTIONS:
+                        raise ValueError(f"Seção MPS desconhecida: {section}")
+                    if section == "NAME":
+                        self.name = parts[1] if len(parts) > 1 else ""
+                    elif section == "OBJSENSE" and len(parts) > 1:
+                        # Formato livre: "OBJSENSE MAX" em uma única linha
+                        objective_sense = self._objective_sense(parts[1])
+                    elif section in ("RHS", "RANGES", "BOUNDS") and rhs is None:
+                        rhs, ranges, lower, upper = self._allocate(len(row_names), len(col_names))
+                    elif section == "ENDATA":
+                        break
+                    continue
+
+                if section == "OBJSENSE":
+                    objective_sense = self._objective_sense(line.split()[0])
+
+                elif section == "ROWS":
+                    parts = line.split()
+                    if len(parts) != 2:
+                        parts = fixed_fields(line)
+                    row_type, row_name = parts
+                    self.rows.append((row_type, row_name))
+                    if row_type == "N":
+                        if self.objective_row is None:
+                            self.objective_row = row_name  # Identifica a função objetivo
+                        else:
+                            free_rows.add(row_name)  # Linhas livres extras são descartadas
+                    else:
+                        row_index[row_name] = len(row_names)
+                        row_names.append(row_name)
+                        row_types.append(row_type)
+
+                elif section == "COLUMNS":
+                    if "'MARKER'" in line:
+                        continue
+                    entries = self._column_entries(line, row_index, free_rows)
+                    col_name = entries[0]
+                    if col_name != current_col:
+                        current_col = col_name
+                        current_j = col_index.get(col_name)
+                        if current_j is None:
+                            current_j = col_index[col_name] = len(col_names)
+                            col_names.append(col_name)
+                            c.append(0.0)
+                    for row_name, value in entries[1]:
+                        if row_name == self.objective_row:
+                            c[current_j] += value
+                        elif row_name not in free_rows:
+                            row_idx.append(row_index[row_name])
+                            col_idx.append(current_j)
+                            values.append(value)
+
+                elif section in ("RHS", "RANGES"):
+                    try:
+                        entries = self._vector_entries(line, row_index, free_rows)
+                    except ValueError:
+                        # Ignorar valores que não podem ser convertidos para float
+                        logging.warning(f"Valor inválido na linha {section}: {line.strip()}")
+                        continue
+                    for row_name, value in entries:
+                        if row_name == self.objective_row:
+                            if section == "RHS":
+                                objective_offset = -value
+                        elif row_name in row_index:
+                            target = rhs if section == "RHS" else ranges
+                            target[row_index[row_name]] = value
+
+                elif section == "BOUNDS":
+                    bound_type, col_name, value = self._bound_entry(line, col_index)
+                    self._apply_bound(bound_type, col_index[col_name], value, lower, upper)
+
+        if rhs is None:
+            rhs, ranges, lower, upper = self._allocate(len(row_names), len(col_names))
+
+        return {
+            "name": self.name,
+            "objective_row": self.objective_row,
+            "row_names": row_names,
+            "row_types": np.array(row_types, dtype="U1"),
+            "col_names": col_names,
+            "row_idx": np.frombuffer(row_idx, dtype=np.int32),
+            "col_idx": np.frombuffer(col_idx, dtype=np.int32),
+            "values": np.frombuffer(values, dtype=np.float64),
+            "c": np.frombuffer(c, dtype=np.float64).copy(),
+            "objective_offset": objective_offset,
+            "objective_sense": objective_sense,
+            "rhs": rhs,
+            "ranges": ranges,
+            "lower": lower,
+            "upper": upper,
+        }
+
+    @staticmethod
+    def _objective_sense(value):
+        """Converte o valor da seção OBJSENSE (MAX, MAXIMIZE, MIN, MINIMIZE) em 1 ou -1."""
+        sense = OBJECTIVE_SENSES.get(value.upper())
+        if sense is None:
+            raise ValueError(f"Sentido de otimização inválido na seção OBJSENSE: {value}")
+        return sense
+
+    @staticmethod
+    def _allocate(num_rows, num_cols):
+        """Cria os vetores de lado direito, ranges e limites com os valores padrão do MPS."""
+        rhs = np.zeros(num_rows)
+        ranges = np.full(num_rows, np.nan)
+        lower = np.zeros(num_cols)
+        upper = np.full(num_cols, np.inf)
+        return rhs, ranges, lower, upper
+
+    def _column_entries(self, line, row_index, free_rows):
+        """
+        Separa uma linha da seção COLUMNS em (coluna, [(linha, valor), ...]).
+
+        Tenta primeiro o formato livre; se o número de campos não fechar ou
+        alguma linha referenciada não existir, usa as colunas fixas.
+        """
+        for parts in (line.split(), None):
+            if parts is None:
+                parts = fixed_fields(line)
+            if len(parts) not in (3, 5):
+                continue
+            try:
+                pairs = [(parts[k], float(parts[k + 1])) for k in range(1, len(parts), 2)]
+            except ValueError:
+                continue
+            if all(name == self.objective_row or name in row_index or name in free_rows
+                   for name, _ in pairs):
+                return parts[0], pairs
+        raise ValueError(f"Linha inválida na seção COLUMNS: {line.strip()}")
+
+    def _vector_entries(self, line, row_index, free_rows):
+        """
+        Separa uma linha das seções RHS/RANGES em [(linha, valor), ...].
+
+        O nome do conjunto (primeiro campo) é opcional no formato livre.
+        """
+        known = lambda name: name == self.objective_row or name in row_index or name in free_rows
+        for parts in (line.split(), None):
+            if parts is None:
+                parts = fixed_fields(line)
+            if len(parts) % 2 == 1:
+                parts = parts[1:]  # Descarta o nome do conjunto
+            try:
+                pairs = [(parts[k], float(parts[k + 1])) for k in range(0, len(parts), 2)]
+            except (ValueError, IndexError):
+                continue
+            if pairs and all(known(name) for name, _ in pairs):
+                return pairs
+        raise ValueError(f"Linha inválida: {line.strip()}")
+
+    @staticmethod
+    def _bound_entry(line, col_index):
+        """Separa uma linha da seção BOUNDS em (tipo, coluna, valor)."""
+        for parts in (line.split(), None):
+            if parts is None:
+                parts = fixed_fields(line)
+            bound_type = parts[0]
+            if bound_type in VALUELESS_BOUNDS:
+                col_name, value = parts[-1], None
+                if len(parts) not in (2, 3):
+                    continue
+            else:
+                if len(parts) not in (3, 4):
+                    continue
+                col_name = parts[-2]
+                try:
+                    value = float(parts[-1])
+                except ValueError:
+                    continue
+            if col_name in col_index:
+                return bound_type, col_name, value
+        raise ValueError(f"Linha inválida na seção BOUNDS: {line.strip()}")
+
+    @staticmethod
+    def _apply_bound(bound_type, j, value, lower, upper):
+        """Aplica um registro da seção BOUNDS aos vetores de limites."""
+        if bound_type in ("UP", "UI"):
+            # Convenção MPS: limite superior negativo com inferior 0 torna a variável livre abaixo
+            if value < 0 and lower[j] == 0:
+                lower[j] = -np.inf
+            upper[j] = value
+        elif bound_type in ("LO", "LI"):
+            lower[j] = value
+        elif bound_type == "FX":
+            lower[j] = upper[j] = value
+        elif bound_type == "FR":
+            lower[j], upper[j] = -np.inf, np.inf
+        elif bound_type == "MI":
+            lower[j] = -np.inf
+        elif bound_type == "PL":
+            upper[j] = np.inf
+        elif bound_type == "BV":
+            lower[j], upper[j] = 0.0, 1.0
+        else:
+            raise ValueError(f"Tipo de limite desconhecido: {bound_type}")
+
     def extract_name(self):
-        
+
         """
         Extrai o nome do problema do arquivo MPS.
 
@@ -74,13 +423,9 @@ class MPSParser:
             str: Nome do problema extraído do arquivo
         """
 
-        with open(self.file_path, 'r') as file:
-            for line in file:
-                if line.startswith("NAME"):
-                    self.name = line.split()[1]
-                    break
+        self.read()
         return self.name
-    
+
     def extract_rows(self):
 
         """
@@ -91,7 +436,7 @@ class MPSParser:
         - tipo pode ser:
             N: função objetivo
             E: restrição de igualdade (=)
-            L: restrição menor ou igual (<=) 
+            L: restrição menor ou igual (<=)
             G: restrição maior ou igual (>=)
         - nome é o identificador da restrição
 
@@ -99,21 +444,9 @@ class MPSParser:
             list: Lista de tuplas (tipo, nome) para cada restrição
         """
 
-
-        with open(self.file_path, 'r') as file:
-            lines = file.readlines()
-            start = lines.index("ROWS\n") + 1
-            end = lines.index("COLUMNS\n")
-            
-            for line in lines[start:end]:
-                parts = line.split()
-                if len(parts) == 2:
-                    row_type, row_name = parts
-                    if row_type == "N":
-                        self.objective_row = row_name  # Identifica a função objetivo
-                    self.rows.append((row_type, row_name))
+        self.read()
         return self.rows
-    
+
     def extract_columns(self):
 
         """
@@ -123,9 +456,11 @@ class MPSParser:
         Cada linha tem o formato "[nome_coluna] [nome_linha] [valor]" ou
         "[nome_coluna] [nome_linha1] [valor1] [nome_linha2] [valor2]" onde:
         - nome_coluna: nome da variável
-        - nome_linha: nome da restrição 
+        - nome_linha: nome da restrição
         - valor: coeficiente da variável na restrição
 
+        O dicionário é montado a partir das triplas COO de read().
+
         Returns:
             dict: Dicionário com os coeficientes da matriz A, onde:
                  - chave externa é o nome da coluna (variável)
@@ -133,161 +468,170 @@ class MPSParser:
                  - valor é o coeficiente
         """
 
-        with open(self.file_path, 'r') as file:
-            lines = file.readlines()
-            start = lines.index("COLUMNS\n") + 1
-            end = lines.index("RHS\n")
-            
-            for line in lines[start:end]:
-                parts = line.split()
-                if len(parts) >= 3:
-                    col_name, row_name, value = parts[:3]
-                    value = float(value)
-                    if col_name not in self.A:
-                        self.A[col_name] = {}
-                    self.A[col_name][row_name] = value
-                    
-                    if len(parts) == 5:
-                        row_name2, value2 = parts[3:]
-                        value2 = float(value2)
-                        self.A[col_name][row_name2] = value2
+        raw = self.read()
+        if not self.A:
+            col_names = raw["col_names"]
+            row_names = raw["row_names"]
+            self.A = {name: {} for name in col_names}
+            for j, value in enumerate(raw["c"]):
+                if value != 0.0:
+                    self.A[col_names[j]][self.objective_row] = value
+            for i, j, value in zip(raw["row_idx"].tolist(), raw["col_idx"].tolist(), raw["values"].tolist()):
+                self.A[col_names[j]][row_names[i]] = value
         return self.A
-    
-    def extract_rhs_in(self):
-
-
-
-        
-        with open(self.file_path, 'r') as file:
-            lines = file.readlines()
-            start = lines.index("RHS\n") + 1
-            end = lines.index("ENDATA\n")
-            
-            for line in lines[start:end]:
-                parts = line.split()
-                if len(parts) >= 3:
-                    # Extrai o nome da linha e o valor, ignorando o primeiro elemento
-                    _, row_name, value = parts[:3]
-                    # Converte o valor para float
-                    value = float(value)
-                    # Armazena o valor no dicionário rhs usando o nome da linha como chave
-                    self.rhs[row_name] = value
-                    
-                    if len(parts) == 5:
-                        row_name2, value2 = parts[3:]
-                        value2 = float(value2)
-                        self.rhs[row_name2] = value2
-        return self.rhs
-    
+
     def extract_rhs(self):
-        with open(self.file_path, 'r') as file:
-            lines = file.readlines()
-            start = lines.index("RHS\n") + 1
-            end = lines.index("ENDATA\n")
-            
-            for line in lines[start:end]:
-                parts = line.split()
-                if len(parts) >= 3:
-                    try:
-                        _, row_name, value = parts[:3]
-                        value = float(value)  # Tentar converter para float
-                        self.rhs[row_name] = value
-                        
-                        if len(parts) == 5:
-                            row_name2, value2 = parts[3:]
-                            value2 = float(value2)  # Tentar converter para float
-                            self.rhs[row_name2] = value2
-                    except ValueError:
-                        # Ignorar valores que não podem ser convertidos para float
-                        logging.warning(f"Valor inválido na linha RHS: {line.strip()}")
-                        continue
+
+        """
+        Extrai os valores do lado direito das restrições.
+
+        Returns:
+            dict: Dicionário com o valor do lado direito de cada restrição com valor não nulo
+        """
+
+        raw = self.read()
+        if not self.rhs:
+            nonzero = np.flatnonzero(raw["rhs"])
+            self.rhs = {raw["row_names"][i]: float(raw["rhs"][i]) for i in nonzero}
+            if raw["objective_offset"] != 0.0:
+                self.rhs[self.objective_row] = -raw["objective_offset"]
         return self.rhs
 
+    extract_rhs_in = extract_rhs
 
     def extract_bounds(self):
-        with open(self.file_path, 'r') as file:
-            lines = file.readlines()
-            if "BOUNDS\n" in lines:
-                start = lines.index("BOUNDS\n") + 1
-                end = lines.index("ENDATA\n")
-                
-                for line in lines[start:end]:
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        bound_type, col_name, value = parts[:3]
-                        value = float(value)
-                        if col_name not in self.bounds:
-                            self.bounds[col_name] = {}
-                        self.bounds[col_name][bound_type] = value
+
+        """
+        Extrai os limites das variáveis da seção BOUNDS.
+
+        Os limites são derivados dos vetores de read(), por isso todos os tipos
+        do MPS (FX, FR, MI, ...) aparecem como limites "LO" e "UP".
+
+        Returns:
+            dict: Dicionário {variável: {"LO": valor, "UP": valor}} com os limites
+                diferentes do padrão [0, inf)
+        """
+
+        raw = self.read()
+        if not self.bounds:
+            for j in np.flatnonzero((raw["lower"] != 0.0) | (raw["upper"] != np.inf)):
+                entry = self.bounds[raw["col_names"][j]] = {}
+                if raw["lower"][j] != 0.0:
+                    entry["LO"] = float(raw["lower"][j])
+                if raw["upper"][j] != np.inf:
+                    entry["UP"] = float(raw["upper"][j])
         return self.bounds
-    
-    def parse(self):
-        self.extract_name()
-        self.extract_rows()
-        self.extract_columns()
-        self.extract_rhs()
-        self.extract_bounds()
-        
-        # Extrair coeficientes da função objetivo
-        c = []
-        variables = sorted(self.A.keys())
-        for var in variables:
-            if self.objective_row in self.A[var]:
-                c.append(self.A[var][self.objective_row])
-            else:
-                c.append(0.0)  # Se a variável não aparece na função objetivo, coeficiente é 0
-        
-        # Organizar restrições
-        A_ub = []
-        b_ub = []
-        A_eq = []
-        b_eq = []
-        
-        for row_type, row_name in self.rows:
-            if row_name == self.objective_row:
-                continue  # Ignorar a função objetivo
-            
-            row_coeffs = []
-            for var in variables:
-                if row_name in self.A[var]:
-                    row_coeffs.append(self.A[var][row_name])
-                else:
-                    row_coeffs.append(0.0)
-            
-            if row_type == "L":  # Restrição de desigualdade <=
-                A_ub.append(row_coeffs)
-                b_ub.append(self.rhs.get(row_name, 0.0))
-            elif row_type == "E":  # Restrição de igualdade
-                A_eq.append(row_coeffs)
-                b_eq.append(self.rhs.get(row_name, 0.0))
-            elif row_type == "G":  # Restrição de desigualdade >=
-                A_ub.append([-x for x in row_coeffs])  # Transformar em <=
-                b_ub.append(-self.rhs.get(row_name, 0.0))
-        
-        # Converter para arrays numpy
-        c = np.array(c)
-        A_ub = np.array(A_ub)
-        b_ub = np.array(b_ub)
-        A_eq = np.array(A_eq)
-        b_eq = np.array(b_eq)
-        
-        # Extrair limites das variáveis
-        bounds = []
-        for var in variables:
-            var_bounds = self.bounds.get(var, {})
-            lower = var_bounds.get("LO", 0.0)  # Valor padrão para limite inferior
-            upper = var_bounds.get("UP", np.inf)  # Valor padrão para limite superior
-            bounds.append((lower, upper))
-        
-        return {
-            "c": c,
-            "A_ub": A_ub,
-            "b_ub": b_ub,
-            "A_eq": A_eq,
-            "b_eq": b_eq,
-            "bounds": bounds,
-            "variables": variables
-        }
+
+    def parse(self, sparse=False, format="csr", memory_budget_mb=None):
+
+        """
+        Monta o problema no formato esperado pelo scipy.optimize.linprog.
+
+        As restrições >= são convertidas em <= trocando o sinal, e restrições com
+        RANGES viram um par de desigualdades (ou uma desigualdade, no caso de E).
+        Toda a montagem é vetorizada a partir das triplas COO de read().
+
+        O problema é sempre de minimização: em um problema de maximização
+        (OBJSENSE MAX) c e objective_offset têm o sinal trocado, e o solver
+        deve multiplicar o objetivo e os duais por objective_sense ao reportar.
+
+        Args:
+            sparse (bool): Se True, retorna matrizes scipy.sparse e limites como
+                arrays NumPy, sem nunca materializar a matriz densa
+            format (str): Formato das matrizes esparsas, "csr" ou "csc"
+            memory_budget_mb (float, optional): Memória permitida para as matrizes densas.
+                Defaults to a memória disponível no sistema.
+
+        Raises:
+            MemoryBudgetError: Se, no modo denso, A_ub e A_eq não couberem no orçamento
+                (o erro é levantado antes de alocar as matrizes)
+
+        Returns:
+            dict: Dicionário contendo c (forma de minimização), A_ub, b_ub, A_eq, b_eq,
+                bounds, variables e objective_sense. No modo esparso inclui também:
+                - A: Matriz completa das restrições (uma linha por restrição)
+                - row_lower / row_upper: Limites das restrições
+                - lower / upper: Limites das variáveis
+                - ub_rows / ub_sign: Restrição de origem e sinal de cada linha de A_ub
+                - eq_rows: Restrição de origem de cada linha de A_eq
+                - constraints: Nomes das restrições
+                - objective_offset: Constante da função objetivo (forma de minimização)
+        """
+
+        if format not in ("csr", "csc"):
+            raise ValueError(f"Formato de matriz esparsa inválido: {format}")
+
+        raw = self.read()
+        with trace_phase(self.tracer, "montagem"):
+            sense = raw["objective_sense"]
+            c = sense * raw["c"]
+            variables = raw["col_names"]
+            shape = (len(raw["row_names"]), len(variables))
+
+            # Matriz de restrições montada a partir das triplas COO (entradas repetidas são somadas)
+            A = sp.csr_matrix((raw["values"], (raw["row_idx"], raw["col_idx"])), shape=shape)
+            row_lower, row_upper = row_bounds(raw["row_types"], raw["rhs"], raw["ranges"])
+
+            # Linhas com limite superior entram com sinal +, com limite inferior entram com sinal -
+            eq = row_lower == row_upper
+            upper_rows = np.flatnonzero(~eq & np.isfinite(row_upper))
+            lower_rows = np.flatnonzero(~eq & np.isfinite(row_lower))
+            ub_rows = np.concatenate((upper_rows, lower_rows))
+            ub_sign = np.concatenate((np.ones(len(upper_rows)), -np.ones(len(lower_rows))))
+
+            # Mantém as desigualdades na ordem original das restrições
+            order = np.argsort(ub_rows, kind="stable")
+            ub_rows = ub_rows[order]
+            ub_sign = ub_sign[order]
+            eq_rows = np.flatnonzero(eq)
+
+            if not sparse:
+                # Falha antes de alocar (e de o sistema começar a usar swap)
+                dense_mb = 8 * (len(ub_rows) + len(eq_rows)) * len(variables) / (1 << 20)
+                budget_mb = memory_budget_mb if memory_budget_mb is not None else available_memory_mb()
+                if budget_mb is not None and dense_mb > budget_mb:
+                    raise MemoryBudgetError(
+                        f"As matrizes densas precisariam de {dense_mb:.0f} MB, acima de {budget_mb:.0f} MB "
+                        f"disponíveis; use parse(sparse=True)"
+                    )
+
+            A_ub = sp.diags(ub_sign) @ A[ub_rows]
+            b_ub = np.where(ub_sign > 0, row_upper[ub_rows], -row_lower[ub_rows])
+            A_eq = A[eq_rows]
+            b_eq = row_upper[eq_rows]
+
+            if not sparse:
+                return {
+                    "c": c,
+                    "A_ub": A_ub.toarray(),
+                    "b_ub": b_ub,
+                    "A_eq": A_eq.toarray(),
+                    "b_eq": b_eq,
+                    "bounds": list(zip(raw["lower"].tolist(), raw["upper"].tolist())),
+                    "variables": variables,
+                    "objective_sense": sense
+                }
+
+            return {
+                "c": c,
+                "A_ub": A_ub.asformat(format),
+                "b_ub": b_ub,
+                "A_eq": A_eq.asformat(format),
+                "b_eq": b_eq,
+                "bounds": np.column_stack((raw["lower"], raw["upper"])),
+                "variables": variables,
+                "A": A.asformat(format),
+                "row_lower": row_lower,
+                "row_upper": row_upper,
+                "lower": raw["lower"],
+                "upper": raw["upper"],
+                "ub_rows": ub_rows,
+                "ub_sign": ub_sign,
+                "eq_rows": eq_rows,
+                "constraints": raw["row_names"],
+                "objective_offset": sense * raw["objective_offset"],
+                "objective_sense": sense
+            }
 
 def main():
     # Verifica se um arquivo foi passado como argumento
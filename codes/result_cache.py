@@ -0,0 +1,261 @@
+import os
+import json
+import fcntl
+import logging
+import shutil
+import hashlib
+import numpy as np
+import scipy.sparse as sp
+
+from codes.disk_cache import DiskCache
+from codes.read_instance_regex import row_bounds
+
+# Versão do formato das entradas; muda a chave de todas as entradas quando o formato muda
+FORMAT_VERSION = b"result-cache-v1"
+# Campos de get_results() que não são guardados (medições da execução original)
+SKIPPED_FIELDS = ("trace", "timings")
+# Nome do arquivo de saída dentro da entrada
+OUTPUT_FILE = "output.mps"
+# Contadores de acertos e faltas, guardados na raiz do cache
+STATS_FILE = "stats.json"
+# Trava dos contadores (oculto, para não ser tratado como entrada pela limpeza LRU)
+STATS_LOCK_FILE = ".stats.lock"
+
+
+def problem_fingerprint(raw, solver, options=None):
+    """
+    Calcula a impressão digital canônica de um problema e da configuração do solver.
+
+    Ao contrário de model_fingerprint() (só a estrutura, para warm start), a
+    impressão considera todos os valores do modelo: matriz (em CSC, com
+    duplicatas somadas e zeros explícitos removidos), custos, constante do
+    objetivo, limites das variáveis e limites das restrições (row_bounds(), que
+    unifica tipo, RHS e RANGES), além do sentido da otimização. Nomes de linhas e colunas e a formatação do
+    arquivo não entram no hash, de modo que dois arquivos com o mesmo modelo
+    compartilham a entrada.
+
+    Args:
+        raw (dict): Dicionário retornado por MPSParser.read()
+        solver (str): Nome do solver (ex: "highs")
+        options (dict, optional): Opções que alteram o resultado (ex: tempo limite)
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    num_row, num_col = len(raw["row_names"]), len(raw["col_names"])
+    A = sp.csc_matrix((raw["values"], (raw["row_idx"], raw["col_idx"])), shape=(num_row, num_col))
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    row_lower, row_upper = row_bounds(raw["row_types"], raw["rhs"], raw["ranges"])
+
+    digest = hashlib.sha256(FORMAT_VERSION)
+    digest.update(json.dumps({"solver": solver, "options": options or {}, "shape": [num_row, num_col],
+                              "offset": float(raw["objective_offset"]),
+                              "sense": int(raw["objective_sense"])}, sort_keys=True).encode())
+    for array in (A.indptr, A.indices):
+        digest.update(np.asarray(array, dtype=np.int64).tobytes())
+    # Somar 0.0 normaliza -0.0, que tem outra representação binária
+    for array in (A.data, raw["c"], raw["lower"], raw["upper"], row_lower, row_upper):
+        digest.update((np.asarray(array, dtype=np.float64) + 0.0).tobytes())
+    return digest.hexdigest()
+
+
+def is_optimal(results):
+    """
+    Indica se um resultado de get_results() é ótimo.
+
+    O campo success é booleano na maioria dos solvers e um HighsModelStatus no HighsSolver.
+    """
+    success = results.get("success")
+    if isinstance(success, (bool, np.bool_)):
+        return bool(success)
+    return getattr(success, "name", str(success)).endswith("kOptimal")
+
+
+def _to_json(value):
+    """Converte escalares NumPy/HiGHS para tipos JSON."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class ResultCache(DiskCache):
+    """
+    Cache em disco dos resultados de soluções ótimas, por impressão digital do problema.
+
+    Cada entrada guarda os campos escalares de get_results() (meta.json), os
+    arrays da solução (solution.npz) e, opcionalmente, o arquivo de saída
+    gerado. Uma nova solução do mesmo modelo, com o mesmo solver e as mesmas
+    opções, devolve a entrada sem executar o solver. Só resultados ótimos são
+    guardados (um resultado interrompido pelo tempo limite não deve ser repetido).
+
+    Os acertos e as faltas de load() são somados em stats.json, compartilhado
+    entre os processos que usam a mesma pasta; cada atualização é feita sob
+    uma trava de arquivo (fcntl.flock), para que contagens simultâneas não
+    se percam.
+
+    Métodos:
+        key(raw, solver, options): Impressão digital do problema (problem_fingerprint)
+        load(key): Retorna os resultados guardados (com cache_hit=True), ou None
+        store(key, results, output_path): Guarda um resultado ótimo
+        output_path(key): Caminho do arquivo de saída guardado, ou None
+        copy_output(key, destination): Copia o arquivo de saída guardado
+        stats(): Acertos, faltas e taxa de acerto
+    """
+
+    def __init__(self, cache_dir="cache/results", max_bytes=512 << 20):
+        """
+        Inicializa o cache de resultados.
+
+        Args:
+            cache_dir (str, optional): Pasta do cache. Defaults to "cache/results".
+            max_bytes (int, optional): Tamanho máximo do cache. Defaults to 512 MiB.
+        """
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def key(raw, solver, options=None):
+        """Impressão digital do problema e da configuração (ver problem_fingerprint)."""
+        return problem_fingerprint(raw, solver, options)
+
+    def load(self, key):
+        """
+        Carrega o resultado guardado para uma chave e conta o acerto ou a falta.
+
+        Returns:
+            dict: Resultados como em get_results(), com cache_hit=True, ou None se não houver entrada
+        """
+        path = self.lookup(key)
+        results = None
+        if path is not None:
+            try:
+                with open(os.path.join(path, "meta.json"), "r") as file:
+                    results = json.load(file)
+                with np.load(os.path.join(path, "solution.npz")) as arrays:
+                    results.update({name: arrays[name] for name in arrays.files})
+                results["cache_hit"] = True
+            except (OSError, ValueError):
+                results = None
+
+        self._count("hits" if results is not None else "misses")
+        return results
+
+    def store(self, key, results, output_path=None):
+        """
+        Guarda um resultado ótimo e, se informado, o arquivo de saída gerado.
+
+        Args:
+            key (str): Chave do problema (ver key())
+            results (dict): Dicionário de get_results()
+            output_path (str, optional): Arquivo de saída gerado para o resultado
+
+        Returns:
+            bool: True se o resultado foi guardado (False também se a gravação falhar)
+        """
+        if not results or not is_optimal(results) or results.get("cache_hit"):
+            return False
+
+        meta, arrays = {}, {}
+        for name, value in results.items():
+            if name in SKIPPED_FIELDS:
+                continue
+            if isinstance(value, np.ndarray):
+                arrays[name] = value
+            elif isinstance(value, (list, tuple, dict)):
+                continue
+            else:
+                meta[name] = _to_json(value)
+        meta["success"] = True
+
+        def writer(tmp_dir):
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as file:
+                json.dump(meta, file)
+            np.savez(os.path.join(tmp_dir, "solution.npz"), **arrays)
+            if output_path is not None and os.path.exists(output_path):
+                shutil.copyfile(output_path, os.path.join(tmp_dir, OUTPUT_FILE))
+
+        self.remove(key)
+        try:
+            self.commit(key, writer)
+        except OSError as e:
+            logging.warning(f"Não foi possível gravar o resultado no cache: {e}")
+            return False
+        return True
+
+    def output_path(self, key):
+        """Retorna o caminho do arquivo de saída guardado para a chave, ou None."""
+        path = os.path.join(self.entry_path(key), OUTPUT_FILE)
+        return path if os.path.exists(path) else None
+
+    def copy_output(self, key, destination):
+        """
+        Copia o arquivo de saída guardado para destination.
+
+        Returns:
+            str: destination, ou None se a entrada não tiver arquivo de saída
+        """
+        source = self.output_path(key)
+        if source is None:
+            return None
+        folder = os.path.dirname(destination)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        shutil.copyfile(source, destination)
+        return destination
+
+    def _stats_path(self):
+        return os.path.join(self.cache_dir, STATS_FILE)
+
+    def _read_stats(self):
+        try:
+            with open(self._stats_path(), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def _count(self, field):
+        """Soma 1 ao contador field de stats.json, com a leitura e a gravação sob a trava."""
+        with open(os.path.join(self.cache_dir, STATS_LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            stats = self._read_stats()
+            stats[field] = stats.get(field, 0) + 1
+            tmp_path = f"{self._stats_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(stats, file)
+            os.replace(tmp_path, self._stats_path())
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses e hit_rate (acertos / consultas, 0.0 sem consultas)
+        """
+        stats = self._read_stats()
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = stats.get("hits", 0) / lookups if lookups else 0.0
+        return stats
+
+
+class CachedResult:
+    """
+    Resultado lido do ResultCache, com a interface de um solver.
+
+    Permite que a consulta ao cache seja feita dentro do processo de um
+    SolveJob (onde o modelo é lido para calcular a chave): em caso de acerto,
+    a fábrica do job devolve um CachedResult no lugar do solver.
+
+    Atributos:
+        result_key (str): Chave da entrada no cache
+        results (dict): Resultados guardados (com cache_hit=True)
+    """
+
+    def __init__(self, results, result_key):
+        self.result_key = result_key
+        self.results = results
+
+    def run(self):
+        """Nada a resolver: o resultado já está no cache."""
+
+    def get_results(self):
+        return self.results
@@ -0,0 +1,171 @@
+import time
+
+from codes.read_instance_regex import MPSParser
+from codes.tracing import Tracer
+from codes.lp_metrics import kkt_metrics, row_slacks, to_objective_sense
+from codes.scaling import Scaling, DEFAULT_METHOD, CORE_KEYS
+
+
+class ScaledSolver:
+    """
+    Base dos solvers de primeira ordem (descida por coordenada, gradiente espelhado e PDHG).
+
+    Esses métodos iteram sobre o problema equilibrado por Scaling, porque o
+    número de iterações depende do condicionamento de A; o critério de parada
+    e as soluções reportadas usam o problema original, para que os resíduos
+    sejam comparáveis entre os solvers e com o HiGHS. A classe lê e escala o
+    problema, calcula as métricas KKT no problema original e monta os
+    resultados; as subclasses implementam run() e terminam com _finish().
+    Os métodos sempre minimizam (o parser troca o sinal de c em problemas de
+    maximização); objetivo e duais voltam ao sentido original em _progress()
+    e _finish().
+
+    Atributos:
+        instance_path (str): Caminho para o arquivo MPS de entrada
+        data (dict): Dados do problema no modo esparso
+        scaling (Scaling): Escala das linhas e colunas usada nas iterações
+        scaled (dict): Dados do problema escalado
+        x (np.ndarray): Solução primal reportada
+        y (np.ndarray): Solução dual reportada (convenção do HiGHS)
+        progress_callback (callable): Recebe o progresso a cada teste de parada; se retornar
+            True, a otimização é interrompida (opcional)
+        tracer (Tracer): Tempos e memória de cada fase (leitura, montagem, solução, extração)
+        res (dict): Resultado da otimização após run()
+
+    Métodos:
+        run(): Executa o método (implementado pelas subclasses)
+        print_results(): Imprime os resultados da otimização
+        get_results(): Retorna um dicionário com os resultados da otimização
+    """
+
+    # Campos extras de self.res mostrados por print_results(), no formato {campo: rótulo}
+    RESULT_LABELS = {}
+
+    def __init__(self, instance_path, cache=None, tracer=None, scaling=DEFAULT_METHOD, format="csr"):
+        """
+        Lê e escala o problema.
+
+        Args:
+            instance_path (str): Caminho para o arquivo MPS a ser resolvido
+            cache (InstanceCache, optional): Cache binário de instâncias já lidas
+            tracer (Tracer, optional): Tracer compartilhado com as etapas anteriores. Defaults to um novo.
+            scaling (str, optional): Métodos de Scaling ("ruiz", "geometric", "pock_chambolle",
+                combinados com "+"), ou None para não escalar. Defaults to "ruiz+pock_chambolle".
+            format (str, optional): Formato da matriz esparsa, "csr" ou "csc". Defaults to "csr".
+        """
+        self.instance_path = instance_path
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.data = MPSParser(instance_path, cache=cache, tracer=self.tracer).parse(sparse=True, format=format)
+        with self.tracer.phase("montagem"):
+            self.scaling = Scaling(scaling).fit(self.data["A"])
+            self.scaled = self.scaling.scale(self.data, CORE_KEYS)
+        self.x = None
+        self.y = None
+        self.progress_callback = None
+        self.res = None
+
+    def run(self):
+        raise NotImplementedError
+
+    def _metrics(self, x, y):
+        """Calcula as métricas KKT, no problema original, de um par (x, y) do problema escalado."""
+        d = self.data
+        return kkt_metrics(d["A"], d["c"], d["row_lower"], d["row_upper"], d["lower"], d["upper"],
+                           self.scaling.unscale_primal(x), self.scaling.unscale_dual(y), d["objective_offset"])
+
+    def _progress(self, iteration, metrics):
+        """
+        Envia o progresso ao progress_callback, com o objetivo no sentido original.
+
+        Returns:
+            bool: True se o callback pediu a interrupção
+        """
+        if self.progress_callback is None:
+            return False
+        return bool(self.progress_callback({
+            "iterations": iteration,
+            "objective_value": self.data["objective_sense"] * metrics["primal_objective"],
+            "gap": metrics["gap"],
+        }))
+
+    def _finish(self, status, metrics, iteration, start, begin, **extra):
+        """
+        Registra a fase de solução e guarda o resultado de run().
+
+        As métricas e self.y, calculados na forma de minimização, são levados ao
+        sentido original do problema (ver to_objective_sense).
+
+        Args:
+            status (str): Status final ("Optimal", "Iteration limit", ...)
+            metrics (dict): Métricas KKT da solução reportada (ver _metrics)
+            iteration (int): Iterações executadas
+            start (float): Instante de início (time.perf_counter())
+            begin: Snapshot do tracer no início da solução
+            **extra: Campos extras do resultado (ver RESULT_LABELS)
+        """
+        sense = self.data["objective_sense"]
+        self.y = sense * self.y
+        self.tracer.add("solucao", begin, self.tracer.snapshot())
+        self.res = {
+            "status": status,
+            "metrics": to_objective_sense(metrics, sense),
+            "iterations": iteration,
+            "runtime": time.perf_counter() - start,
+            **extra,
+        }
+
+    def print_results(self):
+        """
+        Imprime os resultados da otimização.
+        """
+        if self.res is None:
+            print("Nenhum resultado disponível.")
+            return
+
+        metrics = self.res["metrics"]
+        print(f"Status: {self.res['status']}")
+        print(f"Valor objetivo: {metrics['primal_objective']}")
+        print(f"Sucesso: {self.res['status'] == 'Optimal'}")
+        print(f"Número de iterações: {self.res['iterations']}")
+        for field, label in self.RESULT_LABELS.items():
+            print(f"{label}: {self.res[field]}")
+        print(f"Gap: {metrics['gap']}")
+
+    def get_results(self):
+        """
+        Retorna os resultados da otimização em formato de dicionário.
+
+        Returns:
+            dict: Dicionário com status, objective_value, success e iterations (como
+                em HighsSolver.get_results()), além de dual_objective, gap,
+                primal_feasibility, dual_feasibility, runtime, os campos de
+                RESULT_LABELS, as soluções primal_solution, dual_prices (custos
+                reduzidos), slacks e dual_solution, os tempos por fase (timings)
+                e os eventos do tracer (trace)
+            None: Se não houver resultado
+        """
+        if self.res is None:
+            return None
+
+        metrics = self.res["metrics"]
+        with self.tracer.phase("extracao"):
+            slacks = row_slacks(metrics["activity"], self.data["row_lower"], self.data["row_upper"])
+        return {
+            "status": self.res["status"],
+            "objective_value": metrics["primal_objective"],
+            "dual_objective": metrics["dual_objective"],
+            "success": self.res["status"] == "Optimal",
+            "iterations": self.res["iterations"],
+            "gap": metrics["gap"],
+            "has_feasibility": True,
+            "primal_feasibility": metrics["primal_feasibility"],
+            "dual_feasibility": metrics["dual_feasibility"],
+            **{field: self.res[field] for field in self.RESULT_LABELS},
+            "runtime": self.res["runtime"],
+            "primal_solution": self.x,
+            "dual_prices": metrics["reduced_costs"],
+            "slacks": slacks,
+            "dual_solution": self.y,
+            "timings": self.tracer.summary(),
+            "trace": self.tracer.events,
+        }
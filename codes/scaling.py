@@ -0,0 +1,256 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Métodos de equilíbrio disponíveis; combinações são escritas com "+" (ex: "ruiz+pock_chambolle")
+METHODS = ("ruiz", "geometric", "pock_chambolle")
+# Combinação usada pelo PDLP: iterações de Ruiz seguidas de um passo de Pock-Chambolle
+DEFAULT_METHOD = "ruiz+pock_chambolle"
+# Chaves de MPSParser.parse(sparse=True) usadas pelos métodos de primeira ordem
+CORE_KEYS = ("A", "c", "row_lower", "row_upper", "lower", "upper", "objective_offset")
+
+
+def _segment_reduce(ufunc, values, starts, counts, empty):
+    """
+    Reduz segmentos contíguos de values (ex: linhas de uma CSR) com ufunc.reduceat.
+
+    Segmentos vazios recebem o valor empty.
+    """
+    out = np.full(len(counts), empty, dtype=np.float64)
+    nonempty = counts > 0
+    if values.size:
+        out[nonempty] = ufunc.reduceat(values, starts[nonempty])
+    return out
+
+
+def _power_of_two(scale):
+    """Arredonda fatores de escala para potências de 2, tornando escala e desescala exatas."""
+    return np.exp2(np.round(np.log2(scale)))
+
+
+class Scaling:
+    """
+    Classe para equilibrar a matriz de restrições de um LP e desfazer a escala das soluções.
+
+    O problema escalado usa A_s = D_r A D_c, com D_r = diag(row_scale) e
+    D_c = diag(col_scale), e as variáveis x_s = x / col_scale:
+
+        c_s = col_scale * c
+        row_lower_s, row_upper_s = row_scale * (row_lower, row_upper)
+        lower_s, upper_s = (lower, upper) / col_scale
+
+    Os duais do problema escalado se relacionam com os originais por
+    y = row_scale * y_s e os custos reduzidos por z = z_s / col_scale. Por
+    padrão os fatores são potências de 2, de modo que escalar e desfazer a
+    escala não introduz erro de arredondamento.
+
+    Métodos de equilíbrio (aplicados na ordem dada, ex: "ruiz+pock_chambolle"):
+        - ruiz: divide cada linha e coluna pela raiz da sua norma infinito, iterativamente
+        - geometric: divide linhas e depois colunas pela raiz de (max |a| * min |a|), iterativamente
+        - pock_chambolle: linhas por sqrt(sum |a|^(2 - alpha)) e colunas por sqrt(sum |a|^alpha)
+
+    Todas as normas são calculadas sobre os arrays de índices da matriz
+    (ufunc.reduceat por linha e por coluna), sem laços em Python sobre as entradas.
+
+    Atributos:
+        method (str): Métodos de equilíbrio, separados por "+" (None para não escalar)
+        row_scale (np.ndarray): Fator de cada linha
+        col_scale (np.ndarray): Fator de cada coluna
+
+    Métodos:
+        fit(A): Calcula os fatores de escala para a matriz A
+        scale_matrix(A): Retorna D_r A D_c
+        scale(data): Escala o dicionário de MPSParser.parse(sparse=True)
+        unscale_primal(x), unscale_dual(y), unscale_reduced_costs(z), unscale_activity(a):
+            Levam grandezas do problema escalado para o original
+        scale_primal(x), scale_dual(y), scale_reduced_costs(z), scale_activity(a):
+            Operações inversas
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, ruiz_iterations=10, geometric_iterations=4, alpha=1.0,
+                 power_of_two=True):
+        """
+        Inicializa a escala.
+
+        Args:
+            method (str, optional): Métodos separados por "+", ou None. Defaults to "ruiz+pock_chambolle".
+            ruiz_iterations (int, optional): Iterações de Ruiz. Defaults to 10.
+            geometric_iterations (int, optional): Iterações da média geométrica. Defaults to 4.
+            alpha (float, optional): Expoente do passo de Pock-Chambolle. Defaults to 1.0.
+            power_of_two (bool, optional): Arredonda os fatores para potências de 2. Defaults to True.
+
+        Raises:
+            ValueError: Se algum método não for reconhecido
+        """
+        self.steps = [step for step in (method or "").split("+") if step]
+        for step in self.steps:
+            if step not in METHODS:
+                raise ValueError(f"Método de escala inválido: {step}. Opções: {', '.join(METHODS)}")
+        self.method = method
+        self.ruiz_iterations = ruiz_iterations
+        self.geometric_iterations = geometric_iterations
+        self.alpha = alpha
+        self.power_of_two = power_of_two
+        self.row_scale = None
+        self.col_scale = None
+
+    def fit(self, A):
+        """
+        Calcula row_scale e col_scale para a matriz A.
+
+        Args:
+            A (scipy.sparse matrix): Matriz das restrições
+
+        Returns:
+            Scaling: O próprio objeto, para encadear (ex: Scaling().fit(A).scale(data))
+        """
+        A = sp.csr_matrix(A)
+        num_row, num_col = A.shape
+        self.row_scale = np.ones(num_row)
+        self.col_scale = np.ones(num_col)
+        if not self.steps:
+            return self
+
+        # Entradas não nulas em ordem de linha (CSR) e permutação para a ordem de coluna
+        values = np.abs(A.data)
+        keep = values > 0
+        rows = np.repeat(np.arange(num_row), np.diff(A.indptr))[keep]
+        cols = A.indices[keep]
+        values = values[keep]
+
+        row_counts = np.bincount(rows, minlength=num_row)
+        row_starts = np.concatenate(([0], np.cumsum(row_counts)[:-1]))
+        col_order = np.argsort(cols, kind="stable")
+        col_counts = np.bincount(cols, minlength=num_col)
+        col_starts = np.concatenate(([0], np.cumsum(col_counts)[:-1]))
+
+        def row_reduce(ufunc, entries, empty):
+            return _segment_reduce(ufunc, entries, row_starts, row_counts, empty)
+
+        def col_reduce(ufunc, entries, empty):
+            return _segment_reduce(ufunc, entries[col_order], col_starts, col_counts, empty)
+
+        def inverse_sqrt(norms):
+            return np.where(norms > 0, 1.0 / np.sqrt(np.where(norms > 0, norms, 1.0)), 1.0)
+
+        def apply(row_factor, col_factor):
+            self.row_scale *= row_factor
+            self.col_scale *= col_factor
+            values[:] *= row_factor[rows] * col_factor[cols]
+
+        for step in self.steps:
+            if step == "ruiz":
+                for _ in range(self.ruiz_iterations):
+                    apply(inverse_sqrt(row_reduce(np.maximum, values, 0.0)),
+                          inverse_sqrt(col_reduce(np.maximum, values, 0.0)))
+
+            elif step == "geometric":
+                for _ in range(self.geometric_iterations):
+                    row_norm = row_reduce(np.maximum, values, 0.0) * row_reduce(np.minimum, values, 0.0)
+                    apply(inverse_sqrt(row_norm), np.ones(num_col))
+                    col_norm = col_reduce(np.maximum, values, 0.0) * col_reduce(np.minimum, values, 0.0)
+                    apply(np.ones(num_row), inverse_sqrt(col_norm))
+
+            else:
+                row_norm = np.bincount(rows, weights=values ** (2.0 - self.alpha), minlength=num_row)
+                col_norm = np.bincount(cols, weights=values ** self.alpha, minlength=num_col)
+                apply(inverse_sqrt(row_norm), inverse_sqrt(col_norm))
+
+        if self.power_of_two:
+            self.row_scale = _power_of_two(self.row_scale)
+            self.col_scale = _power_of_two(self.col_scale)
+        return self
+
+    def _check_fitted(self):
+        if self.row_scale is None:
+            raise ValueError("Escala não calculada: chame fit(A) antes")
+
+    def scale_matrix(self, A, row_scale=None):
+        """
+        Retorna D_r A D_c no mesmo formato de A (CSR ou CSC).
+
+        Args:
+            A (scipy.sparse matrix): Matriz a escalar
+            row_scale (np.ndarray, optional): Fatores das linhas de A, quando A tem
+                outras linhas que a matriz ajustada (ex: A_ub). Defaults to row_scale.
+        """
+        self._check_fitted()
+        row_scale = self.row_scale if row_scale is None else row_scale
+        if A.format not in ("csr", "csc"):
+            A = A.tocsr()
+        A = A.copy()
+        major = np.repeat(np.arange(A.shape[0] if A.format == "csr" else A.shape[1]), np.diff(A.indptr))
+        if A.format == "csr":
+            A.data *= row_scale[major] * self.col_scale[A.indices]
+        else:
+            A.data *= row_scale[A.indices] * self.col_scale[major]
+        return A
+
+    def scale(self, data, keys=None):
+        """
+        Escala o dicionário de MPSParser.parse(sparse=True).
+
+        Args:
+            data (dict): Dados do problema (A, c, limites e, se houver, A_ub/b_ub/A_eq/b_eq)
+            keys (tuple, optional): Chaves a incluir no resultado (ex: CORE_KEYS). Defaults to todas.
+
+        Returns:
+            dict: Novo dicionário com os dados do problema escalado (data não é alterado)
+        """
+        self._check_fitted()
+        keys = data.keys() if keys is None else keys
+        scaled = {key: data[key] for key in keys if key in data}
+        if not self.steps:
+            return scaled
+
+        row_scale, col_scale = self.row_scale, self.col_scale
+        if "A" in scaled:
+            scaled["A"] = self.scale_matrix(data["A"])
+        if "c" in scaled:
+            scaled["c"] = data["c"] * col_scale
+        for key in ("row_lower", "row_upper"):
+            if key in scaled:
+                scaled[key] = data[key] * row_scale
+        for key in ("lower", "upper"):
+            if key in scaled:
+                scaled[key] = data[key] / col_scale
+        if "bounds" in scaled:
+            scaled["bounds"] = np.asarray(data["bounds"], dtype=np.float64) / col_scale[:, None]
+        if "A_ub" in scaled:
+            scaled["A_ub"] = self.scale_matrix(data["A_ub"], row_scale[data["ub_rows"]])
+            scaled["b_ub"] = data["b_ub"] * row_scale[data["ub_rows"]]
+        if "A_eq" in scaled:
+            scaled["A_eq"] = self.scale_matrix(data["A_eq"], row_scale[data["eq_rows"]])
+            scaled["b_eq"] = data["b_eq"] * row_scale[data["eq_rows"]]
+        return scaled
+
+    def unscale_primal(self, x):
+        """x = col_scale * x_s"""
+        return self.col_scale * x
+
+    def unscale_dual(self, y):
+        """y = row_scale * y_s"""
+        return self.row_scale * y
+
+    def unscale_reduced_costs(self, z):
+        """z = z_s / col_scale"""
+        return z / self.col_scale
+
+    def unscale_activity(self, activity):
+        """Ax = (A_s x_s) / row_scale"""
+        return activity / self.row_scale
+
+    def scale_primal(self, x):
+        """x_s = x / col_scale"""
+        return x / self.col_scale
+
+    def scale_dual(self, y):
+        """y_s = y / row_scale"""
+        return y / self.row_scale
+
+    def scale_reduced_costs(self, z):
+        """z_s = col_scale * z"""
+        return self.col_scale * z
+
+    def scale_activity(self, activity):
+        """A_s x_s = row_scale * Ax"""
+        return self.row_scale * activity
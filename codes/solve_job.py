@@ -0,0 +1,243 @@
+import os
+import sys
+import time
+import queue
+import signal
+import logging
+import multiprocessing as mp
+
+from codes.Solvers.HighsSolver import HighsSolver
+
+# Intervalo mínimo entre mensagens de progresso enviadas pelo processo do solver
+PROGRESS_INTERVAL = 0.25
+# Tempo dado ao solver para parar sozinho após o cancelamento, antes de encerrar o processo
+CANCEL_GRACE = 5.0
+
+
+def _attach_highs_progress(solver, progress, cancel_event):
+    """
+    Registra callbacks do HiGHS que enviam o progresso e atendem ao cancelamento.
+
+    Os callbacks de interrupção do simplex e do IPM são chamados a cada
+    iteração: enviam iterações, objetivo e tempo (no máximo a cada
+    PROGRESS_INTERVAL segundos) e pedem a interrupção quando cancel_event
+    está marcado. O callback de log repassa as linhas do HiGHS, de onde vem o
+    gap reportado pelo IPM/PDLP.
+    """
+    last_sent = [0.0]
+
+    def on_interrupt(event):
+        if cancel_event.is_set() and event.data_in is not None:
+            event.data_in.user_interrupt = True
+
+        now = time.monotonic()
+        if now - last_sent[0] < PROGRESS_INTERVAL:
+            return
+        last_sent[0] = now
+
+        data = event.data_out
+        progress({
+            "iterations": int(data.simplex_iteration_count + data.ipm_iteration_count + data.pdlp_iteration_count),
+            "objective_value": float(data.objective_function_value),
+        })
+
+    def on_logging(event):
+        progress({"log": event.message.rstrip()})
+
+    # O callback de log só é chamado com log_to_console ativo: a saída do processo vai para /dev/null
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+    model = solver.model
+    model.setOptionValue("output_flag", True)
+    model.setOptionValue("log_to_console", True)
+    model.cbSimplexInterrupt.subscribe(on_interrupt)
+    model.cbIpmInterrupt.subscribe(on_interrupt)
+    model.cbLogging.subscribe(on_logging)
+
+
+def _job_worker(factory, args, time_limit, messages, cancel_event):
+    """
+    Cria e executa o solver no processo do job, enviando progresso e resultado pela fila.
+
+    Mensagens enviadas: ("progress", dict), ("result_key", str), ("result", dict) ou ("error", str).
+    A chave do cache de resultados é enviada quando a fábrica a registra em
+    solver.result_key (ver CachedResult).
+    """
+    # SIGTERM vira SystemExit, para que os processos filhos do solver (ex: portfólio) sejam encerrados
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+    def progress(update):
+        messages.put(("progress", update))
+
+    try:
+        solver = factory(*args)
+        if solver is None:
+            raise ValueError("Método de otimização ainda não implementado")
+        if getattr(solver, "result_key", None) is not None:
+            messages.put(("result_key", solver.result_key))
+
+        if isinstance(solver, HighsSolver):
+            if time_limit is not None:
+                solver.model.setOptionValue("time_limit", float(time_limit))
+            _attach_highs_progress(solver, progress, cancel_event)
+        else:
+            if time_limit is not None and hasattr(solver, "time_limit"):
+                solver.time_limit = time_limit
+            if hasattr(solver, "progress_callback"):
+                # Solvers de primeira ordem: progresso a cada teste de parada, cancelamento pelo retorno
+                solver.progress_callback = lambda update: progress(update) or cancel_event.is_set()
+
+        solver.run()
+        messages.put(("result", solver.get_results()))
+
+    except Exception as e:
+        logging.error(f"Erro na execução do job: {e}")
+        messages.put(("error", str(e)))
+
+
+class SolveJob:
+    """
+    Executa um solver em um processo separado, com progresso e cancelamento.
+
+    O solver é criado dentro do processo do job (a partir de uma fábrica e
+    seus argumentos), de modo que a solução não bloqueia quem criou o job:
+    na interface, cada sessão apenas consulta o job a cada recarga da página.
+    Para o HiGHS o progresso vem dos callbacks do próprio solver e o
+    cancelamento interrompe a solução, que termina com o status "Interrupted
+    by user". Os solvers de primeira ordem recebem um progress_callback
+    (iterações, objetivo e gap a cada teste de parada) cujo retorno pede a
+    interrupção, e o tempo limite pelo atributo time_limit. Se um solver não
+    parar após o cancelamento, o processo é encerrado.
+
+    Atributos:
+        factory (callable): Função que cria o solver (ex: select_solver)
+        args (tuple): Argumentos passados à fábrica
+        time_limit (float): Tempo limite em segundos (None para sem limite)
+        progress (dict): Último progresso recebido (iterações, objetivo e, quando houver, gap)
+        log (list): Linhas de log recebidas do solver
+        results (dict): Resultado de get_results() após o término
+        result_key (str): Chave do cache de resultados calculada pela fábrica (None se não houver)
+        error (str): Mensagem de erro, se o job falhou
+        cancelled (bool): Indica se o cancelamento foi pedido
+
+    Métodos:
+        start(): Inicia o processo do job
+        poll(): Recebe as mensagens pendentes e atualiza o estado
+        cancel(): Pede a interrupção do solver
+        done: Indica se o job terminou
+        elapsed: Tempo decorrido desde o início
+    """
+
+    def __init__(self, factory, args=(), time_limit=None):
+        """
+        Inicializa o job.
+
+        Args:
+            factory (callable): Função que recebe *args e retorna um solver com run() e get_results()
+            args (tuple, optional): Argumentos da fábrica
+            time_limit (float, optional): Tempo limite em segundos. Defaults to None.
+        """
+        self.factory = factory
+        self.args = tuple(args)
+        self.time_limit = time_limit
+        self.progress = {}
+        self.log = []
+        self.results = None
+        self.result_key = None
+        self.error = None
+        self.cancelled = False
+        self._finished = False
+        self._messages = mp.Queue()
+        self._cancel_event = mp.Event()
+        self._process = None
+        self._started_at = None
+        self._cancelled_at = None
+
+    def start(self):
+        """
+        Inicia o processo do job.
+
+        O processo não é daemon, para que solvers que criam processos (como o
+        portfólio) possam ser executados.
+        """
+        self._process = mp.Process(
+            target=_job_worker,
+            args=(self.factory, self.args, self.time_limit, self._messages, self._cancel_event),
+        )
+        self._process.start()
+        self._started_at = time.monotonic()
+        return self
+
+    @property
+    def elapsed(self):
+        """Tempo decorrido desde o início do job, em segundos."""
+        return 0.0 if self._started_at is None else time.monotonic() - self._started_at
+
+    @property
+    def done(self):
+        """Indica se o job terminou (com resultado, erro ou cancelamento)."""
+        return self._finished
+
+    def poll(self):
+        """
+        Recebe as mensagens pendentes do processo e atualiza o estado do job.
+
+        Também aplica os limites rígidos: encerra o processo se ele não parar
+        CANCEL_GRACE segundos após o cancelamento ou após o tempo limite.
+
+        Returns:
+            dict: Último progresso recebido
+        """
+        while True:
+            try:
+                kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                if "log" in payload:
+                    self.log.append(payload["log"])
+                else:
+                    self.progress.update(payload)
+            elif kind == "result_key":
+                self.result_key = payload
+            elif kind == "result":
+                self.results = payload
+                self._finished = True
+            elif kind == "error":
+                self.error = payload
+                self._finished = True
+
+        if self._process is None or self._finished:
+            return self.progress
+
+        now = time.monotonic()
+        overdue = (
+            (self._cancelled_at is not None and now - self._cancelled_at > CANCEL_GRACE)
+            or (self.time_limit is not None and self.elapsed > self.time_limit + CANCEL_GRACE)
+        )
+        if overdue:
+            self._process.terminate()
+            self._process.join()
+            self.error = "Solução cancelada" if self.cancelled else "Tempo limite excedido"
+            self._finished = True
+        elif not self._process.is_alive() and self._messages.empty():
+            self.error = f"O processo do solver terminou inesperadamente (código {self._process.exitcode})"
+            self._finished = True
+
+        return self.progress
+
+    def cancel(self):
+        """
+        Pede a interrupção do solver.
+
+        O HiGHS para na próxima iteração; os demais solvers são encerrados se
+        não terminarem em CANCEL_GRACE segundos.
+        """
+        if self._finished or self.cancelled:
+            return
+        self.cancelled = True
+        self._cancelled_at = time.monotonic()
+        self._cancel_event.set()
@@ -0,0 +1,82 @@
+import importlib
+from collections import namedtuple
+
+# Cada solver é descrito pelo módulo que o implementa e pelo construtor dentro dele.
+# O construtor recebe (instance_path, cache=None, **opções) e devolve um objeto com
+# run(), print_results() e get_results(). O módulo só é importado quando o solver
+# é escolhido, de modo que carregar o registro não importa highspy, SciPy nem Streamlit.
+SolverSpec = namedtuple("SolverSpec", ["module", "factory", "label", "description"])
+
+SOLVERS = {
+    "highs": SolverSpec("codes.Solvers.HighsSolver", "HighsSolver.from_file", "HiGHS",
+                        "HiGHS com o modelo montado em memória pelo parser"),
+    "linprog": SolverSpec("codes.Solvers.Linprog_solver", "LinprogSolver", "Linprog",
+                          "scipy.optimize.linprog"),
+    "portfolio": SolverSpec("codes.Solvers.Portfolio_solver", "PortfolioSolver", "Portfólio (corrida)",
+                            "HiGHS simplex dual, IPM, PDLP e Linprog em paralelo; vence o primeiro ótimo"),
+    "coordinate": SolverSpec("codes.Solvers.DescendingByCoordinate_solver", "CoordinateDescentSolver",
+                             "Descida por Coordenada", "Lagrangiano aumentado com descida por blocos de coordenadas"),
+    "mirror": SolverSpec("codes.Solvers.mirrored gradient_solver", "MirrorDescentSolver",
+                         "Gradiente Espelhado", "Mirror-prox (gradiente espelhado extragradiente)"),
+    "pdhg": SolverSpec("codes.Solvers.local optimization_solver", "PDHGSolver",
+                       "Otimização Local", "PDHG com reinícios (estilo PDLP)"),
+    "decomposition": SolverSpec("codes.Solvers.Decomposition_solver", "DantzigWolfeSolver",
+                                "Decomposição (Dantzig-Wolfe)",
+                                "Geração de colunas em LPs bloco-angulares, com subproblemas em paralelo"),
+}
+
+
+def solver_names():
+    """Retorna os nomes curtos dos solvers registrados (os mesmos do estimador de memória)."""
+    return list(SOLVERS)
+
+
+def solver_for_label(label):
+    """
+    Retorna o nome curto do solver com o rótulo da interface (ex: "HiGHS" -> "highs").
+
+    Returns:
+        str: Nome do solver, ou None se nenhum solver tiver o rótulo
+    """
+    return next((name for name, spec in SOLVERS.items() if spec.label == label), None)
+
+
+def get_spec(name):
+    """
+    Retorna a descrição de um solver registrado.
+
+    Raises:
+        ValueError: Se o solver não estiver registrado
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"Solver desconhecido: {name}. Opções: {', '.join(SOLVERS)}")
+    return SOLVERS[name]
+
+
+def load_factory(name):
+    """
+    Importa o módulo do solver e retorna o seu construtor.
+
+    Returns:
+        callable: Construtor (instance_path, cache=None, **opções) -> solver
+    """
+    spec = get_spec(name)
+    factory = importlib.import_module(spec.module)
+    for attribute in spec.factory.split("."):
+        factory = getattr(factory, attribute)
+    return factory
+
+
+def create_solver(name, instance_path, **options):
+    """
+    Cria o solver registrado com o nome dado, importando só o seu módulo.
+
+    Args:
+        name (str): Nome curto do solver (ver SOLVERS)
+        instance_path (str): Caminho para o arquivo MPS
+        **options: Argumentos do construtor (ex: cache, tracer, time_limit)
+
+    Returns:
+        Objeto com run(), print_results() e get_results()
+    """
+    return load_factory(name)(instance_path, **options)
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Nomes das fases instrumentadas, na ordem do pipeline
+PHASES = (
+    "upload",      # gravação do arquivo enviado
+    "conversao",   # conversão MPS -> LP
+    "leitura",     # leitura do MPS (MPSParser.read)
+    "montagem",    # montagem das matrizes / do HighsLp
+    "presolve",    # presolve do HiGHS (até a primeira iteração do solver)
+    "solucao",     # solução (e postsolve, no HiGHS)
+    "extracao",    # extração dos arrays da solução
+    "saida",       # gravação do arquivo de saída
+)
+
+
+def peak_rss_mb():
+    """
+    Retorna o pico de memória residente do processo (MB), ou None se não disponível.
+
+    O pico é o máximo desde o início do processo (ru_maxrss), portanto o valor
+    registrado ao fim de uma fase é o pico atingido até ela.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é dado em KB no Linux e em bytes no macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+class Tracer:
+    """
+    Registra o tempo de parede, o tempo de CPU e o pico de memória de cada fase.
+
+    Os eventos já são guardados no formato de evento completo ("ph": "X") do
+    Chrome trace, com o instante de início em microssegundos da época Unix, de
+    modo que eventos registrados em processos diferentes (ex: interface e
+    processo do job) podem ser reunidos com extend() em uma única linha do tempo.
+
+    Atributos:
+        events (list): Eventos registrados (dicionários JSON)
+
+    Métodos:
+        snapshot(): Instante atual (parede, CPU, pico de memória)
+        add(name, begin, end): Registra uma fase entre dois snapshots
+        phase(name): Context manager que registra a fase do bloco
+        extend(events): Acrescenta eventos de outro Tracer
+        summary(): Totais por fase
+        total_wall(): Tempo de parede somado de todas as fases
+        chrome_trace(): Eventos no formato JSON do Chrome trace
+        export_chrome_trace(path): Grava os eventos em JSON (chrome://tracing, Perfetto)
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+        self._epoch = time.time() - time.perf_counter()
+
+    @staticmethod
+    def snapshot():
+        """
+        Retorna o instante atual.
+
+        Returns:
+            tuple: (perf_counter, process_time, pico de memória em MB)
+        """
+        return time.perf_counter(), time.process_time(), peak_rss_mb()
+
+    def add(self, name, begin, end):
+        """
+        Registra uma fase entre dois snapshots.
+
+        Args:
+            name (str): Nome da fase (ver PHASES)
+            begin (tuple): snapshot() do início
+            end (tuple): snapshot() do fim
+        """
+        event = {
+            "name": name,
+            "cat": "fase",
+            "ph": "X",
+            "ts": (self._epoch + begin[0]) * 1e6,
+            "dur": (end[0] - begin[0]) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"cpu": end[1] - begin[1], "peak_rss_mb": end[2]},
+        }
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def phase(self, name):
+        """Registra o tempo do bloco como a fase name (também se o bloco levantar exceção)."""
+        begin = self.snapshot()
+        try:
+            yield self
+        finally:
+            self.add(name, begin, self.snapshot())
+
+    def extend(self, events):
+        """Acrescenta eventos registrados por outro Tracer (ex: results["trace"] do job)."""
+        with self._lock:
+            self.events.extend(events or [])
+
+    def summary(self):
+        """
+        Soma os eventos por fase.
+
+        Returns:
+            dict: {fase: {"wall": s, "cpu": s, "peak_rss_mb": MB}}, na ordem de PHASES
+                (fases fora de PHASES vêm no fim); o pico é o maior valor registrado
+        """
+        totals = {}
+        for event in self.events:
+            entry = totals.setdefault(event["name"], {"wall": 0.0, "cpu": 0.0, "peak_rss_mb": None})
+            entry["wall"] += event["dur"] / 1e6
+            entry["cpu"] += event["args"]["cpu"]
+            peak = event["args"]["peak_rss_mb"]
+            if peak is not None:
+                entry["peak_rss_mb"] = max(peak, entry["peak_rss_mb"] or 0.0)
+
+        order = {name: index for index, name in enumerate(PHASES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def total_wall(self):
+        """Tempo de parede somado de todas as fases, em segundos."""
+        return sum(event["dur"] for event in self.events) / 1e6
+
+    def chrome_trace(self):
+        """Retorna os eventos no formato JSON do Chrome trace (dicionário com traceEvents)."""
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """
+        Grava os eventos no formato JSON do Chrome trace.
+
+        O arquivo pode ser aberto em chrome://tracing ou em https://ui.perfetto.dev.
+
+        Returns:
+            str: Caminho do arquivo gravado
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file, indent=1)
+        return path
+
+
+@contextmanager
+def trace_phase(tracer, name):
+    """Como Tracer.phase(), mas sem efeito quando tracer é None."""
+    if tracer is None:
+        yield None
+    else:
+        with tracer.phase(name):
+            yield tracer